@@ -2,14 +2,20 @@
 
 #!/usr/bin/env python
 
-import json, asyncio, threading
+import json, asyncio, multiprocessing, socket, threading
 
 from aiohttp import web
 from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
 
+from client.ae.Notification import Notification
+from client.ae.NotificationDispatcher import NotificationDispatcher
+from client.ae.NotificationRouter import NotificationRoute, NotificationRouter
+from client.ae.NotificationStream import NotificationStream
+from client.onem2m.http.HttpHeader import HttpHeader
+from client.onem2m.http.HttpStatusCode import HttpStatusCode
 from client.onem2m.http.OneM2MResponse import OneM2MResponse
 
-from typing import Callable, Mapping, MutableMapping, Optional
+from typing import Any, Callable, Dict, List, Mapping, MutableMapping, Optional, Set, Tuple
 
 
 class AsyncResponseListenerFactory:
@@ -19,14 +25,35 @@ class AsyncResponseListenerFactory:
     # Reference to the private inner class.
     instance = None
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 8080):
+    def __init__(
+        self,
+        host: str = '0.0.0.0',
+        port: int = 8080,
+        dispatcher: NotificationDispatcher = None,
+        workers: int = None,
+    ):
         """Initialize the singletone or return the existing instance.
+
+        Args:
+            host: Address the listener binds to.
+            port: Port the listener binds to.
+            dispatcher: Runs the notification callbacks.  Defaults to a NotificationDispatcher
+                with a thread pool.  Each worker process gets its own copy.
+            workers: Serve from this many processes sharing the port with SO_REUSEPORT,
+                instead of a thread of this process.  Callbacks then run in the workers, and
+                there is no stream: consume notifications with callbacks.
+            Only used when the instance is created.
         """
 
         if AsyncResponseListenerFactory.instance is None:
-            AsyncResponseListenerFactory.instance = (
-                AsyncResponseListenerFactory.__AsyncResponseListener(host, port)
-            )
+            if workers is None:
+                AsyncResponseListenerFactory.instance = (
+                    AsyncResponseListenerFactory.__AsyncResponseListener(host, port, dispatcher)
+                )
+            else:
+                AsyncResponseListenerFactory.instance = (
+                    AsyncResponseListenerFactory.__ReusePortListener(host, port, workers, dispatcher)
+                )
 
     def get_instance(self):
         """ Return the singleton instance.
@@ -34,31 +61,52 @@ class AsyncResponseListenerFactory:
 
         return AsyncResponseListenerFactory.instance
 
+    @staticmethod
+    def _worker_listener(host: str, port: int, dispatcher: Optional[NotificationDispatcher]):
+        """A listener of one worker process of a multi-process listener.
+        """
+        listener = AsyncResponseListenerFactory.__AsyncResponseListener(host, port, dispatcher, reuse_port=True)
+        # Not shared with the listener class of the parent process.
+        listener.rqi_cb_map = {}
+        listener.rqi_dispatched = set()
+        listener.notification_routes = NotificationRouter()
+
+        return listener
+
     class __AsyncResponseListener(threading.Thread):
         """ An async http server that runs in its own thread.
         """
 
         # Refernce to the event loop that will execute the async tasks.
         loop = None
+        # Callbacks run in this process and can update its state.
+        in_process = True
         _stop_event = threading.Event()
 
         # RQI to callback function map.  This is where callbacks will be stored.
         rqi_cb_map: MutableMapping[str, Callable] = {}
+        # RQIs whose callback runs on the dispatcher instead of building the HTTP answer.
+        rqi_dispatched: Set[str] = set()
+        # Notification callbacks by subscription reference, prefix or pattern.  These run on the dispatcher.
+        notification_routes = NotificationRouter()
         runner: Optional[web.AppRunner] = None
 
         # Defaults are set in the factory class constructor
-        def __init__(self, host: str, port: int):
+        def __init__(
+            self, host: str, port: int, dispatcher: Optional[NotificationDispatcher] = None, reuse_port: bool = False
+        ):
             threading.Thread.__init__(self)
             # Server host and port.
             self.host = host
             self.port = port
+            self.dispatcher = dispatcher or NotificationDispatcher()
+            # Share the port with the other workers of a multi-process listener.
+            self.reuse_port = reuse_port
             self.daemon = True  # Kill thread when main exists.
 
-        async def _init_async_response_server(self):
-            """Build the async response server.
+        def _application(self) -> web.Application:
+            """Build the application serving the notification routes.
             """
-
-            # Initialize the server.
             server = web.Application()
 
             # @todo make routes configurable via params.
@@ -71,11 +119,20 @@ class AsyncResponseListenerFactory:
                 ]
             )
 
+            return server
+
+        async def _init_async_response_server(self):
+            """Build the async response server.
+            """
+
+            # Initialize the server.
+            server = self._application()
+
             # Start the server.
             if self.runner is None:
                 self.runner = web.AppRunner(server)
                 await self.runner.setup()
-                site = web.TCPSite(self.runner, self.host, self.port)
+                site = web.TCPSite(self.runner, self.host, self.port, reuse_port=self.reuse_port or None)
                 await site.start()
 
         def run(self):
@@ -98,17 +155,32 @@ class AsyncResponseListenerFactory:
             # web.run_app(server, host=self.host, port=self.port)
 
         async def _handler(self, req: web.Request):
+            res = web.Response(content_type=OneM2MPrimitive.CONTENT_TYPE_JSON)
 
             try:
                 #request_method = req.method
                 body = await req.json()
-                request_id = body['m2m:sgn']['sur']
 
-                res = web.Response(content_type=OneM2MPrimitive.CONTENT_TYPE_JSON)
+                # Aggregated notifications of batchNotify subscriptions.
+                if 'm2m:agn' in body:
+                    return self._dispatch(Notification.from_aggregated(body['m2m:agn']), res)
+
+                # Responses of non-blocking asynchronous requests are routed by their rqi,
+                # notifications by their subscription reference.
+                if 'm2m:rsp' in body:
+                    request_id = str(body['m2m:rsp']['rqi'])
+                else:
+                    request_id = body['m2m:sgn']['sur']
+
+                callback = self.rqi_cb_map.get(request_id)
 
-                if request_id in self.rqi_cb_map.keys():
-                    # Execute callback and pass it the req.
-                    return await self.rqi_cb_map[request_id](req, res)  # TODO: check argument types
+                if callback is not None and request_id in self.rqi_dispatched:
+                    return self._submit([(callback, (body,))], res)
+                elif callback is not None:
+                    # Execute callback and pass it the req.  Its response answers the CSE.
+                    return await callback(req, res)
+                elif 'm2m:sgn' in body:
+                    return self._dispatch([Notification(body['m2m:sgn'])], res)
                 else:
                     # No handler has been registed for this request id.
                     res.set_status(4004, 'No response handler has been set for this rqi.')
@@ -118,14 +190,149 @@ class AsyncResponseListenerFactory:
 
             return res
 
-        def set_rqi_cb(self, rqi: str, cb: Callable):
+        def _dispatch(self, notifications: List[Notification], res: web.Response) -> web.Response:
+            """Queue notifications for their callbacks and acknowledge them, or ask the CSE to retry later.
+
+            Batch callbacks get all their notifications of the request in one list.
+            """
+            routes: Dict[str, Optional[NotificationRoute]] = {}
+            by_route: Dict[int, Tuple[NotificationRoute, List[Notification]]] = {}
+
+            for notification in notifications:
+                if notification.sur not in routes:
+                    routes[notification.sur] = self.notification_routes.match(notification.sur)
+                route = routes[notification.sur]
+                if route is not None:
+                    by_route.setdefault(id(route), (route, []))[1].append(notification)
+
+            calls = []
+            for route, batch in by_route.values():
+                if route.batch:
+                    calls.append((route.handler, (batch,)))
+                else:
+                    calls.extend((route.handler, (notification,)) for notification in batch)
+
+            if not calls:
+                res.set_status(4004, 'No response handler has been set for this rqi.')
+                return res
+
+            return self._submit(calls, res)
+
+        def _submit(self, calls: List[Tuple[Callable, tuple]], res: web.Response) -> web.Response:
+            """Queue callback calls on the dispatcher and acknowledge the request, or ask the CSE
+               to retry later.
+            """
+            if self.dispatcher.submit_all(calls):
+                res.headers[OneM2MPrimitive.X_M2M_RSC] = OneM2MPrimitive.M2M_RSC_OK
+            else:
+                res.set_status(HttpStatusCode.SERVICE_UNAVAILABLE, 'Notification queue full.')
+                res.headers[HttpHeader.RETRY_AFTER] = str(self.dispatcher.retry_after)
+
+            return res
+
+        def set_rqi_cb(self, rqi: str, cb: Callable, dispatch: bool = False):
             """Set the callback function for a specific rqi.
 
+            By default the callback is a coroutine function awaited with the aiohttp request
+            and response while the CSE waits, and the response it returns answers the CSE: it
+            holds up the request handling, keep it short.  With dispatch the request is
+            acknowledged once queued and the callback, a coroutine or plain function, is then
+            called with the parsed JSON body of the request by the dispatcher, like
+            notification callbacks.
+
             Args:
                 rqi (string): The request id.
                 cb (function): The callback function.
+                dispatch (bool): Run cb on the dispatcher with the request body.
             """
             self.rqi_cb_map[str(rqi)] = cb  # Key must be string.
+            if dispatch:
+                self.rqi_dispatched.add(str(rqi))
+            else:
+                self.rqi_dispatched.discard(str(rqi))
+
+        def set_notification_cb(self, sur: str, cb: Callable, batch: bool = False, prefix: bool = False):
+            """Set the callback of the notifications of a subscription, or of many with a prefix
+               or a glob pattern ('/PN_CSE/nod-*/lcoi/*').
+
+            Notifications are acknowledged once queued, the callback is then called with the
+            Notification by the dispatcher: awaited on the listener's loop if it is a coroutine
+            function, on the dispatcher's pool otherwise.  See NotificationRouter for the
+            precedence of overlapping registrations.
+
+            Args:
+                sur (string): The subscription reference ('sur') of the notifications, or a pattern.
+                cb (function): The callback function.
+                batch (bool): Call cb once per request with the list of its notifications, e.g.
+                    the content of an aggregated notification.
+                prefix (bool): Also route the subscriptions below sur to cb.
+            """
+            self.notification_routes.add(sur, cb, batch, prefix)
+
+        def remove_notification_cb(self, sur: str, prefix: bool = False):
+            """Remove the notification callback of a subscription, prefix or pattern, if any.
+
+            Args:
+                sur (string): The subscription reference or pattern it was set with.
+                prefix (bool): Remove the prefix callback of sur.
+            """
+            self.notification_routes.remove(sur, prefix)
+
+        def set_fallback_notification_cb(self, cb: Callable, batch: bool = False):
+            """Set the callback of the notifications no other callback matches.
+
+            Args:
+                cb (function): The callback function.
+                batch (bool): Call cb with the list of notifications of each request.
+            """
+            self.notification_routes.set_fallback(cb, batch)
+
+        def remove_fallback_notification_cb(self):
+            """Remove the fallback notification callback, if any.
+            """
+            self.notification_routes.remove_fallback()
+
+        def stream(
+            self,
+            sur: str,
+            batch: Optional[int] = None,
+            timeout: Optional[float] = None,
+            buffer_size: int = NotificationStream.DEFAULT_BUFFER_SIZE,
+            prefix: bool = False,
+        ) -> NotificationStream:
+            """Consume the notifications of a subscription, prefix or pattern with 'async for'.
+
+            Replaces the notification callback of sur until the stream is closed.
+            Must be called from the event loop that iterates the stream.
+
+            Args:
+                sur (string): The subscription reference ('sur') of the notifications, or a pattern.
+                batch (int): Yield lists of up to batch notifications.
+                timeout (float): Seconds a partial batch waits before it is yielded, see NotificationStream.
+                buffer_size (int): Notifications buffered for the consumer.
+                prefix (bool): Also stream the subscriptions below sur.
+
+            Returns:
+                NotificationStream: The stream.
+            """
+            def on_close():
+                # Unless another callback took over the subscription.
+                if route is self.notification_routes.get(sur, prefix):
+                    self.remove_notification_cb(sur, prefix)
+
+            stream = NotificationStream(batch, timeout, buffer_size, on_close)
+            route = self.notification_routes.add(sur, stream.put_all, True, prefix)
+
+            return stream
+
+        def remove_rqi_cb(self, rqi: str):
+            """Remove the callback function of a specific rqi, if any.
+
+            Args:
+                rqi (string): The request id.
+            """
+            self.rqi_cb_map.pop(str(rqi), None)
+            self.rqi_dispatched.discard(str(rqi))
 
         def call_rqi_cb(self, rqi: str, res=None):
             """Execute the callback function for the specified rqi.
@@ -157,6 +364,217 @@ class AsyncResponseListenerFactory:
         def __str__(self):
             return json.dumps(self.rqi_cb_map)
 
+    class __ReusePortListener:
+        """ An async http server spread over worker processes bound to the same port.
+
+        Every worker is a forked process running its own event loop, dispatcher and callback
+        registry, bound to the port with SO_REUSEPORT so the kernel balances the incoming
+        connections across them.  Notification handling scales with the number of cores.
+
+        Callbacks registered before start are inherited by the workers.  Later registrations
+        are sent to every worker, and must be picklable (module level functions or partials of
+        them).  Callbacks run in the workers: they cannot update the state of this process.
+        """
+
+        # Seconds a worker gets to shut down before it is terminated.
+        STOP_TIMEOUT = 5.0
+
+        # Callbacks run in the workers, see the class docstring.
+        in_process = False
+
+        def __init__(self, host: str, port: int, workers: int, dispatcher: Optional[NotificationDispatcher] = None):
+            if not hasattr(socket, 'SO_REUSEPORT'):
+                raise NotImplementedError('SO_REUSEPORT is not supported on this platform.')
+
+            if workers < 1:
+                raise ValueError('A multi-process listener needs at least one worker.')
+
+            self.host = host
+            self.port = port
+            self.workers = workers
+            self.dispatcher = dispatcher
+
+            self.rqi_cb_map: MutableMapping[str, Callable] = {}
+            self.rqi_dispatched: Set[str] = set()
+            self.notification_routes = NotificationRouter()
+
+            # Worker processes and the parent end of their control pipe.
+            self._processes: List[Tuple[Any, Any]] = []
+            # Keeps the port, resolved when 0, reserved while the workers run.
+            self._socket: Optional[socket.socket] = None
+            self._lock = threading.Lock()
+
+        def start(self):
+            """Forks the workers and waits until they all listen.
+            """
+            with self._lock:
+                if self._processes:
+                    return
+
+                self._socket = socket.socket(socket.AF_INET6 if ':' in self.host else socket.AF_INET)
+                self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                self._socket.bind((self.host, self.port))
+                self.port = self._socket.getsockname()[1]
+
+                context = multiprocessing.get_context('fork')
+
+                for _ in range(self.workers):
+                    conn, child_conn = context.Pipe()
+                    process = context.Process(target=self._serve, args=(child_conn,), daemon=True)
+                    process.start()
+                    child_conn.close()
+                    self._processes.append((process, conn))
+
+                errors = [conn.recv() for _, conn in self._processes]
+
+            if any(errors):
+                self.stop()
+                raise next(err for err in errors if err)
+
+        def _serve(self, conn):
+            """Runs a worker, in its process.
+            """
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+            listener = AsyncResponseListenerFactory._worker_listener(self.host, self.port, self.dispatcher)
+            listener.rqi_cb_map.update(self.rqi_cb_map)
+            listener.rqi_dispatched.update(self.rqi_dispatched)
+            # This process' copy of the registrations.
+            listener.notification_routes = self.notification_routes
+
+            try:
+                loop.run_until_complete(listener._init_async_response_server())
+            except Exception as err:
+                conn.send(err)
+                return
+
+            stopped = loop.create_future()
+
+            def on_command():
+                try:
+                    command, args = conn.recv()
+                except EOFError:
+                    # The parent process is gone.
+                    command, args = 'stop', ()
+
+                if command == 'stop':
+                    loop.remove_reader(conn.fileno())
+                    stopped.set_result(None)
+                    return
+
+                try:
+                    getattr(listener, command)(*args)
+                    conn.send(None)
+                except Exception as err:
+                    conn.send(err)
+
+            loop.add_reader(conn.fileno(), on_command)
+            conn.send(None)
+
+            loop.run_until_complete(stopped)
+            loop.run_until_complete(listener.dispatcher.close())
+            loop.run_until_complete(listener.runner.cleanup())
+            loop.close()
+
+        def _broadcast(self, command: str, *args: Any):
+            """Applies a registry command in every worker.
+            """
+            with self._lock:
+                for _, conn in self._processes:
+                    conn.send((command, args))
+
+                errors = [conn.recv() for _, conn in self._processes]
+
+            for err in errors:
+                if err is not None:
+                    raise err
+
+        def stop(self):
+            """Stops the workers.
+            """
+            with self._lock:
+                processes, self._processes = self._processes, []
+
+                for process, conn in processes:
+                    try:
+                        conn.send(('stop', ()))
+                    except OSError:
+                        pass
+
+                for process, conn in processes:
+                    process.join(self.STOP_TIMEOUT)
+                    if process.is_alive():
+                        process.terminate()
+                    conn.close()
+
+                if self._socket is not None:
+                    self._socket.close()
+                    self._socket = None
+
+        def set_rqi_cb(self, rqi: str, cb: Callable, dispatch: bool = False):
+            """Set the callback function for a specific rqi, in every worker.
+
+            Args:
+                rqi (string): The request id.
+                cb (function): The callback function.
+                dispatch (bool): Run cb on the dispatcher with the request body.
+            """
+            self.rqi_cb_map[str(rqi)] = cb
+            if dispatch:
+                self.rqi_dispatched.add(str(rqi))
+            else:
+                self.rqi_dispatched.discard(str(rqi))
+            self._broadcast('set_rqi_cb', str(rqi), cb, dispatch)
+
+        def remove_rqi_cb(self, rqi: str):
+            """Remove the callback function of a specific rqi, if any, in every worker.
+
+            Args:
+                rqi (string): The request id.
+            """
+            self.rqi_cb_map.pop(str(rqi), None)
+            self.rqi_dispatched.discard(str(rqi))
+            self._broadcast('remove_rqi_cb', str(rqi))
+
+        def set_notification_cb(self, sur: str, cb: Callable, batch: bool = False, prefix: bool = False):
+            """Set the callback of the notifications of a subscription, prefix or pattern, in every worker.
+
+            Args:
+                sur (string): The subscription reference ('sur') of the notifications, or a pattern.
+                cb (function): The callback function.
+                batch (bool): Call cb with the list of notifications of each request.
+                prefix (bool): Also route the subscriptions below sur to cb.
+            """
+            self.notification_routes.add(sur, cb, batch, prefix)
+            self._broadcast('set_notification_cb', str(sur), cb, batch, prefix)
+
+        def remove_notification_cb(self, sur: str, prefix: bool = False):
+            """Remove the notification callback of a subscription, prefix or pattern, if any, in every worker.
+
+            Args:
+                sur (string): The subscription reference or pattern it was set with.
+                prefix (bool): Remove the prefix callback of sur.
+            """
+            self.notification_routes.remove(sur, prefix)
+            self._broadcast('remove_notification_cb', str(sur), prefix)
+
+        def set_fallback_notification_cb(self, cb: Callable, batch: bool = False):
+            """Set the callback of the notifications no other callback matches, in every worker.
+
+            Args:
+                cb (function): The callback function.
+                batch (bool): Call cb with the list of notifications of each request.
+            """
+            self.notification_routes.set_fallback(cb, batch)
+            self._broadcast('set_fallback_notification_cb', cb, batch)
+
+        def remove_fallback_notification_cb(self):
+            """Remove the fallback notification callback, if any, in every worker.
+            """
+            self.notification_routes.remove_fallback()
+            self._broadcast('remove_fallback_notification_cb')
+
 
 class InvalidAsyncResponseHandlerArgument(Exception):
     """
@@ -0,0 +1,64 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from typing import Any, List, Mapping, Optional
+
+
+class Notification:
+    """A notification ('m2m:sgn') sent by the CSE for a subscription.
+
+    Plain attributes only, so notifications can be handed to a process pool.
+    """
+
+    M2M_ATTR_SUBSCRIPTION_REFERENCE  = 'sur'
+    M2M_ATTR_NOTIFICATION_EVENT      = 'nev'
+    M2M_ATTR_REPRESENTATION          = 'rep'
+    M2M_ATTR_NOTIFICATION_EVENT_TYPE = 'net'
+    M2M_ATTR_VERIFICATION_REQUEST    = 'vrq'
+    M2M_ATTR_SUBSCRIPTION_DELETION   = 'sud'
+    M2M_ATTR_CREATOR                 = 'cr'
+
+    def __init__(self, sgn: Mapping[str, Any]):
+        """Constructor
+
+        Args:
+            sgn: The members of the 'm2m:sgn' primitive.
+        """
+        self.sur: Optional[str] = sgn.get(Notification.M2M_ATTR_SUBSCRIPTION_REFERENCE)
+        self.nev: Optional[Mapping[str, Any]] = sgn.get(Notification.M2M_ATTR_NOTIFICATION_EVENT)
+        self.vrq: bool = bool(sgn.get(Notification.M2M_ATTR_VERIFICATION_REQUEST, False))
+        self.sud: bool = bool(sgn.get(Notification.M2M_ATTR_SUBSCRIPTION_DELETION, False))
+        self.cr: Optional[str] = sgn.get(Notification.M2M_ATTR_CREATOR)
+        self.sgn = dict(sgn)
+
+    @staticmethod
+    def from_aggregated(agn: Mapping[str, Any]) -> List['Notification']:
+        """The notifications of an aggregated notification ('m2m:agn'), sent for batchNotify
+           subscriptions.
+
+        Args:
+            agn: The members of the 'm2m:agn' primitive.
+
+        Returns:
+            The notifications, in the order of the CSE.
+        """
+        sgns = agn.get('m2m:sgn') or []
+
+        if isinstance(sgns, Mapping):
+            sgns = [sgns]
+
+        return [Notification(sgn) for sgn in sgns]
+
+    @property
+    def representation(self) -> Any:
+        """The resource representation carried by the event, e.g. {'m2m:cin': {...}}."""
+        return (self.nev or {}).get(Notification.M2M_ATTR_REPRESENTATION)
+
+    @property
+    def event_type(self) -> Optional[int]:
+        """The notification event type (1 update, 2 delete, 3 create of a child, ...)."""
+        return (self.nev or {}).get(Notification.M2M_ATTR_NOTIFICATION_EVENT_TYPE)
+
+    def __repr__(self):
+        return '<Notification {}>'.format(self.sur)
@@ -0,0 +1,203 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, collections, functools
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+
+class NotificationDispatcher:
+    """Runs notification callbacks off the listener's request handling.
+
+    Accepted notifications wait in a bounded queue and are handed to the callbacks by
+    'workers' consumers: coroutine functions are awaited on the listener's loop, plain
+    functions run on a thread pool, or a process pool for CPU bound callbacks (callbacks and
+    their arguments must then be picklable).  A slow callback only occupies its consumer, the
+    listener keeps accepting notifications.
+
+    When the queue is full the overflow policy applies: REJECT answers the CSE with 503 and a
+    Retry-After hint, DROP_OLDEST discards the oldest queued notification to make room.
+
+    Must be used from a single event loop, the listener's.
+    """
+
+    REJECT      = 'reject'
+    DROP_OLDEST = 'drop-oldest'
+
+    DEFAULT_WORKERS     = 8
+    DEFAULT_QUEUE_SIZE  = 1024
+    DEFAULT_RETRY_AFTER = 1
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = REJECT,
+        retry_after: int = DEFAULT_RETRY_AFTER,
+        use_processes: bool = False,
+        executor: Executor = None,
+        on_error: Callable[[BaseException], Any] = None,
+    ):
+        """Constructor
+
+        Args:
+            workers: Callbacks running at the same time, and size of the pool created when no
+                executor is given.
+            queue_size: Notifications waiting for a worker before the overflow policy applies.
+            overflow: REJECT or DROP_OLDEST.
+            retry_after: Seconds the CSE is asked to wait before retrying a rejected notification.
+            use_processes: Run plain callbacks on a process pool instead of a thread pool.
+            executor: Pool of the plain callbacks.  Not shut down by close.
+            on_error: Called with the exception of a failed callback.  Printed by default.
+
+        Raises:
+            ValueError: If workers or queue_size is not positive or overflow is unknown.
+        """
+        if workers < 1 or queue_size < 1:
+            raise ValueError('workers and queue_size must be positive.')
+
+        if overflow not in (NotificationDispatcher.REJECT, NotificationDispatcher.DROP_OLDEST):
+            raise ValueError('Unknown overflow policy "{}".'.format(overflow))
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.retry_after = retry_after
+        self.use_processes = use_processes
+        self.on_error = on_error or print
+
+        self._executor = executor
+        self._owns_executor = executor is None
+
+        self._queue: Deque[Tuple[Callable, tuple]] = collections.deque()
+        # Created on the listener's loop by the first submit.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._consumers: List[asyncio.Task] = []
+        # Notifications queued or running.
+        self._pending = 0
+
+        # Counters.
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def executor(self) -> Executor:
+        """The pool of the plain callbacks, created on first use."""
+        if self._executor is None:
+            pool = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._executor = pool(max_workers=self.workers)
+
+        return self._executor
+
+    def __len__(self):
+        return len(self._queue)
+
+    def _start(self):
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Semaphore(0)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._consumers = [self._loop.create_task(self._consume()) for _ in range(self.workers)]
+
+    def submit(self, callback: Callable, *args: Any) -> bool:
+        """Queue a callback call.
+
+        Args:
+            callback: Coroutine function or plain function.
+            args: Its arguments.
+
+        Returns:
+            False if the notification was rejected because the queue is full.
+        """
+        if self._loop is None:
+            self._start()
+
+        if len(self._queue) >= self.queue_size:
+            if self.overflow == NotificationDispatcher.REJECT:
+                self.rejected += 1
+                return False
+
+            # Replaces the oldest, the queued count is unchanged.
+            self._queue.popleft()
+            self._queue.append((callback, args))
+            self.dropped += 1
+            self.accepted += 1
+            return True
+
+        self._queue.append((callback, args))
+        self._pending += 1
+        self._idle.clear()
+        self.accepted += 1
+        self._ready.release()
+
+        return True
+
+    def submit_all(self, calls: List[Tuple[Callable, tuple]]) -> bool:
+        """Queue the callback calls of one request, all or none.
+
+        Args:
+            calls: (callback, args) pairs.
+
+        Returns:
+            False if the calls were rejected because the queue has no room for all of them.
+        """
+        if self.overflow == NotificationDispatcher.REJECT and len(self._queue) + len(calls) > self.queue_size:
+            if self._loop is None:
+                self._start()
+            self.rejected += len(calls)
+            return False
+
+        for callback, args in calls:
+            self.submit(callback, *args)
+
+        return True
+
+    async def _consume(self):
+        while True:
+            await self._ready.acquire()
+            callback, args = self._queue.popleft()
+
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(*args)
+                else:
+                    await self._loop.run_in_executor(self.executor, functools.partial(callback, *args))
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self.failed += 1
+                self.on_error(err)
+            finally:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.set()
+
+    async def join(self):
+        """Wait until every accepted notification has been handled."""
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def close(self):
+        """Stop the consumers, dropping the queued notifications, and shut down the pool it created."""
+        for consumer in self._consumers:
+            consumer.cancel()
+
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+
+        self._consumers = []
+        self._queue.clear()
+        self._pending = 0
+        self._loop = None
+        if self._idle is not None:
+            self._idle.set()
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,224 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import fnmatch, re, threading
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class NotificationRoute:
+    """A notification handler registered in a NotificationRouter."""
+
+    def __init__(self, uri: str, handler: Callable, batch: bool = False, prefix: bool = False):
+        self.uri = uri
+        self.handler = handler
+        # The handler takes a list of notifications.
+        self.batch = batch
+        # Also matches the resources below uri.
+        self.prefix = prefix
+
+    def __repr__(self):
+        return '<NotificationRoute {}{}>'.format(self.uri, '/...' if self.prefix else '')
+
+
+class _Node:
+    __slots__ = ('children', 'patterns', 'exact', 'prefix')
+
+    def __init__(self):
+        # Literal segments, and glob segments with their compiled matcher and specificity.
+        self.children: Dict[str, _Node] = {}
+        self.patterns: Dict[str, Tuple[Callable, int, _Node]] = {}
+        self.exact: Optional[NotificationRoute] = None
+        self.prefix: Optional[NotificationRoute] = None
+
+    def empty(self) -> bool:
+        return not (self.children or self.patterns or self.exact or self.prefix)
+
+
+class NotificationRouter:
+    """Routes notifications to handlers by subscription reference.
+
+    Handlers are registered for an exact URI, for a path prefix (the URI and every resource
+    below it) or for a glob pattern matched segment by segment ('/PN_CSE/nod-*/lcoi/*'), and
+    kept in a trie of path segments: a lookup walks the segments of the URI instead of
+    scanning the registrations.  The most specific route wins: an exact match over a pattern,
+    the pattern with the most literal segments (then literal characters), then the longest
+    prefix, then the fallback.
+    """
+
+    _MAGIC = re.compile('[*?[]')
+
+    def __init__(self):
+        self.fallback: Optional[NotificationRoute] = None
+
+        self._root = _Node()
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _segments(uri: str) -> List[str]:
+        return str(uri).rstrip('/').split('/')
+
+    def _node(self, uri: str, create: bool) -> Optional[_Node]:
+        node = self._root
+
+        for segment in NotificationRouter._segments(uri):
+            if NotificationRouter._MAGIC.search(segment) is None:
+                child = node.children.get(segment)
+                if child is None and create:
+                    child = node.children[segment] = _Node()
+            else:
+                entry = node.patterns.get(segment)
+                if entry is None and create:
+                    entry = node.patterns[segment] = (
+                        re.compile(fnmatch.translate(segment)).match,
+                        len(NotificationRouter._MAGIC.sub('', segment)),
+                        _Node(),
+                    )
+                child = entry[2] if entry is not None else None
+
+            if child is None:
+                return None
+            node = child
+
+        return node
+
+    def add(self, uri: str, handler: Callable, batch: bool = False, prefix: bool = False) -> NotificationRoute:
+        """Register a handler, replacing the one of the same URI and kind.
+
+        Args:
+            uri: Subscription reference, or glob pattern of subscription references.
+            handler: The handler.
+            batch: The handler takes a list of notifications.
+            prefix: Also route the resources below uri to the handler.
+
+        Returns:
+            NotificationRoute: The route.
+        """
+        route = NotificationRoute(str(uri), handler, batch, prefix)
+
+        with self._lock:
+            node = self._node(uri, True)
+
+            if prefix:
+                replaced, node.prefix = node.prefix, route
+            else:
+                replaced, node.exact = node.exact, route
+
+            if replaced is None:
+                self._count += 1
+
+        return route
+
+    def get(self, uri: str, prefix: bool = False) -> Optional[NotificationRoute]:
+        """The route registered for uri, not matched against the other routes.
+        """
+        with self._lock:
+            node = self._node(uri, False)
+
+        if node is None:
+            return None
+
+        return node.prefix if prefix else node.exact
+
+    def remove(self, uri: str, prefix: bool = False) -> bool:
+        """Unregister the handler of uri.
+
+        Returns:
+            Whether a handler was registered.
+        """
+        with self._lock:
+            path: List[Tuple[_Node, str, bool]] = []
+            node = self._root
+
+            for segment in NotificationRouter._segments(uri):
+                literal = NotificationRouter._MAGIC.search(segment) is None
+                if literal:
+                    child = node.children.get(segment)
+                else:
+                    entry = node.patterns.get(segment)
+                    child = entry[2] if entry is not None else None
+
+                if child is None:
+                    return False
+
+                path.append((node, segment, literal))
+                node = child
+
+            if prefix:
+                removed, node.prefix = node.prefix, None
+            else:
+                removed, node.exact = node.exact, None
+
+            if removed is None:
+                return False
+
+            self._count -= 1
+
+            # Prune the branch left empty.
+            for parent, segment, literal in reversed(path):
+                if not node.empty():
+                    break
+                del (parent.children if literal else parent.patterns)[segment]
+                node = parent
+
+            return True
+
+    def set_fallback(self, handler: Callable, batch: bool = False):
+        """Handle the notifications no route matches.
+        """
+        self.fallback = NotificationRoute('*', handler, batch)
+
+    def remove_fallback(self):
+        self.fallback = None
+
+    def match(self, uri: str) -> Optional[NotificationRoute]:
+        """The route of the notifications of uri, or the fallback.
+
+        Args:
+            uri: The subscription reference.
+
+        Returns:
+            NotificationRoute: The most specific route, None if none matches and there is no
+            fallback.
+        """
+        segments = NotificationRouter._segments(uri)
+        best, best_score = None, None
+
+        with self._lock:
+            # Depth first, literal children before patterns, so equally specific routes
+            # resolve in a stable order.
+            stack = [(self._root, 0, 0, 0)]
+
+            while stack:
+                node, depth, literals, specificity = stack.pop()
+
+                if node.prefix is not None:
+                    score = (1, depth, literals, specificity)
+                    if best_score is None or score > best_score:
+                        best, best_score = node.prefix, score
+
+                if depth == len(segments):
+                    if node.exact is not None:
+                        score = (2, literals, specificity, 0)
+                        if best_score is None or score > best_score:
+                            best, best_score = node.exact, score
+                            if literals == len(segments):
+                                break
+                    continue
+
+                segment = segments[depth]
+
+                for matches, chars, child in reversed(list(node.patterns.values())):
+                    if matches(segment):
+                        stack.append((child, depth + 1, literals, specificity + chars))
+
+                child = node.children.get(segment)
+                if child is not None:
+                    stack.append((child, depth + 1, literals + 1, specificity))
+
+        return best or self.fallback
+
+    def __len__(self):
+        return self._count
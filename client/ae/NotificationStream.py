@@ -0,0 +1,158 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio
+
+from client.ae.Notification import Notification
+
+from typing import Callable, List, Optional, Union
+
+
+class NotificationStream:
+    """Asynchronous iterator over the notifications of a subscription.
+
+    Notifications are buffered in a bounded queue and consumed with 'async for', one by one
+    or in micro-batches:
+
+        async for notifications in listener.stream(sur, batch=500, timeout=1.0):
+            await store(notifications)
+
+    The iteration only ends once the stream is closed and its buffer consumed.  A full buffer blocks the listener's dispatcher, whose own queue then applies its
+    overflow policy.  Created by the listener from the event loop that consumes it.
+    """
+
+    DEFAULT_BUFFER_SIZE = 1024
+
+    # Marks the end of the stream in the buffer.
+    _CLOSED = object()
+
+    def __init__(
+        self,
+        batch: Optional[int] = None,
+        timeout: Optional[float] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        on_close: Callable[[], None] = None,
+    ):
+        """Constructor
+
+        Args:
+            batch: Yield lists of up to batch notifications instead of single notifications.
+            timeout: Seconds a partial batch waits for more notifications, from its first
+                one, before it is yielded.  Batches are only yielded full when None.
+            buffer_size: Notifications buffered for the consumer.
+            on_close: Called once when the stream is closed.
+
+        Raises:
+            ValueError: If batch or buffer_size is not positive.
+            RuntimeError: If no event loop is running.
+        """
+        if (batch is not None and batch < 1) or buffer_size < 1:
+            raise ValueError('batch and buffer_size must be positive.')
+
+        self.batch = batch
+        self.timeout = timeout
+        self.on_close = on_close
+        self.closed = False
+
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(buffer_size)
+
+    async def put(self, notification: Notification):
+        """Buffer a notification, waiting for room.  Can be called from any event loop.
+        """
+        await self.put_all([notification])
+
+    async def put_all(self, notifications: List[Notification]):
+        """Buffer notifications, e.g. the content of an aggregated notification, waiting for
+           room.  Can be called from any event loop.
+        """
+        if self.closed:
+            return
+
+        if asyncio.get_running_loop() is self._loop:
+            await self._put_all(notifications)
+            return
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._put_all(notifications), self._loop)
+        except RuntimeError:
+            # The consumer's loop is closed.
+            return
+
+        await asyncio.wrap_future(future)
+
+    async def _put_all(self, notifications: List[Notification]):
+        for notification in notifications:
+            if self.closed:
+                return
+            await self._queue.put(notification)
+
+    def close(self):
+        """End the iteration once the buffered notifications are consumed.  Thread safe.
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+
+        if self.on_close is not None:
+            self.on_close()
+
+        def wake():
+            try:
+                self._queue.put_nowait(NotificationStream._CLOSED)
+            except asyncio.QueueFull:
+                # The consumer is not waiting, it checks 'closed' once the buffer is empty.
+                pass
+
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                wake()
+                return
+        except RuntimeError:
+            pass
+
+        try:
+            self._loop.call_soon_threadsafe(wake)
+        except RuntimeError:
+            pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Union[Notification, List[Notification]]:
+        size = self.batch or 1
+        # Set by the first notification of the batch.
+        deadline = None
+        notifications: List[Notification] = []
+
+        while len(notifications) < size:
+            if self._queue.empty():
+                if self.closed:
+                    break
+
+                remaining = None if deadline is None else deadline - self._loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+
+            if item is NotificationStream._CLOSED:
+                continue
+
+            if deadline is None and self.timeout is not None:
+                deadline = self._loop.time() + self.timeout
+
+            notifications.append(item)
+
+        if not notifications:
+            # Closed and drained.
+            raise StopAsyncIteration
+
+        return notifications if self.batch is not None else notifications[0]
@@ -0,0 +1,299 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio
+
+from client.cse.BaseCSE import BaseCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MResource import OneM2MResource
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.NonBlockingResponse import NonBlockingResponse
+from client.onem2m.resource.ContentInstance import ContentInstance
+from client.cse.BulkIngest import BulkIngest, BulkItems, BulkResult
+
+from typing import Any, AsyncIterator, Callable, List, Optional, Union
+
+class AsyncCSE(BaseCSE):
+    """Asynchronous CSE client.
+
+    Exposes the request methods of CSE as coroutines.  Every request is issued on the running
+    event loop over the connection pool of the shared HttpSession, so no thread is tied up
+    while a request is in flight.
+    """
+
+    async def close(self):
+        """Release the pooled connections held by this CSE.
+        """
+        await self.session.close_async()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _send(self, operation: str, to: str, params: OneM2MRequest.Parameters, content=None):
+        """Issue a OneM2M request over the CSE session.
+
+        Args:
+            operation: The OneM2M operation.
+            to: The target URI.
+            params: The request params.
+            content: A OneM2MResource for Create and Update operations.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._new_request().request_async(operation, to, params, content)
+
+    async def send_non_blocking(
+        self,
+        operation: str,
+        uri: str,
+        content: OneM2MResource = None,
+        params: OneM2MRequest.Parameters = None,
+        notification_uri: Union[str, List[str]] = None,
+        listener: Any = None,
+        poll_interval: Optional[float] = NonBlockingResponse.DEFAULT_POLL_INTERVAL,
+    ) -> NonBlockingResponse:
+        """Issue a non-blocking request and return a handle on its result, see CSE.send_non_blocking.
+
+        Await the handle (or its wait method) for the operation response.
+
+        Returns:
+            NonBlockingResponse: Future-like handle resolving with the operation response.
+        """
+        request, handle, args = self._non_blocking_request(
+            operation, uri, content, params, notification_uri, listener, poll_interval
+        )
+
+        try:
+            handle._on_accepted(await request.request_async(*args))
+        except BaseException:
+            handle._unlisten()
+            raise
+
+        return handle
+
+    async def register_ae(self, ae: AE):
+        """Register an AE with a CSE.
+
+        Args:
+            ae (AE): The AE to register.
+
+        Returns:
+            OneM2MResponse: The request response.
+
+        Raises:
+            InvalidArgumentException: If the argument is not an AE or a dict containing AE attributes.
+        """
+        oneM2MResponse = await self._send(*self._register_ae_request(ae))
+
+        return self._on_register_ae(oneM2MResponse)
+
+    async def get_ae(self, ae_id: str):
+        oneM2MResponse = await self._send(*self._get_ae_request(ae_id))
+
+        return self._on_get_ae(oneM2MResponse)
+
+    async def discover_resources(self):
+        """Discover containers registered with the CSE.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._discover_resources_request())
+
+    async def iter_discover(
+        self, uri: str = None, page_size: int = 100, drt: int = None, prefetch: bool = False, **filters: Any
+    ) -> AsyncIterator[str]:
+        """Discover resources page by page, yielding URIs as each page arrives, see CSE.iter_discover.
+
+        With prefetch the next page is requested in a task while the current one is consumed.
+
+        Yields:
+            str: The discovered resource URIs.
+        """
+        async def fetch(offset: int):
+            return await self._send(*self._discover_page_request(uri, page_size, offset, drt, filters))
+
+        offset = 0
+        pending = None
+        previous = None
+
+        try:
+            while True:
+                response = await pending if pending is not None else await fetch(offset)
+                pending = None
+
+                page = self._on_discover_page(response)
+
+                # A CSE ignoring 'ofst' would return the same page forever.
+                if page == previous and page:
+                    return
+
+                more = len(page) == page_size
+                if more and prefetch:
+                    pending = asyncio.ensure_future(fetch(offset + page_size))
+
+                for resource_uri in page:
+                    yield resource_uri
+
+                if not more:
+                    return
+
+                previous = page
+                offset += page_size
+        finally:
+            # The consumer stopped early.
+            if pending is not None:
+                pending.cancel()
+
+    async def create_content_instance(self, uri: str, content: ContentInstance = None, result_content=None):
+        """Create a content instance of a container resource.
+
+        Args:
+            uri: URI of a container resource.
+            result_content: Result content (rcn) of the response, e.g.
+                M2M_RESULT_CONTENT_TYPES.Nothing when only the status code is needed.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._create_content_instance_request(uri, content, result_content))
+
+    async def create_content_instances(
+        self,
+        items: BulkItems,
+        concurrency: int = 10,
+        progress: Callable[[BulkResult], None] = None,
+        result_content=None,
+    ) -> BulkResult:
+        """Create many content instances, pipelined over the pooled session.
+
+        Args:
+            items: Iterable or async iterable of (container URI, content) pairs.  Content that is
+                not a OneM2MResource is wrapped as the 'con' of a ContentInstance.
+            concurrency: Maximum number of requests in flight.
+            progress: Called with the running BulkResult after each item completes.
+            result_content: Result content (rcn) of every response, see create_content_instance.
+
+        Returns:
+            BulkResult: Per item responses (or exceptions) in order, with throughput and failures.
+        """
+        return await BulkIngest(self._bulk_sender(result_content), concurrency, progress).run(items)
+
+    async def retrieve_content_instance(self, uri: str, rcn: int = 7):
+        """Retrieves the latest content instance of a container resource.
+
+        Args:
+            uri: URI of a resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._retrieve_content_instance_request(uri, rcn))
+
+    async def check_existing_subscriptions(self, uri: str, subscription_name: str):
+        """Retrieve all existing subscriptions on a resource
+        Args:
+            uri: URI of a resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._check_existing_subscriptions_request(uri, subscription_name))
+
+    async def create_subscription(
+        self,
+        uri: str,
+        sub_name: str,
+        notification_uri: str = None,
+        event_types: List[int] = [3],
+        result_content=None,
+        batch_size: int = None,
+        batch_duration: float = None,
+    ):
+        """ Create a subscription to a resource.
+
+        Args:
+            uri: URI of a resource.
+            batch_size: Ask the CSE to aggregate up to batch_size notifications into one
+                'm2m:agn' request.
+            batch_duration: Seconds the CSE may hold notifications back to aggregate them.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(
+            *self._create_subscription_request(
+                uri, sub_name, notification_uri, event_types, result_content, batch_size, batch_duration
+            )
+        )
+
+    async def create_resource(
+        self, uri: str, name: str, content, result_content=None
+    ):
+        """ Create a resource.
+
+        Args:
+            uri: URI of a resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._create_resource_request(uri, name, content, result_content))
+
+    async def retrieve_latest_content_instance(self, uri: str):
+        """Retrieve the latest content instance of a container.
+
+        Args:
+            uri: The container resource URI.
+
+        Returns:
+            An instance of ContentInstance or None if no content instance was found.
+        """
+        oneM2MResponse = await self._send(*self._retrieve_latest_content_instance_request(uri))
+
+        return self._on_retrieve_latest_content_instance(oneM2MResponse)
+
+    async def retrieve_resource(self, uri: str, ty: OneM2MPrimitive.M2M_RESOURCE_TYPES):
+        """ Retrieve resource request.
+
+        Args:
+            uri: The URI of the resource to retrieve.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._retrieve_resource_request(uri, ty))
+
+    async def update_resource(self, uri: str, resource: OneM2MResource):
+        """ Update a resource.
+
+        Args:
+            uri: The URI of the resource to update.
+            resource: The updated resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._update_resource_request(uri, resource))
+
+    async def delete_ae(self):
+        """ Delete ae.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._delete_ae_request())
+
+    async def delete_resource(self, uri: str):
+        """ Delete resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._send(*self._delete_resource_request(uri))
@@ -0,0 +1,413 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from client.ae.AE import AE
+from client.onem2m.OneM2MResource import OneM2MResource
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.TlsConfig import TlsConfig
+from client.onem2m.http.EndpointPool import EndpointPool
+from client.onem2m.http.Deadline import Deadline
+from client.onem2m.http.NonBlockingResponse import NonBlockingResponse
+from client.onem2m.codec.Codec import Codec
+from client.onem2m.OneM2MOperation import OneM2MOperation
+from client.onem2m.resource.ContentInstance import ContentInstance
+from client.onem2m.resource.Subscription import Subscription
+from client.cse.ResourceHandle import ResourceHandle
+from client.exceptions.InvalidArgumentException import InvalidArgumentException
+
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# (operation, to, params, content) describing a single OneM2M request.
+RequestArgs = Tuple[str, str, OneM2MRequest.Parameters, Any]
+
+class BaseCSE:
+    """State and request builders shared by CSE and AsyncCSE.
+
+    Each operation is split into a '_x_request' builder returning the RequestArgs to send and,
+    where the response updates the client, an '_on_x' handler.  The subclasses only send the
+    requests, blocking or on the event loop.
+    """
+
+    CSE_RESOURCE = 'PN_CSE'
+
+    ae: Optional[AE] = None
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        rsc: str = None,
+        transport_protocol = 'http',
+        session: HttpSession = None,
+        codec: Codec = None,
+        lazy_decode: bool = False,
+        tls: TlsConfig = None,
+        endpoints: EndpointPool = None,
+    ):
+        """Constructor
+
+        Args:
+            host (str): CSE host
+            port (int): CSE port
+            rsc (str): Base resource
+            transport_protocol (str): 'http' or 'https'
+            session (HttpSession): Pooled HTTP session shared by every request issued by this CSE.
+                A session with default pool settings is created if none is provided.
+            codec (Codec): Content codec of every request.  Defaults to the standard library JSON codec.
+            lazy_decode (bool): Decode response bodies only when 'pc' is accessed.  Combined with
+                result_content=Nothing on writes, responses that are only checked for 'rsc' are
+                never parsed.
+            tls (TlsConfig): TLS settings of the session created when none is provided.  Defaults
+                to verifying the CSE certificate against the requests CA bundle.
+            endpoints (EndpointPool): Equivalent front ends of the CSE, for the session created
+                when none is provided.  host:port should be one of them; requests addressed to it
+                are spread over the pool and fail over between its endpoints.
+
+        Raises:
+            InvalidArgumentException: If both a session and TLS settings or endpoints are provided.
+        """
+        if session is not None and (tls is not None or endpoints is not None):
+            raise InvalidArgumentException('Configure the TLS settings and endpoints on the provided session.')
+
+        self.transport_protocol = transport_protocol
+        self.host = host
+        self.port = port
+        self.rsc = rsc or BaseCSE.CSE_RESOURCE
+        self.session = session or HttpSession(tls=tls, endpoints=endpoints)
+        self.codec = codec
+        self.lazy_decode = lazy_decode
+
+    def deadline(self, timeout: float):
+        """Context manager applying a deadline to every request issued in the block.
+
+        Overrides the session timeout.  The deadline is sent as X-M2M-RET and bounds the socket
+        timeouts and retries of each request.
+
+        Args:
+            timeout: Seconds from now until the deadline.
+        """
+        return Deadline.scope(timeout)
+
+    def _new_request(self) -> OneM2MRequest:
+        """Build a request bound to this CSE's session and codec.
+        """
+        return OneM2MRequest(session=self.session, codec=self.codec, lazy_decode=self.lazy_decode)
+
+    def resource(self, uri: str) -> ResourceHandle:
+        """Handle on a resource of this CSE whose requests are prepared once and reused.
+
+        Use it for operations repeated on the same resource, e.g. content instance ingestion
+        into a container.
+
+        Args:
+            uri: URI of the resource.
+
+        Returns:
+            ResourceHandle: The resource handle.
+        """
+        return ResourceHandle(self, uri)
+
+    def _bulk_sender(self, result_content=None) -> Callable:
+        """Coroutine function creating a content instance through a per container resource handle.
+        """
+        handles = {}
+
+        async def send(uri: str, content: ContentInstance):
+            handle = handles.get(uri)
+            if handle is None:
+                handle = handles[uri] = self.resource(uri)
+            return await handle.create_content_instance_async(content, result_content)
+
+        return send
+
+    def _non_blocking_request(
+        self,
+        operation: str,
+        uri: str,
+        content: OneM2MResource,
+        params: Optional[OneM2MRequest.Parameters],
+        notification_uri: Union[str, List[str], None],
+        listener: Any,
+        poll_interval: Optional[float],
+    ) -> Tuple[OneM2MRequest, NonBlockingResponse, RequestArgs]:
+        if listener is not None and notification_uri is None:
+            raise InvalidArgumentException('A listener requires the notification_uri the CSE sends the result to.')
+
+        to = self.get_to(uri)
+        assert self.ae is not None
+        request = self._new_request()
+
+        # The rqi is chosen here so the notification callback is registered before sending.
+        rqi = request._generate_rqi()
+
+        nb_params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MPrimitive.M2M_PARAM_REQUEST_IDENTIFIER: rqi,
+            OneM2MRequest.M2M_PARAM_RESPONSE_TYPE: OneM2MPrimitive.M2M_RESPONSE_TYPES.NonBlockingRequestSynch.value,
+        }
+
+        if notification_uri is not None:
+            if not isinstance(notification_uri, str):
+                notification_uri = '&'.join(notification_uri)
+            nb_params[OneM2MRequest.M2M_PARAM_RESPONSE_TYPE] = OneM2MPrimitive.M2M_RESPONSE_TYPES.NonBlockingRequestAsynch.value
+            nb_params[OneM2MPrimitive.M2M_PARAM_RESPONSE_TYPE_NOTIFICATION_URIS] = notification_uri
+
+        nb_params.update(params or {})
+
+        handle = NonBlockingResponse(
+            request, to, rqi, self.ae.ri, poll_interval=None if listener is not None else poll_interval
+        )
+
+        if listener is not None:
+            handle.listen(listener)
+
+        return request, handle, (operation, to, nb_params, content)
+
+    def _register_ae_request(self, ae: AE) -> RequestArgs:
+        if isinstance(ae, AE) is False:
+            raise InvalidArgumentException('AE registration expects an instance AE.')
+
+        # Host and resource.
+        to = '{}://{}:{}/PN_CSE'.format(self.transport_protocol, self.host, self.port)
+
+        # op is not required as it is implied by the function that the params will be passed to.
+        params = {
+            OneM2MPrimitive.M2M_PARAM_TO: to,
+            OneM2MPrimitive.M2M_PARAM_FROM: ae.aei,  # The AE-Credential-ID needs to be removed from the ae object
+            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.AE.value
+        }
+
+        # Remove AE-Credential-ID.
+        ae.__dict__.pop(OneM2MPrimitive.M2M_PARAM_AE_ID)
+
+        return OneM2MOperation.Create, to, params, ae
+
+    def _on_register_ae(self, oneM2MResponse: OneM2MResponse):
+        # Return the AE instance or None if registration failed.
+        # @todo return error msg or object with error msg.
+        if oneM2MResponse.rsc == OneM2MPrimitive.M2M_RSC_CREATED:
+            self.ae = AE(oneM2MResponse.pc)
+
+        return oneM2MResponse
+
+    def _get_ae_request(self, ae_id: str) -> RequestArgs:
+        # Host and resource.
+        to = '{}://{}:{}/PN_CSE/{}'.format(
+            self.transport_protocol, self.host, self.port, ae_id
+        )
+
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: ae_id,
+            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.AE.value
+        }
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def _on_get_ae(self, oneM2MResponse: OneM2MResponse):
+        if oneM2MResponse.rsc == OneM2MPrimitive.M2M_RSC_OK and oneM2MResponse.pc is not None:
+            self.ae = AE(oneM2MResponse.pc)
+
+        return oneM2MResponse
+
+    def _discover_resources_request(self) -> RequestArgs:
+        # note: fu (filter usage) parameter required for resource discovery.
+        to = self.get_to(self.rsc)
+
+        params = {
+            OneM2MRequest.M2M_PARAM_FILTER_USAGE: 1,
+            OneM2MRequest.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.Node.value
+        }
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def _discover_page_request(
+        self, uri: Optional[str], page_size: int, offset: int, drt: Optional[int], filters: OneM2MRequest.Parameters
+    ) -> RequestArgs:
+        to = self.get_to(uri or self.rsc)
+        assert self.ae is not None
+
+        params = dict(filters)
+        params.update({
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MRequest.M2M_PARAM_FILTER_USAGE: OneM2MPrimitive.M2M_FILTER_USAGE.Discovery.value,
+            OneM2MRequest.M2M_PARAM_LIMIT: page_size,
+            OneM2MRequest.M2M_PARAM_OFFSET: offset,
+        })
+
+        if drt is not None:
+            params[OneM2MRequest.M2M_PARAM_DISCOVERY_RESULT_TYPE] = drt
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def _on_discover_page(self, oneM2MResponse: OneM2MResponse) -> List[str]:
+        uril = oneM2MResponse.pc.get('m2m:uril') if isinstance(oneM2MResponse.pc, dict) else None
+
+        # Some CSEs serialize the URI list as a space separated string.
+        if isinstance(uril, str):
+            uril = uril.split()
+
+        return list(uril or [])
+
+    def _create_content_instance_request(
+        self, uri: str, content: ContentInstance = None, result_content=None
+    ) -> RequestArgs:
+        # Strip leading '/'
+        uri = uri[1:] if uri[0] == '/' else uri
+
+        to = self.get_to(uri)
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,  # resource id.
+            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value,
+        }
+
+        if result_content is not None:
+            params[OneM2MPrimitive.M2M_PARAM_RESULT_CONTENT] = result_content
+
+        return OneM2MOperation.Create, to, params, content
+
+    def _retrieve_content_instance_request(self, uri: str, rcn: int = 7) -> RequestArgs:
+        to = self.get_to(uri)
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value
+        }
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def get_to(self, rsc: str):
+        rsc = rsc[1:] if rsc[0] == '/' else rsc
+        to = '{}://{}:{}/{}'.format(self.transport_protocol, self.host, self.port, rsc)
+        return to
+
+    def _check_existing_subscriptions_request(self, uri: str, subscription_name: str) -> RequestArgs:
+        to = self.get_to(uri)
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MPrimitive.M2M_PARAM_FILTER_USAGE: 1,
+            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.Subscription,
+        }
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def _create_subscription_request(
+        self,
+        uri: str,
+        sub_name: str,
+        notification_uri: str = None,
+        event_types: List[int] = [3],
+        result_content=None,
+        batch_size: int = None,
+        batch_duration: float = None,
+    ) -> RequestArgs:
+        json_data = {
+            'enc': {'net': event_types, 'ty': 4},
+            'nct': 1,
+        }
+
+        if notification_uri:
+            json_data['nu'] = [notification_uri]
+
+        if batch_size is not None or batch_duration is not None:
+            json_data[Subscription.M2M_ATTR_BATCH_NOTIFY] = Subscription.batch_notify(batch_size, batch_duration)
+
+        operation, to, params, content = self._create_resource_request(
+            uri,
+            sub_name,
+            Subscription(json_data),
+            result_content
+        )
+        params[OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE] = OneM2MPrimitive.M2M_RESOURCE_TYPES.Subscription.value
+
+        return operation, to, params, content
+
+    def _create_resource_request(
+        self, uri: str, name: str, content, result_content=None
+    ) -> RequestArgs:
+        to = self.get_to(uri)
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+        }
+
+        if result_content is not None:
+            params[OneM2MPrimitive.M2M_PARAM_RESULT_CONTENT] = result_content
+
+        content.name = name
+
+        return OneM2MOperation.Create, to, params, content
+
+    def _retrieve_latest_content_instance_request(self, uri: str) -> RequestArgs:
+        # Remove leading slash
+        uri = uri[1:] if uri[0] == '/' else uri
+        assert self.ae is not None
+        to = '{}://{}:{}/{}/la'.format(
+            self.transport_protocol, self.host, self.port, uri
+        )
+
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+        }
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def _on_retrieve_latest_content_instance(self, oneM2MResponse: OneM2MResponse):
+        # How do you want to handle responses?
+        if oneM2MResponse.uri == OneM2MPrimitive.M2M_RSC_OK:
+            return ContentInstance(oneM2MResponse.pc['m2m:cin'])
+        else:
+            return None
+
+    def _retrieve_resource_request(self, uri: str, ty: OneM2MPrimitive.M2M_RESOURCE_TYPES) -> RequestArgs:
+        to = self.get_to(uri)
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: ty
+        }
+
+        return OneM2MOperation.Retrieve, to, params, None
+
+    def _update_resource_request(self, uri: str, resource: OneM2MResource) -> RequestArgs:
+        to = self.get_to(uri)
+
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri
+        }
+
+        return OneM2MOperation.Update, to, params, resource
+
+    def _delete_ae_request(self) -> RequestArgs:
+        # Host and resource.
+        to = '{}://{}:{}/{}/{}'.format(
+            self.transport_protocol, self.host, self.port, self.rsc, self.ae.ri
+        )
+
+        # op is not required as it is implied by the function that the params will be passed to.
+        params = {
+            OneM2MPrimitive.M2M_PARAM_TO: to,
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.AE.value
+        }
+
+        return OneM2MOperation.Delete, to, params, None
+
+    def _delete_resource_request(self, uri: str) -> RequestArgs:
+        # Host and resource.
+        to = self.get_to(uri)
+
+        # op is not required as it is implied by the function that the params will be passed to.
+        assert self.ae is not None
+        params = {
+            OneM2MPrimitive.M2M_PARAM_TO: to,
+            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
+        }
+
+        return OneM2MOperation.Delete, to, params, None
@@ -0,0 +1,143 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, time
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.OneM2MResource import OneM2MResource
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+
+# (container URI, content) pair submitted for ingestion.
+BulkItem = Tuple[str, Any]
+BulkItems = Union[Iterable[BulkItem], AsyncIterable[BulkItem]]
+
+
+class BulkResult:
+    """Outcome of a bulk content instance ingestion.
+
+    'results' holds one entry per submitted item, in submission order: the OneM2MResponse
+    of the request, or the exception it raised.
+    """
+
+    def __init__(self):
+        self.results: List[Any] = []
+        self.succeeded = 0
+        self.failed = 0
+        # Indexes of the items that raised or were not created.
+        self.failures: List[int] = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed items per second."""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def _record(self, index: int, result: Any):
+        self.results[index] = result
+
+        if isinstance(result, Exception) or getattr(result, 'rsc', None) != OneM2MPrimitive.M2M_RSC_CREATED:
+            self.failed += 1
+            self.failures.append(index)
+        else:
+            self.succeeded += 1
+
+        self.elapsed = time.monotonic() - self.started
+
+    def __str__(self):
+        return '{} items, {} succeeded, {} failed in {:.2f}s ({:.1f}/s)'.format(
+            self.total, self.succeeded, self.failed, self.elapsed, self.throughput
+        )
+
+
+class BulkIngest:
+    """Pipelines content instance creation over a pooled session with bounded concurrency.
+
+    A producer reads (uri, content) pairs from a sync or async iterable into a bounded
+    queue and 'concurrency' workers drain it, so at most 'concurrency' requests are in
+    flight and the input is never fully materialised.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, OneM2MResource], Awaitable[Any]],
+        concurrency: int = 10,
+        progress: Optional[Callable[[BulkResult], None]] = None,
+    ):
+        """Constructor
+
+        Args:
+            send: Coroutine function creating one content instance from (uri, content).
+            concurrency: Maximum number of requests in flight.
+            progress: Called with the running BulkResult after each item completes.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        self.send = send
+        self.concurrency = concurrency
+        self.progress = progress
+
+    async def run(self, items: BulkItems) -> BulkResult:
+        """Ingest every item.
+
+        Args:
+            items: Iterable or async iterable of (container URI, content) pairs.  Content that
+                is not a OneM2MResource is wrapped as the 'con' of a ContentInstance.
+
+        Returns:
+            BulkResult: Per item results in order, plus throughput and failure counts.
+        """
+        result = BulkResult()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce():
+            index = 0
+            try:
+                if hasattr(items, '__aiter__'):
+                    async for item in items:  # type: ignore
+                        result.results.append(None)
+                        await queue.put((index, item))
+                        index += 1
+                else:
+                    for item in items:  # type: ignore
+                        result.results.append(None)
+                        await queue.put((index, item))
+                        index += 1
+            finally:
+                # One stop marker per worker, even if the input raised.
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+        async def work():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+
+                index, (uri, content) = entry
+                if not isinstance(content, OneM2MResource):
+                    content = ContentInstance({'con': content})
+
+                try:
+                    response = await self.send(uri, content)
+                except Exception as err:
+                    response = err
+
+                result._record(index, response)
+
+                if self.progress is not None:
+                    self.progress(result)
+
+        await asyncio.gather(produce(), *[work() for _ in range(self.concurrency)])
+
+        result.elapsed = time.monotonic() - result.started
+
+        return result
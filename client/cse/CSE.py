@@ -2,100 +2,236 @@
 
 #!/usr/bin/env python
 
-import json, random
+import asyncio, contextvars, json, random, threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from client.ae.AE import AE
 from client.onem2m.OneM2MResource import OneM2MResource, OneM2MResourceContent
 from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
 from client.onem2m.http.OneM2MRequest import OneM2MRequest
-from client.onem2m.OneM2MOperation import OneM2MOperation
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.TlsConfig import TlsConfig
+from client.onem2m.http.EndpointPool import EndpointPool
+from client.onem2m.http.NonBlockingResponse import NonBlockingResponse
+from client.onem2m.codec.Codec import Codec
 from client.onem2m.resource.ContentInstance import ContentInstance as ContentInstance
-from client.onem2m.resource.Subscription import Subscription
-from client.exceptions.InvalidArgumentException import InvalidArgumentException
+from client.cse.BaseCSE import BaseCSE
+from client.cse.BulkIngest import BulkIngest, BulkItems, BulkResult
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+class CSE(BaseCSE):
+    """Synchronous CSE client.
+
+    A CSE can be shared by threads.  Every request works on its own copy of the params and
+    headers, the HttpSession connection pool, circuit breaker and request id generator are
+    thread safe, and 'ae' is only ever replaced (by register_ae and get_ae), never modified
+    in place.  Deadlines and traces are per thread; submit and map carry the caller's into
+    the worker threads.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        rsc: str = None,
+        transport_protocol = 'http',
+        session: HttpSession = None,
+        codec: Codec = None,
+        max_workers: int = None,
+        lazy_decode: bool = False,
+        tls: TlsConfig = None,
+        endpoints: EndpointPool = None,
+    ):
+        """Constructor
 
-from typing import List, Optional
+        Args:
+            max_workers (int): Threads of the pool used by submit and map.  Defaults to the
+                ThreadPoolExecutor default.  Keep the session pool_maxsize at least as large so
+                every thread gets a pooled connection.
+            The other arguments are described in BaseCSE.
 
-class CSE:
+        Raises:
+            InvalidArgumentException: If both a session and TLS settings or endpoints are provided.
+        """
+        super().__init__(host, port, rsc, transport_protocol, session, codec, lazy_decode, tls, endpoints)
 
+        self.max_workers = max_workers
 
-    CSE_RESOURCE = 'PN_CSE'
+        # Created on the first submit or map.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
-    ae: Optional[AE] = None
-    def __init__(self, host: str, port: int, rsc: str = None, transport_protocol = 'http'):
-        """Constructor
+    def close(self):
+        """Release the pooled connections and worker threads held by this CSE.
+        """
+        self._close_executor()
+        self.session.close()
 
-        Args:
-            host (str): CSE host
-            port (int): CSE port
-            rsc (str): Base resource
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='onem2m-cse')
+
+            return self._executor
+
+    def _close_executor(self):
+        """Wait for submitted calls to finish and stop the worker threads.
         """
-        self.transport_protocol = transport_protocol
-        self.host = host
-        self.port = port
-        self.rsc = rsc or CSE.CSE_RESOURCE
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
 
-    def register_ae(self, ae: AE):
-        """Synchronously register an AE with a CSE.
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Run fn(*args, **kwargs) on the CSE's thread pool.
+
+        fn is typically a request method of this CSE, e.g.
+        cse.submit(cse.create_content_instance, uri, cin).  It runs in a copy of the caller's
+        context, so an enclosing deadline or trace applies to it.
 
         Args:
-            ae (AE): The AE to register.
+            fn: The function to call.
+            args: Positional arguments of fn.
+            kwargs: Keyword arguments of fn.
 
         Returns:
-            OneM2MResponse: The request response.
-
-        Raises:
-            InvalidArgumentException: If the argument is not an AE or a dict containing AE attributes.
+            Future: The result of the call.
         """
-        if isinstance(ae, AE) is False:
-            raise InvalidArgumentException('AE registration expects an instance AE.')
+        return self._get_executor().submit(contextvars.copy_context().run, fn, *args, **kwargs)
 
-        # Host and resource.
-        to = '{}://{}:{}/PN_CSE'.format(self.transport_protocol, self.host, self.port)
+    def map(self, fn: Callable, *iterables: Iterable, workers: int = None) -> List[Future]:
+        """Call fn on every item across the CSE's thread pool, like concurrent.futures map.
 
-        # op is not required as it is implied by the function that the params will be passed to.
-        params = {
-            OneM2MPrimitive.M2M_PARAM_TO: to,
-            OneM2MPrimitive.M2M_PARAM_FROM: ae.aei,  # The AE-Credential-ID needs to be removed from the ae object
-            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.AE.value
-        }
+        fn receives one argument from each of the iterables, e.g.
+        cse.map(cse.create_content_instance, uris, cins).  At most 'workers' of these calls run
+        at once.  Calls run in a copy of the caller's context, see submit.
 
-        # Remove AE-Credential-ID.
-        ae.__dict__.pop(OneM2MPrimitive.M2M_PARAM_AE_ID)
+        Args:
+            fn: The function to call.
+            iterables: Argument iterables, consumed immediately.
+            workers: Maximum number of concurrent calls.  Defaults to the pool size.
 
-        # Create a request object
-        oneM2MRequest = OneM2MRequest()
+        Returns:
+            List[Future]: One future per call, in item order.  A call that raises sets the
+                exception on its future and the others carry on.
+        """
+        calls = [(Future(), args) for args in zip(*iterables)]
+        if not calls:
+            return []
+
+        executor = self._get_executor()
+        # Without a limit the pool size bounds the concurrency.
+        lanes = min(workers or len(calls), len(calls))
+        pending = iter(calls)
+        pending_lock = threading.Lock()
+
+        def lane():
+            while True:
+                with pending_lock:
+                    call = next(pending, None)
+                if call is None:
+                    return
+
+                future, args = call
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(*args))
+                except Exception as err:
+                    future.set_exception(err)
+
+        context = contextvars.copy_context()
+        for _ in range(lanes):
+            # Each lane needs its own context copy, a context cannot be entered concurrently.
+            executor.submit(context.copy().run, lane)
+
+        return [future for future, _ in calls]
+
+    def _send(self, operation: str, to: str, params: OneM2MRequest.Parameters, content=None):
+        """Issue a OneM2M request over the CSE session.
 
-        # Returns a OneM2MResponse object.  Handle any response code logic here.
-        oneM2MResponse = oneM2MRequest.create(to, params, ae)
+        Args:
+            operation: The OneM2M operation.
+            to: The target URI.
+            params: The request params.
+            content: A OneM2MResource for Create and Update operations.
 
-        # Return the AE instance or None if registration failed.
-        # @todo return error msg or object with error msg.
-        if oneM2MResponse.rsc == OneM2MPrimitive.M2M_RSC_CREATED:
-            self.ae = AE(oneM2MResponse.pc)
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return self._new_request().request(operation, to, params, content)
+
+    def send_non_blocking(
+        self,
+        operation: str,
+        uri: str,
+        content: OneM2MResource = None,
+        params: OneM2MRequest.Parameters = None,
+        notification_uri: Union[str, List[str]] = None,
+        listener: Any = None,
+        poll_interval: Optional[float] = NonBlockingResponse.DEFAULT_POLL_INTERVAL,
+    ) -> NonBlockingResponse:
+        """Issue a non-blocking request and return a handle on its result.
+
+        The CSE accepts the request immediately and performs it in the background, so slow
+        operations (e.g. updates across a fleet) do not hold a connection.  Without
+        notification_uri the request is nonBlockingRequestSynch and the handle polls the
+        <request> resource; with it the request is nonBlockingRequestAsynch and the CSE also
+        sends the result there.
 
-        return oneM2MResponse
+        Args:
+            operation: The OneM2M operation.
+            uri: URI of the target resource.
+            content: A OneM2MResource for Create and Update operations.
+            params: Additional request params, e.g. the resource type of a Create.
+            notification_uri: Where the CSE sends the result of an asynchronous request.
+            listener: AsyncResponseListener serving notification_uri.  The handle then resolves
+                from the notification and does not poll.
+            poll_interval: Seconds before the first poll of the <request> resource, see
+                NonBlockingResponse.  None to disable polling.
 
-    def get_ae(self, ae_id: str):
+        Returns:
+            NonBlockingResponse: Future-like handle resolving with the operation response.
 
-        # Host and resource.
-        to = '{}://{}:{}/PN_CSE/{}'.format(
-            self.transport_protocol, self.host, self.port, ae_id
+        Raises:
+            InvalidArgumentException: If a listener is given without a notification_uri, or is a
+                multi-process listener.
+        """
+        request, handle, args = self._non_blocking_request(
+            operation, uri, content, params, notification_uri, listener, poll_interval
         )
 
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: ae_id,
-            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.AE.value
-        }
+        try:
+            handle._on_accepted(request.request(*args))
+        except BaseException:
+            handle._unlisten()
+            raise
 
-        # Create a request object
-        oneM2MRequest = OneM2MRequest()
+        return handle
 
-        oneM2MResponse = oneM2MRequest.retrieve(to, params)
+    def register_ae(self, ae: AE):
+        """Synchronously register an AE with a CSE.
 
-        if oneM2MResponse.rsc == OneM2MPrimitive.M2M_RSC_OK and oneM2MResponse.pc is not None:
-            self.ae = AE(oneM2MResponse.pc)
+        Args:
+            ae (AE): The AE to register.
 
-        return oneM2MResponse
+        Returns:
+            OneM2MResponse: The request response.
+
+        Raises:
+            InvalidArgumentException: If the argument is not an AE or a dict containing AE attributes.
+        """
+        oneM2MResponse = self._send(*self._register_ae_request(ae))
+
+        return self._on_register_ae(oneM2MResponse)
+
+    def get_ae(self, ae_id: str):
+        oneM2MResponse = self._send(*self._get_ae_request(ae_id))
+
+        return self._on_get_ae(oneM2MResponse)
 
     def discover_resources(self):
         """ Synchronously discover containers registered with the CSE.
@@ -106,53 +242,105 @@ class CSE:
         Raises:
             InvalidArgumentException: If the argument is not an AE.
         """
-        # note: fu (filter usage) parameter required for resource discovery.
-        to = self.get_to(self.rsc)
+        # Returns a OneM2MResponse object.  Handle any response code logic here.
+        return self._send(*self._discover_resources_request())
 
-        # Create a request object.
+    def iter_discover(
+        self, uri: str = None, page_size: int = 100, drt: int = None, prefetch: bool = False, **filters: Any
+    ) -> Iterator[str]:
+        """Discover resources page by page, yielding URIs as each page arrives.
 
-        params = {
-            OneM2MRequest.M2M_PARAM_FILTER_USAGE: 1,
-            OneM2MRequest.M2M_PARAM_FROM: self.ae.ri,
-            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.Node.value
-        }
+        Pages of page_size URIs are requested with the 'lim' and 'ofst' filter criteria until a
+        page comes back short, so the full result set is never held in one response.
 
-        oneM2MRequest = OneM2MRequest(to, params)
+        Args:
+            uri: Root of the discovery.  Defaults to the CSE base resource.
+            page_size: URIs requested per page.
+            drt: Discovery result type (1 structured, 2 unstructured).  CSE default when None.
+            prefetch: Request the next page on the CSE thread pool while the current one is consumed.
+            filters: Additional filter criteria, e.g. ty=3 or lbl='sensor'.
+
+        Yields:
+            str: The discovered resource URIs.
+        """
+        def fetch(offset: int):
+            return self._send(*self._discover_page_request(uri, page_size, offset, drt, filters))
 
-        # Returns a OneM2MResponse object.  Handle any response code logic here.
-        oneM2MResponse = oneM2MRequest.retrieve()
+        offset = 0
+        pending = None
+        previous = None
+
+        try:
+            while True:
+                response = pending.result() if pending is not None else fetch(offset)
+                pending = None
+
+                page = self._on_discover_page(response)
+
+                # A CSE ignoring 'ofst' would return the same page forever.
+                if page == previous and page:
+                    return
+
+                more = len(page) == page_size
+                if more and prefetch:
+                    pending = self.submit(fetch, offset + page_size)
+
+                yield from page
+
+                if not more:
+                    return
 
-        return oneM2MResponse
+                previous = page
+                offset += page_size
+        finally:
+            # The consumer stopped early.
+            if pending is not None:
+                pending.cancel()
 
     # @todo add possible rcn values to OneM2MResource class.
-    def create_content_instance(self, uri: str, content: ContentInstance = None):
+    def create_content_instance(self, uri: str, content: ContentInstance = None, result_content=None):
         """Create a content instance of a container resource.
 
         Args:
             uri: URI of a container resource.
+            result_content: Result content (rcn) of the response, e.g.
+                M2M_RESULT_CONTENT_TYPES.Nothing when only the status code is needed.
 
         Returns:
             OneM2MResponse: The request response.
         """
+        return self._send(*self._create_content_instance_request(uri, content, result_content))
 
-        # Strip leading '/'
-        uri = uri[1:] if uri[0] == '/' else uri
+    def create_content_instances(
+        self,
+        items: BulkItems,
+        concurrency: int = 10,
+        progress: Callable[[BulkResult], None] = None,
+        result_content=None,
+    ) -> BulkResult:
+        """Create many content instances, pipelined over the pooled session.
 
-        to = self.get_to(uri)
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,  # resource id.
-            OneM2MPrimitive.M2M_PARAM_RESULT_CONTENT: OneM2MPrimitive.M2M_RESULT_CONTENT_TYPES.ChildResources,
-            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value,
-        }
+        Requests are issued on a private event loop with at most 'concurrency' in flight.
+        Must not be called from a running event loop; use AsyncCSE.create_content_instances there.
 
-        content_instance = content
-
-        oneM2MRequest = OneM2MRequest()
+        Args:
+            items: Iterable or async iterable of (container URI, content) pairs.  Content that is
+                not a OneM2MResource is wrapped as the 'con' of a ContentInstance.
+            concurrency: Maximum number of requests in flight.
+            progress: Called with the running BulkResult after each item completes.
+            result_content: Result content (rcn) of every response, see create_content_instance.
 
-        oneM2MResponse = oneM2MRequest.create(to, params, content_instance)
+        Returns:
+            BulkResult: Per item responses (or exceptions) in order, with throughput and failures.
+        """
+        async def run():
+            try:
+                return await BulkIngest(self._bulk_sender(result_content), concurrency, progress).run(items)
+            finally:
+                # The private loop is about to close, drop the connections bound to it.
+                await self.session.close_async_session()
 
-        return oneM2MResponse
+        return asyncio.run(run())
 
     def retrieve_content_instance(self, uri: str, rcn: int = 7):
         """Retrieves the latest content instance of a container resource.
@@ -163,25 +351,7 @@ class CSE:
         Returns:
             OneM2MResponse: The request response.
         """
-
-        to = self.get_to(uri)
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-            OneM2MRequest.M2M_PARAM_RESULT_CONTENT: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value,
-            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value
-        }
-
-        oneM2MRequest = OneM2MRequest(to, params)
-
-        oneM2MResponse = oneM2MRequest.retrieve()
-
-        return oneM2MResponse
-
-    def get_to(self, rsc: str):
-        rsc = rsc[1:] if rsc[0] == '/' else rsc
-        to = '{}://{}:{}/{}'.format(self.transport_protocol, self.host, self.port, rsc)
-        return to
+        return self._send(*self._retrieve_content_instance_request(uri, rcn))
 
     def check_existing_subscriptions(self, uri: str, subscription_name: str):
         """Retrieve all existing subscriptions on a resource
@@ -191,43 +361,33 @@ class CSE:
         Returns:
             OneM2MResponse: The request response.
         """
-        to = self.get_to(uri)
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-            OneM2MPrimitive.M2M_PARAM_FILTER_USAGE: 1,
-            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.Subscription,
-        }
-
-        oneM2MRequest = OneM2MRequest(to, params)
-
-        return oneM2MRequest.retrieve()
+        return self._send(*self._check_existing_subscriptions_request(uri, subscription_name))
 
     def create_subscription(
-        self, uri: str, sub_name: str, notification_uri: str = None, event_types: List[int] = [3], result_content=None
+        self,
+        uri: str,
+        sub_name: str,
+        notification_uri: str = None,
+        event_types: List[int] = [3],
+        result_content=None,
+        batch_size: int = None,
+        batch_duration: float = None,
     ):
         """ Create a subscription to a resource.
 
         Args:
             uri: URI of a resource.
+            batch_size: Ask the CSE to aggregate up to batch_size notifications into one
+                'm2m:agn' request.
+            batch_duration: Seconds the CSE may hold notifications back to aggregate them.
 
         Returns:
             OneM2MResponse: The request response.
         """
-
-        json_data = {
-            'enc': {'net': event_types, 'ty': 4},
-            'nct': 1,
-        }
-
-        if notification_uri:
-            json_data['nu'] = [notification_uri]
-
-        return self.create_resource(
-            uri,
-            sub_name,
-            Subscription(json_data),
-            result_content
+        return self._send(
+            *self._create_subscription_request(
+                uri, sub_name, notification_uri, event_types, result_content, batch_size, batch_duration
+            )
         )
 
 
@@ -242,23 +402,7 @@ class CSE:
         Returns:
             OneM2MResponse: The request response.
         """
-
-        to = self.get_to(uri)
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-        }
-
-        if result_content is not None:
-            params[OneM2MPrimitive.M2M_PARAM_RESULT_CONTENT] = result_content
-
-        content.name = name
-
-        oneM2MRequest = OneM2MRequest()
-
-        oneM2MResponse = oneM2MRequest.create(to, params, content)
-
-        return oneM2MResponse
+        return self._send(*self._create_resource_request(uri, name, content, result_content))
 
 
     # @note: not really working.  'la' virtual resource never returns the latest content instance.
@@ -274,27 +418,9 @@ class CSE:
         Raises:
             ...
         """
+        oneM2MResponse = self._send(*self._retrieve_latest_content_instance_request(uri))
 
-        # Remove leading slash
-        uri = uri[1:] if uri[0] == '/' else uri
-        assert self.ae is not None
-        to = '{}://{}:{}/{}/la'.format(
-            self.transport_protocol, self.host, self.port, uri
-        )
-
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-        }
-
-        oneM2MRequest = OneM2MRequest(to, params)
-
-        oneM2MResponse = oneM2MRequest.retrieve()
-
-        # How do you want to handle responses?
-        if oneM2MResponse.uri == OneM2MPrimitive.M2M_RSC_OK:
-            return ContentInstance(oneM2MResponse.pc['m2m:cin'])
-        else:
-            return None
+        return self._on_retrieve_latest_content_instance(oneM2MResponse)
 
     def retrieve_resource(self, uri: str, ty: OneM2MPrimitive.M2M_RESOURCE_TYPES):
         """ Synchronous retrieve resource request.
@@ -305,19 +431,7 @@ class CSE:
         Returns:
             A OneM2MResource object.
         """
-
-        to = self.get_to(uri)
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: ty
-        }
-
-        oneM2MRequest = OneM2MRequest(to, params)
-
-        oneM2MReponse = oneM2MRequest.retrieve()
-
-        return oneM2MReponse
+        return self._send(*self._retrieve_resource_request(uri, ty))
 
     def update_resource(self, uri: str, resource: OneM2MResource):
         """ Update a resource.
@@ -331,19 +445,7 @@ class CSE:
         Returns:
             OneM2MResponse: The request response.
         """
-
-        to = self.get_to(uri)
-
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri
-        }
-
-        oneM2MRequest = OneM2MRequest()
-
-        oneM2MResponse = oneM2MRequest.update(to, params, resource)
-
-        return oneM2MResponse
+        return self._send(*self._update_resource_request(uri, resource))
 
     def delete_ae(self):
         """ Delete ae.
@@ -351,25 +453,8 @@ class CSE:
         Returns:
             OneM2MResponse: The request response.
         """
-        # Host and resource.
-        to = '{}://{}:{}/{}/{}'.format(
-            self.transport_protocol, self.host, self.port, self.rsc, self.ae.ri
-        )
-
-        # op is not required as it is implied by the function that the params will be passed to.
-        params = {
-            OneM2MPrimitive.M2M_PARAM_TO: to,
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-            OneM2MRequest.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.AE.value
-        }
-
-        # Create a request object
-        oneM2MRequest = OneM2MRequest()
-
         # Returns a OneM2MResponse object.  Handle any response code logic here.
-        oneM2MResponse = oneM2MRequest.delete(to, params)
-
-        return oneM2MResponse
+        return self._send(*self._delete_ae_request())
 
     def delete_resource(self, uri: str):
         """ Delete resource.
@@ -377,18 +462,5 @@ class CSE:
         Returns:
             OneM2MResponse: The request response.
         """
-        # Host and resource.
-        to = self.get_to(uri)
-
-        # op is not required as it is implied by the function that the params will be passed to.
-        assert self.ae is not None
-        params = {
-            OneM2MPrimitive.M2M_PARAM_TO: to,
-            OneM2MPrimitive.M2M_PARAM_FROM: self.ae.ri,
-        }
-
-        # Create a request object
-        oneM2MRequest = OneM2MRequest()
-
         # Returns a OneM2MResponse object.  Handle any response code logic here.
-        return oneM2MRequest.delete(to, params)
+        return self._send(*self._delete_resource_request(uri))
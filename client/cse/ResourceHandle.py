@@ -0,0 +1,145 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from client.onem2m.OneM2MResource import OneM2MResource
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+from client.onem2m.http.PreparedRequest import PreparedRequest
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from typing import Any, Callable, Dict, Hashable
+
+
+class ResourceHandle:
+    """Operations on a single resource of a CSE, with their requests prepared once.
+
+    Obtained from CSE.resource.  The first call of each operation builds its URL, query
+    string and headers from the same params the CSE methods use; later calls reuse them and
+    only add a request identifier and the content.  The originator is the CSE's AE at the
+    time an operation is first used.
+    """
+
+    def __init__(self, cse: Any, uri: str):
+        """Constructor
+
+        Args:
+            cse (CSE): The CSE hosting the resource.
+            uri (str): URI of the resource.
+        """
+        self.cse = cse
+        self.uri = uri
+        self.request = cse._new_request()
+        self._prepared: Dict[Hashable, PreparedRequest] = {}
+
+    def _prepare(self, key: Hashable, builder: Callable, *args: Any) -> PreparedRequest:
+        """Return the prepared request for key, building it from a CSE request builder once.
+        """
+        prepared = self._prepared.get(key)
+
+        if prepared is None:
+            operation, to, params, _ = builder(self.uri, *args)
+            prepared = self._prepared[key] = self.request.prepare(operation, to, params)
+
+        return prepared
+
+    def _content_instance(self, result_content) -> PreparedRequest:
+        return self._prepare(('cin', result_content), self.cse._create_content_instance_request, None, result_content)
+
+    def _retrieve(self, ty) -> PreparedRequest:
+        return self._prepare(('retrieve', ty), self.cse._retrieve_resource_request, ty)
+
+    def _update(self) -> PreparedRequest:
+        return self._prepare('update', self.cse._update_resource_request, None)
+
+    def _delete(self) -> PreparedRequest:
+        return self._prepare('delete', self.cse._delete_resource_request)
+
+    def create_content_instance(self, content: ContentInstance = None, result_content=None) -> OneM2MResponse:
+        """Create a content instance of the container.
+
+        Args:
+            content: The content instance.
+            result_content: Result content (rcn) of the response.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return self._content_instance(result_content).send(content)
+
+    def retrieve(self, ty: OneM2MPrimitive.M2M_RESOURCE_TYPES) -> OneM2MResponse:
+        """Retrieve the resource.
+
+        Args:
+            ty: The resource type.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return self._retrieve(ty).send()
+
+    def update(self, resource: OneM2MResource) -> OneM2MResponse:
+        """Update the resource.
+
+        Args:
+            resource: The updated resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return self._update().send(resource)
+
+    def delete(self) -> OneM2MResponse:
+        """Delete the resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return self._delete().send()
+
+    async def create_content_instance_async(
+        self, content: ContentInstance = None, result_content=None
+    ) -> OneM2MResponse:
+        """Asynchronously create a content instance of the container.
+
+        Args:
+            content: The content instance.
+            result_content: Result content (rcn) of the response.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._content_instance(result_content).send_async(content)
+
+    async def retrieve_async(self, ty: OneM2MPrimitive.M2M_RESOURCE_TYPES) -> OneM2MResponse:
+        """Asynchronously retrieve the resource.
+
+        Args:
+            ty: The resource type.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._retrieve(ty).send_async()
+
+    async def update_async(self, resource: OneM2MResource) -> OneM2MResponse:
+        """Asynchronously update the resource.
+
+        Args:
+            resource: The updated resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._update().send_async(resource)
+
+    async def delete_async(self) -> OneM2MResponse:
+        """Asynchronously delete the resource.
+
+        Returns:
+            OneM2MResponse: The request response.
+        """
+        return await self._delete().send_async()
+
+    def __repr__(self):
+        return '<ResourceHandle {}>'.format(self.uri)
@@ -0,0 +1,17 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from .BaseException import BaseException
+
+
+class CircuitOpenException(BaseException):
+    def __init__(self, msg: str, retry_after: float = 0.0):
+        """Raised instead of sending a request while the CSE circuit breaker is open.
+
+        Args:
+            msg: Error message.
+            retry_after: Seconds until the breaker lets a probe request through.
+        """
+        self.message = msg
+        self.retry_after = retry_after
@@ -0,0 +1,10 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from .BaseException import BaseException
+
+
+class DeadlineExceededException(BaseException):
+    def __init__(self, msg: str):
+        self.message = msg
@@ -0,0 +1,15 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from .BaseException import BaseException
+
+
+class UnresolvableRequestException(BaseException):
+    def __init__(self, msg: str):
+        """Raised by a non-blocking request handle that has no way to learn its result.
+
+        Args:
+            msg: Error message.
+        """
+        self.message = msg
@@ -14,6 +14,7 @@ class OneM2MPrimitive:
     CONTENT = 'content'
 
     CONTENT_TYPE_JSON = 'application/vnd.onem2m-res+json'
+    CONTENT_TYPE_CBOR = 'application/vnd.onem2m-res+cbor'
 
     # OneM2M HTTP HEADERS
     X_M2M_ORIGIN = 'X-M2M-Origin'
@@ -43,6 +44,10 @@ class OneM2MPrimitive:
     M2M_PARAM_APP_ID               = 'api'
     M2M_PARAM_APP_NAME             = 'apn'
     M2M_PARAM_POINT_OF_ACCESS      = 'poa'
+    M2M_PARAM_REQUEST_EXPIRATION   = 'rqet'
+    M2M_PARAM_RESULT_EXPIRATION    = 'rset'
+    M2M_PARAM_OPERATION_EXECUTION_TIME = 'oet'
+    M2M_PARAM_RESPONSE_TYPE_NOTIFICATION_URIS = 'rtu'
 
     # Query string request parameters.
     # M2M_PARAM_RESPONSE_TYPE      = 'rt'
@@ -75,8 +80,11 @@ class OneM2MPrimitive:
         M2M_PARAM_OPERATION: HttpHeader.METHOD,
         M2M_PARAM_FROM: X_M2M_ORIGIN,
         M2M_PARAM_REQUEST_IDENTIFIER: X_M2M_RI,
+        M2M_PARAM_REQUEST_EXPIRATION: X_M2M_RET,
+        M2M_PARAM_RESULT_EXPIRATION: X_M2M_RST,
+        M2M_PARAM_OPERATION_EXECUTION_TIME: X_M2M_OET,
+        M2M_PARAM_RESPONSE_TYPE_NOTIFICATION_URIS: X_M2M_RTU,
         # X_M2M_RTV: X_M2M_RTV,
-        # X_M2M_RTU: X_M2M_RTU
     }
 
     # HTTP Header to OneM2M Parameter Map.
@@ -120,6 +128,9 @@ class OneM2MPrimitive:
     # @note all response codes should be declared as strings to avoid
     # casting response codes returned from the requests lib to strings
     # when handling request responses.
+    M2M_RSC_ACCEPTED                     = '1000'
+    M2M_RSC_ACCEPTED_NON_BLOCKING_SYNCH  = '1001'
+    M2M_RSC_ACCEPTED_NON_BLOCKING_ASYNCH = '1002'
     M2M_RSC_OK =      '2000'
     M2M_RSC_CREATED = '2001'
     M2M_RSC_DELETED = '2002'
@@ -127,6 +138,9 @@ class OneM2MPrimitive:
     # @todo add remaining status code from TS-0009 Table 6.3.2-1 'Status Code Mapping'
 
     M2M_REPONSE_STATUS_CODES = [
+        M2M_RSC_ACCEPTED,
+        M2M_RSC_ACCEPTED_NON_BLOCKING_SYNCH,
+        M2M_RSC_ACCEPTED_NON_BLOCKING_ASYNCH,
         M2M_RSC_OK,
         M2M_RSC_CREATED,
         M2M_RSC_DELETED,
@@ -200,6 +214,23 @@ class OneM2MPrimitive:
         DynamicAuthorizationConsultationAnnc  = 10034
 
 
+    # TS-0004 Table 6.3.4.2.6-1
+    @unique
+    class M2M_RESPONSE_TYPES(Enum):
+        NonBlockingRequestSynch               = 1
+        NonBlockingRequestAsynch              = 2
+        BlockingRequest                       = 3
+        FlexBlocking                          = 4
+
+    # TS-0004 Table 6.3.4.2.20-1
+    @unique
+    class M2M_REQUEST_STATUS(Enum):
+        Completed                             = 1
+        Failed                                = 2
+        Pending                               = 3
+        Forwarded                             = 4
+        PartiallyCompleted                    = 5
+
     @unique
     class M2M_FILTER_USAGE(Enum):
         Unspecified                           = -1
@@ -0,0 +1,35 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from client.onem2m.codec.Codec import Codec
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+
+from typing import Any
+
+
+class CborCodec(Codec):
+    """CBOR codec (application/vnd.onem2m-res+cbor) backed by cbor2 (optional dependency,
+    'pip install cbor2').
+
+    Requests are sent as CBOR and CBOR responses are preferred, with JSON still accepted
+    so a CSE without CBOR support keeps working.
+    """
+
+    content_type = OneM2MPrimitive.CONTENT_TYPE_CBOR
+    accept = '{}, {};q=0.5'.format(OneM2MPrimitive.CONTENT_TYPE_CBOR, OneM2MPrimitive.CONTENT_TYPE_JSON)
+
+    def __init__(self):
+        # Imported here so the SDK does not require cbor2 unless this codec is used.
+        import cbor2
+
+        self._cbor2 = cbor2
+
+    def encode(self, obj: Any) -> bytes:
+        return self._cbor2.dumps(obj)
+
+    def decode(self, data: bytes) -> Any:
+        return self._cbor2.loads(data)
+
+    def matches(self, content_type: str) -> bool:
+        return 'cbor' in content_type
@@ -0,0 +1,36 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from abc import ABC, abstractmethod
+
+from typing import Any
+
+
+class Codec(ABC):
+    """Serializes oneM2M primitive content to and from the raw HTTP message body.
+
+    Implementations encode straight to bytes and decode from the undecoded body bytes, so
+    no intermediate str copy is made on either side.
+    """
+
+    # Content-Type sent with encoded bodies.
+    content_type: str = ''
+
+    # Accept header sent with every request.  Defaults to content_type.
+    accept: str = ''
+
+    def get_accept(self) -> str:
+        return self.accept or self.content_type
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """Serialize obj to the message body."""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Deserialize a message body."""
+
+    @abstractmethod
+    def matches(self, content_type: str) -> bool:
+        """Determine if a response Content-Type can be decoded by this codec."""
@@ -0,0 +1,27 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import json
+
+from client.onem2m.codec.Codec import Codec
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+
+from typing import Any
+
+
+class JsonCodec(Codec):
+    """Standard library JSON codec, the default.
+    """
+
+    content_type = OneM2MPrimitive.CONTENT_TYPE_JSON
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def decode(self, data: bytes) -> Any:
+        # json.loads detects the UTF encoding of bytes itself.
+        return json.loads(data)
+
+    def matches(self, content_type: str) -> bool:
+        return 'json' in content_type
@@ -0,0 +1,24 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from client.onem2m.codec.JsonCodec import JsonCodec
+
+from typing import Any
+
+
+class OrjsonCodec(JsonCodec):
+    """Drop-in JSON codec backed by orjson (optional dependency, 'pip install orjson').
+    """
+
+    def __init__(self):
+        # Imported here so the SDK does not require orjson unless this codec is used.
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def decode(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
@@ -0,0 +1,144 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, threading, time
+
+from client.onem2m.http.Deadline import Deadline
+from client.exceptions.DeadlineExceededException import DeadlineExceededException
+
+from typing import List, Optional, Tuple
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit found by additive increase, multiplicative decrease (AIMD).
+
+    Every request completed without throttling raises the limit by increase / limit, so
+    about 'increase' per round of 'limit' requests.  A throttled request multiplies it by
+    'decrease', once per congestion event: requests sent before the last decrease do not
+    decrease it again.  The limit settles just below the highest concurrency the CSE
+    sustains.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 100,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        """Constructor
+
+        Args:
+            initial_limit (float): Starting number of requests in flight.
+            min_limit (float): Lowest limit.
+            max_limit (float): Highest limit.
+            increase (float): Limit increase per round of successful requests.
+            decrease (float): Factor applied to the limit when a request is throttled.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # Event loop futures of waiting coroutines.
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def _try_acquire(self) -> Optional[float]:
+        """Start a request if below the limit.  Caller holds the condition lock.
+
+        Returns:
+            The start time of the request, None if the limit is reached.
+        """
+        if self.in_flight >= int(self.limit):
+            return None
+
+        self.in_flight += 1
+        return time.monotonic()
+
+    def acquire(self, deadline: Optional[Deadline] = None) -> float:
+        """Wait until a request may be sent.
+
+        Returns:
+            The start time of the request, to pass to release.
+
+        Raises:
+            DeadlineExceededException: If the deadline passes while waiting.
+        """
+        with self._condition:
+            while True:
+                started_at = self._try_acquire()
+                if started_at is not None:
+                    return started_at
+
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceededException('Request deadline of {}s exceeded.'.format(deadline.timeout))
+
+                self._condition.wait(deadline.remaining() if deadline is not None else None)
+
+    async def acquire_async(self, deadline: Optional[Deadline] = None) -> float:
+        """Asynchronous acquire.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self._condition:
+                started_at = self._try_acquire()
+                if started_at is not None:
+                    return started_at
+
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            try:
+                if deadline is None:
+                    await waiter
+                else:
+                    await asyncio.wait_for(waiter, deadline.remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceededException('Request deadline of {}s exceeded.'.format(deadline.timeout))
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, started_at: float, throttled: bool = False, completed: bool = True):
+        """End a request and adapt the limit to its outcome.
+
+        Args:
+            started_at: Start time returned by acquire.
+            throttled: The CSE throttled the request, or failed under load.
+            completed: The request reached the CSE.  Requests that did not reach it leave the limit
+                unchanged.
+        """
+        with self._condition:
+            self.in_flight -= 1
+
+            if throttled:
+                if started_at >= self._last_decrease:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_decrease = time.monotonic()
+            elif completed:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+            self._condition.notify_all()
+
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(AdaptiveConcurrency._wake, waiter)
+            except RuntimeError:
+                # The waiter's event loop is closed.
+                pass
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
@@ -0,0 +1,83 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import threading, time
+
+from client.exceptions.CircuitOpenException import CircuitOpenException
+
+
+class CircuitBreaker:
+    """Per-CSE circuit breaker.
+
+    Closed: requests flow and consecutive transient failures are counted.  After
+    failure_threshold of them the breaker opens and requests fail fast with a
+    CircuitOpenException.  Once reset_timeout has elapsed it goes half-open and lets
+    half_open_max_calls probe requests through; a success closes it again, a failure
+    re-opens it.
+    """
+
+    CLOSED    = 'closed'
+    OPEN      = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """Constructor
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before probing the CSE.
+            half_open_max_calls (int): Concurrent probe requests allowed while half-open.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Admit a request or fail fast.
+
+        Raises:
+            CircuitOpenException: If the breaker is open, or half-open with all probes in flight.
+        """
+        with self._lock:
+            if self.state == CircuitBreaker.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenException('Circuit breaker is open.', remaining)
+
+                self.state = CircuitBreaker.HALF_OPEN
+                self._probes = 0
+
+            if self.state == CircuitBreaker.HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenException('Circuit breaker is half-open, waiting on probe requests.')
+                self._probes += 1
+
+    def release_probe(self):
+        """End an admitted request without an outcome, e.g. cancelled or failed over to
+           another endpoint, so a half-open probe slot is not held forever.
+        """
+        with self._lock:
+            if self.state == CircuitBreaker.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self):
+        with self._lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitBreaker.OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
@@ -0,0 +1,143 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import gzip, threading, zlib
+
+from typing import Optional, Tuple
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+
+class Compression:
+    """HTTP body compression settings and byte counters of a CSE session.
+
+    Responses: the session advertises gzip and deflate (and br when the brotli package is
+    installed) in Accept-Encoding and decodes compressed responses.  Requests: bodies of at
+    least request_threshold bytes are compressed with request_encoding and sent with a
+    Content-Encoding header.
+
+    The counters compare the bytes on the wire with the uncompressed bodies, so the saving
+    can be measured.
+    """
+
+    GZIP    = 'gzip'
+    DEFLATE = 'deflate'
+    BROTLI  = 'br'
+
+    def __init__(
+        self,
+        accept_encoding: bool = True,
+        request_encoding: Optional[str] = GZIP,
+        request_threshold: int = 1024,
+        level: int = 6,
+    ):
+        """Constructor
+
+        Args:
+            accept_encoding (bool): Ask the CSE for compressed responses.
+            request_encoding (str): Encoding of compressed request bodies (gzip, deflate or br).
+                None disables request compression.
+            request_threshold (int): Minimum body size in bytes to compress.
+            level (int): Compression level.
+        """
+        if request_encoding == Compression.BROTLI and brotli is None:
+            raise ValueError('Brotli request compression requires the brotli package.')
+
+        self.accept_encoding = accept_encoding
+        self.request_encoding = request_encoding
+        self.request_threshold = request_threshold
+        self.level = level
+
+        # Byte counters.
+        self.bytes_sent = 0
+        self.bytes_sent_uncompressed = 0
+        self.bytes_received = 0
+        self.bytes_received_uncompressed = 0
+        self._lock = threading.Lock()
+
+    def get_accept_encoding(self) -> str:
+        encodings = [Compression.GZIP, Compression.DEFLATE]
+        if brotli is not None:
+            encodings.append(Compression.BROTLI)
+
+        return ', '.join(encodings)
+
+    def compress(self, data: Optional[bytes]) -> Tuple[Optional[bytes], Optional[str]]:
+        """Compress a request body if it is large enough.
+
+        Args:
+            data: The request body.
+
+        Returns:
+            The body to send and its Content-Encoding (None if it was left uncompressed).
+        """
+        if data is None:
+            return None, None
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        encoding = None
+        sent = data
+
+        if self.request_encoding is not None and len(data) >= self.request_threshold:
+            encoding = self.request_encoding
+            if encoding == Compression.GZIP:
+                sent = gzip.compress(data, self.level)
+            elif encoding == Compression.DEFLATE:
+                sent = zlib.compress(data, self.level)
+            elif encoding == Compression.BROTLI:
+                sent = brotli.compress(data, quality=self.level)
+            else:
+                raise ValueError('Unsupported request encoding "{}".'.format(encoding))
+
+        with self._lock:
+            self.bytes_sent += len(sent)
+            self.bytes_sent_uncompressed += len(data)
+
+        return sent, encoding
+
+    def decompress(self, data: bytes, encoding: Optional[str]) -> bytes:
+        """Decode a response body according to its Content-Encoding.
+
+        Args:
+            data: The body as received.
+            encoding: The Content-Encoding header value.
+
+        Returns:
+            The decoded body.
+        """
+        decoded = data
+        encoding = (encoding or '').strip().lower()
+
+        if data and encoding == Compression.GZIP:
+            decoded = gzip.decompress(data)
+        elif data and encoding == Compression.DEFLATE:
+            try:
+                decoded = zlib.decompress(data)
+            except zlib.error:
+                # Some servers send raw deflate without the zlib header.
+                decoded = zlib.decompress(data, -zlib.MAX_WBITS)
+        elif data and encoding == Compression.BROTLI and brotli is not None:
+            decoded = brotli.decompress(data)
+
+        self.record_received(len(data), len(decoded))
+
+        return decoded
+
+    def record_received(self, wire: int, uncompressed: int):
+        with self._lock:
+            self.bytes_received += wire
+            self.bytes_received_uncompressed += uncompressed
+
+    @property
+    def bytes_saved(self) -> int:
+        """Total bytes not transferred thanks to compression, both directions."""
+        return (
+            self.bytes_sent_uncompressed - self.bytes_sent
+            + self.bytes_received_uncompressed - self.bytes_received
+        )
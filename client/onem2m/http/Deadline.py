@@ -0,0 +1,73 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import contextvars, math, time
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from typing import Iterator, Optional
+
+
+class Deadline:
+    """Point in time after which a request is no longer useful.
+
+    A deadline bounds every attempt of a request, retries included.  It is sent to the CSE
+    as the request expiration timestamp (X-M2M-RET) so the CSE can drop work that is already
+    too late, and the time remaining is used as the client side socket timeout.
+    """
+
+    # Deadline of the current thread / asyncio task, see Deadline.scope.
+    _current: contextvars.ContextVar = contextvars.ContextVar('onem2m_deadline', default=None)
+
+    def __init__(self, timeout: float):
+        """Constructor
+
+        Args:
+            timeout (float): Seconds from now until the deadline.
+        """
+        self.timeout = timeout
+        self.expires_at = time.time() + timeout
+        self._monotonic_expiry = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(self._monotonic_expiry - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timestamp(self) -> str:
+        """The deadline as a oneM2M timestamp (UTC, basic ISO 8601 format).
+
+        Rounded up to the next second so the CSE never expires a request early.
+        """
+        return datetime.fromtimestamp(math.ceil(self.expires_at), timezone.utc).strftime('%Y%m%dT%H%M%S')
+
+    @staticmethod
+    def current() -> Optional['Deadline']:
+        """The deadline set by the innermost enclosing Deadline.scope, if any."""
+        return Deadline._current.get()
+
+    @staticmethod
+    @contextmanager
+    def scope(timeout: float) -> Iterator['Deadline']:
+        """Apply a deadline to every request issued in the block.
+
+        The deadline is bound to the current thread or asyncio task.  Nested scopes can only
+        shorten the enclosing deadline.
+
+        Args:
+            timeout: Seconds from now until the deadline.
+        """
+        deadline = Deadline(timeout)
+        enclosing = Deadline.current()
+        if enclosing is not None and enclosing.remaining() < deadline.remaining():
+            deadline = enclosing
+
+        token = Deadline._current.set(deadline)
+        try:
+            yield deadline
+        finally:
+            Deadline._current.reset(token)
@@ -0,0 +1,218 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import bisect, hashlib, itertools, socket, threading, urllib.parse
+
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+
+class Endpoint:
+    """A CSE front end of an EndpointPool."""
+
+    DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+    def __init__(self, netloc: str, scheme: str = 'http'):
+        self.netloc = netloc
+        # Scheme of the requests sent to it, gives the port when the netloc has none.
+        self.scheme = scheme
+        self.healthy = True
+        # Requests in flight, and totals.
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """(host, port) of the endpoint.
+
+        Raises:
+            ValueError: If the netloc has an invalid port.
+        """
+        parts = urllib.parse.urlsplit('//' + self.netloc)
+        return parts.hostname, parts.port or Endpoint.DEFAULT_PORTS.get(self.scheme, 80)
+
+    def __repr__(self):
+        return '<Endpoint {} {} {}>'.format(self.netloc, 'up' if self.healthy else 'down', self.outstanding)
+
+
+class EndpointPool:
+    """Spreads the requests to a CSE over several equivalent front ends.
+
+    Requests addressed to any endpoint of the pool are sent to the endpoint picked by the
+    routing strategy: the one with the fewest requests in flight, or the one owning the
+    target resource path on a consistent hash ring, so a resource keeps hitting the same node
+    while the pool membership is stable.  An endpoint that fails to connect is taken out of
+    rotation and the request fails over to another one; a background health check brings it
+    back once it accepts connections again.
+    """
+
+    LEAST_OUTSTANDING = 'least-outstanding'
+    CONSISTENT_HASH   = 'consistent-hash'
+
+    DEFAULT_HEALTH_CHECK_INTERVAL = 10.0
+    DEFAULT_HEALTH_CHECK_TIMEOUT  = 2.0
+    DEFAULT_VIRTUAL_NODES         = 100
+
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        strategy: str = LEAST_OUTSTANDING,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        health_check: Callable[[Endpoint], bool] = None,
+        virtual_nodes: int = DEFAULT_VIRTUAL_NODES,
+    ):
+        """Constructor
+
+        Args:
+            endpoints: 'host:port' of every front end.  Without a port, the default port of
+                the request scheme is used.
+            strategy: LEAST_OUTSTANDING or CONSISTENT_HASH.
+            health_check_interval: Seconds between two health checks of the endpoints.
+            health_check: Returns whether an endpoint is healthy.  Defaults to opening a TCP
+                connection to it.
+            virtual_nodes: Points per endpoint on the consistent hash ring.
+
+        Raises:
+            ValueError: If no endpoint or an unknown strategy is given.
+        """
+        if not endpoints:
+            raise ValueError('An endpoint pool needs at least one endpoint.')
+
+        if strategy not in (EndpointPool.LEAST_OUTSTANDING, EndpointPool.CONSISTENT_HASH):
+            raise ValueError('Unknown routing strategy "{}".'.format(strategy))
+
+        self.endpoints: List[Endpoint] = [Endpoint(netloc.lower()) for netloc in endpoints]
+        self.strategy = strategy
+        self.health_check_interval = health_check_interval
+        self.health_check = health_check or EndpointPool.tcp_health_check
+
+        self._by_netloc: Dict[str, Endpoint] = {e.netloc: e for e in self.endpoints}
+        self._ring: List[Tuple[int, Endpoint]] = sorted(
+            (EndpointPool._hash('{}#{}'.format(e.netloc, i)), e)
+            for e in self.endpoints
+            for i in range(virtual_nodes)
+        )
+        self._ring_keys = [point for point, _ in self._ring]
+        # Rotates the least outstanding tie break.
+        self._turn = itertools.count()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+    @staticmethod
+    def tcp_health_check(endpoint: Endpoint) -> bool:
+        """Healthy if the endpoint accepts a TCP connection."""
+        try:
+            socket.create_connection(endpoint.address, EndpointPool.DEFAULT_HEALTH_CHECK_TIMEOUT).close()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def owns(self, url: str) -> bool:
+        """Whether url is addressed to an endpoint of the pool."""
+        return urllib.parse.urlsplit(url).netloc.lower() in self._by_netloc
+
+    def _candidates(self, excluded: Collection[Endpoint]) -> List[Endpoint]:
+        available = [e for e in self.endpoints if e not in excluded]
+        healthy = [e for e in available if e.healthy]
+
+        # With every endpoint down, keep trying them rather than failing outright.
+        return healthy or available
+
+    def _pick(self, path: str, candidates: List[Endpoint]) -> Endpoint:
+        if self.strategy == EndpointPool.CONSISTENT_HASH:
+            start = bisect.bisect(self._ring_keys, EndpointPool._hash(path))
+            for i in range(len(self._ring)):
+                endpoint = self._ring[(start + i) % len(self._ring)][1]
+                if endpoint in candidates:
+                    return endpoint
+
+        turn = next(self._turn)
+        rotated = candidates[turn % len(candidates):] + candidates[:turn % len(candidates)]
+
+        return min(rotated, key=lambda e: e.outstanding)
+
+    def acquire(self, url: str, excluded: Collection[Endpoint] = ()) -> Tuple[Optional[Endpoint], str]:
+        """Pick the endpoint of a request.
+
+        Args:
+            url: The request URL.
+            excluded: Endpoints already tried for this request.
+
+        Returns:
+            The endpoint and the URL rewritten to it.  No endpoint and the URL unchanged if the
+            URL is not addressed to the pool or every endpoint was tried.
+        """
+        parts = urllib.parse.urlsplit(url)
+
+        if parts.netloc.lower() not in self._by_netloc:
+            return None, url
+
+        self._start_health_checks()
+
+        with self._lock:
+            candidates = self._candidates(excluded)
+            if not candidates:
+                return None, url
+
+            endpoint = self._pick(parts.path, candidates)
+            endpoint.scheme = parts.scheme or endpoint.scheme
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+
+        return endpoint, urllib.parse.urlunsplit(parts._replace(netloc=endpoint.netloc))
+
+    def release(self, endpoint: Endpoint, connect_failed: bool = False):
+        """End a request on endpoint.
+
+        Args:
+            endpoint: The endpoint returned by acquire.
+            connect_failed: The endpoint could not be reached, take it out of rotation.
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+
+            if connect_failed:
+                endpoint.failures += 1
+                endpoint.healthy = False
+
+    def has_alternative(self, excluded: Collection[Endpoint]) -> bool:
+        """Whether an endpoint not tried yet remains."""
+        with self._lock:
+            return any(e not in excluded for e in self.endpoints)
+
+    def check_health(self):
+        """Run the health check of every endpoint once."""
+        for endpoint in self.endpoints:
+            healthy = self.health_check(endpoint)
+            with self._lock:
+                endpoint.healthy = healthy
+
+    def _start_health_checks(self):
+        if self._health_thread is not None or self.health_check_interval is None:
+            return
+
+        with self._lock:
+            if self._health_thread is None and not self._stop.is_set():
+                self._health_thread = threading.Thread(
+                    target=self._run_health_checks, name='onem2m-endpoint-health', daemon=True
+                )
+                self._health_thread.start()
+
+    def _run_health_checks(self):
+        while not self._stop.wait(self.health_check_interval):
+            self.check_health()
+
+    def close(self):
+        """Stop the health checks."""
+        self._stop.set()
+
+        thread, self._health_thread = self._health_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
@@ -10,6 +10,11 @@ class HttpHeader:
     CONTENT_LOCATION = 'Content-Location'
     CONTENT_LENGTH   = 'Content-Length'
     ETAG             = 'Etag'
+    CONNECTION       = 'Connection'
+    ACCEPT_ENCODING  = 'Accept-Encoding'
+    CONTENT_ENCODING = 'Content-Encoding'
+    IF_NONE_MATCH    = 'If-None-Match'
+    RETRY_AFTER      = 'Retry-After'
 
     METHOD           = 'Method'
     URI              = 'URI'
@@ -0,0 +1,339 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, ssl, threading, requests, aiohttp
+
+from requests.adapters import HTTPAdapter
+
+from client.onem2m.http.HttpHeader import HttpHeader
+from client.onem2m.http.RetryPolicy import RetryPolicy
+from client.onem2m.http.CircuitBreaker import CircuitBreaker
+from client.onem2m.http.RateLimiter import RateLimiter
+from client.onem2m.http.Compression import Compression
+from client.onem2m.http.RequestIdGenerator import RequestIdGenerator
+from client.onem2m.http.ResourceCache import ResourceCache
+from client.onem2m.http.SingleFlight import SingleFlight
+from client.onem2m.http.TlsConfig import TlsConfig
+from client.onem2m.http.EndpointPool import EndpointPool
+
+from typing import Any, Callable, Optional, Set, Tuple
+
+
+class _TlsAdapter(HTTPAdapter):
+    """Transport adapter whose HTTPS connections all use the session's SSLContext.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs: Any):
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        # Trust store, client certificate and verification all come from the SSLContext, so
+        # nothing is loaded into it per connection.
+        conn.cert_reqs = 'CERT_REQUIRED' if self.ssl_context.verify_mode == ssl.CERT_REQUIRED else 'CERT_NONE'
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+
+
+class HttpSession:
+    """Pooled keep-alive HTTP session shared by every request issued against a CSE.
+
+    Wraps a requests.Session whose transport adapters keep a bounded pool of warm
+    connections per host, so consecutive oneM2M operations reuse the same TCP (and TLS)
+    connection instead of paying a fresh handshake each time.  Asynchronous requests
+    share one long-lived aiohttp.ClientSession configured with the same limits.
+    """
+
+    DEFAULT_POOL_CONNECTIONS   = 10
+    DEFAULT_POOL_MAXSIZE       = 10
+    DEFAULT_MAX_CONNECTIONS    = 100
+    DEFAULT_KEEP_ALIVE_TIMEOUT = 15.0
+    DEFAULT_TIMEOUT            = 30.0
+
+    # Seconds close waits for the aiohttp session of an idle event loop to close.
+    CLOSE_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keep_alive_timeout: float = DEFAULT_KEEP_ALIVE_TIMEOUT,
+        retry_policy: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        compression: Compression = None,
+        request_id_generator: Callable[[], str] = None,
+        cache: ResourceCache = None,
+        coalesce_retrieves: bool = True,
+        rate_limiter: RateLimiter = None,
+        tls: TlsConfig = None,
+        endpoints: EndpointPool = None,
+    ):
+        """Constructor
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept open per host.
+            pool_block (bool): Block when a host's pool is exhausted instead of opening
+                an extra (non-pooled) connection.
+            keep_alive (bool): Keep connections open between requests.  When False every
+                request is sent with 'Connection: close'.
+            max_connections (int): Total connection limit of the asynchronous pool (0 for no limit).
+            keep_alive_timeout (float): Seconds an idle asynchronous connection is kept open.
+            retry_policy (RetryPolicy): Retry rules for transient failures.  No retries when None.
+            circuit_breaker (CircuitBreaker): Breaker shared by every request to the CSE.  Disabled when None.
+            timeout (float): Default request deadline in seconds, retries included.  None for no deadline.
+            compression (Compression): Request and response body compression.  When None the
+                transport defaults apply and no bytes are counted.
+            request_id_generator (callable): Returns the request identifier (rqi) of each request.
+                Defaults to the process wide RequestIdGenerator.
+            cache (ResourceCache): Cache of retrieve responses.  Every retrieve reaches the CSE
+                when None.
+            coalesce_retrieves (bool): Identical concurrent retrieves (same target, query string
+                and originator) share one request and its response.
+            rate_limiter (RateLimiter): Per originator rate and adaptive concurrency limits of
+                the CSE.  Unlimited when None.
+            tls (TlsConfig): TLS settings of the HTTPS connections.  Defaults to a verified
+                TlsConfig trusting the requests CA bundle.
+            endpoints (EndpointPool): Front ends the requests to the CSE are spread over.  Requests
+                go to the host of their URL when None.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+        self.keep_alive_timeout = keep_alive_timeout
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.timeout = timeout
+        self.compression = compression
+        self.request_id_generator = request_id_generator or RequestIdGenerator.DEFAULT
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce_retrieves else None
+        self.rate_limiter = rate_limiter
+        self.tls = tls or TlsConfig()
+        self.endpoints = endpoints
+
+        # Created lazily on the event loop that issues the first asynchronous request.
+        self.async_session: Optional[aiohttp.ClientSession] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Closes of replaced sessions in flight, referenced until they finish.
+        self._closing: Set[asyncio.Task] = set()
+
+        self.session = requests.Session()
+
+        adapter = _TlsAdapter(
+            self.tls.context(),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.session.headers[HttpHeader.CONNECTION] = 'keep-alive' if keep_alive else 'close'
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a HTTP request over the pooled session.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            kwargs: Passed through to requests.Session.request.
+
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        if self.compression is None:
+            return self.session.request(method, url, **kwargs)
+
+        kwargs['headers'], kwargs['data'] = self._compress(kwargs.get('headers'), kwargs.get('data'))
+
+        response = self.session.request(method, url, **kwargs)
+
+        # requests decodes the body itself; the raw stream position is the size on the wire.
+        content = response.content or b''
+        wire = getattr(response.raw, 'tell', None)
+        self.compression.record_received(wire() if callable(wire) else len(content), len(content))
+
+        return response
+
+    def _compress(self, headers, data):
+        """Negotiate response encoding and compress the request body if configured.
+
+        Returns:
+            The request headers and body to send.
+        """
+        headers = dict(headers or {})
+
+        if self.compression.accept_encoding:
+            headers[HttpHeader.ACCEPT_ENCODING] = self.compression.get_accept_encoding()
+        else:
+            headers[HttpHeader.ACCEPT_ENCODING] = 'identity'
+
+        data, encoding = self.compression.compress(data)
+        if encoding is not None:
+            headers[HttpHeader.CONTENT_ENCODING] = encoding
+
+        return headers, data
+
+    def get_async_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on the running event loop if needed.
+
+        aiohttp sessions are bound to the loop they were created on, so a new one is built
+        if the previous session was closed or belongs to a different loop.
+
+        Returns:
+            aiohttp.ClientSession: The shared asynchronous session.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self.async_session is None or self.async_session.closed or self._async_loop is not loop:
+            self._close_stale_async_session()
+            connector = aiohttp.TCPConnector(
+                ssl=self.tls.context(),
+                limit=self.max_connections,
+                limit_per_host=self.pool_maxsize,
+                keepalive_timeout=self.keep_alive_timeout if self.keep_alive else None,
+                force_close=not self.keep_alive,
+            )
+            # With compression configured the body is decoded here so wire bytes can be counted.
+            self.async_session = aiohttp.ClientSession(
+                connector=connector, auto_decompress=self.compression is None
+            )
+            self._async_loop = loop
+
+        return self.async_session
+
+    def _close_stale_async_session(self):
+        """Close the aiohttp session of another event loop before it is replaced.
+        """
+        session, loop = self.async_session, self._async_loop
+        self.async_session = None
+
+        if session is None or session.closed:
+            return
+
+        if loop is not None and not loop.is_closed():
+            self._close_on_loop(session, loop)
+            return
+
+        # The connections died with their loop, only the session is left to close.
+        task = asyncio.get_running_loop().create_task(session.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _close_on_loop(self, session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop):
+        """Close session on the loop its connections belong to, running or idle.
+        """
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+
+        # An idle loop may never run again.  Drive it from a helper thread, as the caller may
+        # be running a loop of its own.
+        closer = threading.Thread(target=HttpSession._run_close, args=(session, loop), daemon=True)
+        closer.start()
+        closer.join(self.CLOSE_TIMEOUT)
+
+    @staticmethod
+    def _run_close(session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop):
+        close = session.close()
+
+        try:
+            loop.run_until_complete(close)
+        except RuntimeError:
+            # Started or closed meanwhile by its own thread.
+            close.close()
+            if not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def request_async(
+        self, method: str, url: str, headers=None, data=None, timeout: Optional[float] = None
+    ) -> Tuple[aiohttp.ClientResponse, bytes]:
+        """Send a HTTP request over the shared asynchronous session.
+
+        The body is read before returning so the connection goes straight back to the pool.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            headers: Request headers.
+            data: Request body.
+            timeout: Total seconds allowed for the request, body included.  None for no limit.
+
+        Returns:
+            The aiohttp response and its body.
+        """
+        session = self.get_async_session()
+
+        if self.compression is not None:
+            headers, data = self._compress(headers, data)
+
+        async with session.request(
+            method,
+            url,
+            headers=headers,
+            data=data,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            body = await response.read()
+
+        if self.compression is not None:
+            body = self.compression.decompress(body, response.headers.get(HttpHeader.CONTENT_ENCODING))
+
+        return response, body
+
+    def close(self):
+        """Close all pooled connections.
+        """
+        self.session.close()
+
+        if self.endpoints is not None:
+            self.endpoints.close()
+
+        # The asynchronous session can only be closed from its loop, where a running loop
+        # closes it in the background.  Await close_async to wait for it.
+        if self.async_session is not None and not self.async_session.closed:
+            loop = self._async_loop
+            if loop is not None and not loop.is_closed():
+                self._close_on_loop(self.async_session, loop)
+        self.async_session = None
+
+    async def close_async(self):
+        """Close all pooled connections from within the event loop.
+        """
+        self.session.close()
+
+        if self.endpoints is not None:
+            self.endpoints.close()
+
+        await self.close_async_session()
+
+    async def close_async_session(self):
+        """Close only the asynchronous pool, e.g. before its event loop is shut down.
+        """
+        if self.async_session is not None:
+            await self.async_session.close()
+        self.async_session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close_async()
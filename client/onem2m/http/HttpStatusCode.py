@@ -17,4 +17,5 @@ class HttpStatusCode:
     CONFLICT              = 409
 
     INTERNAL_SERVER_ERROR = 500
-    NOT_IMPLEMENTED       = 501
\ No newline at end of file
+    NOT_IMPLEMENTED       = 501
+    SERVICE_UNAVAILABLE   = 503
\ No newline at end of file
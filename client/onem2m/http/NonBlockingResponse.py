@@ -0,0 +1,264 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, concurrent.futures, time, urllib.parse
+
+from concurrent.futures import Future, InvalidStateError
+
+from client.exceptions.InvalidArgumentException import InvalidArgumentException
+from client.exceptions.UnresolvableRequestException import UnresolvableRequestException
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+
+from aiohttp import web
+from typing import Any, Callable, Optional
+
+
+class NonBlockingResponse:
+    """Future-like handle on the result of a non-blocking request (rt=1 or rt=2).
+
+    The CSE accepts the request right away (rsc 1001/1002) and performs the operation in the
+    background.  The handle resolves with the OneM2MResponse of the operation, either by
+    polling the <request> resource the CSE returned, or when the CSE delivers the result as
+    an 'm2m:rsp' notification to an AsyncResponseListener (see listen).  No connection is
+    held while the operation is outstanding.
+
+    If the CSE handles the request in blocking mode instead, the handle resolves with that
+    response as soon as it is accepted.  A handle that can neither poll nor be notified, with
+    polling disabled or no <request> resource returned and no listener, fails with
+    UnresolvableRequestException once accepted.
+    """
+
+    DEFAULT_POLL_INTERVAL     = 1.0
+    DEFAULT_MAX_POLL_INTERVAL = 30.0
+
+    # requestStatus values after which the operation result is final.
+    FINAL_REQUEST_STATUS = (
+        OneM2MPrimitive.M2M_REQUEST_STATUS.Completed.value,
+        OneM2MPrimitive.M2M_REQUEST_STATUS.Failed.value,
+        OneM2MPrimitive.M2M_REQUEST_STATUS.PartiallyCompleted.value,
+    )
+
+    ACCEPTED_RSC = (
+        OneM2MPrimitive.M2M_RSC_ACCEPTED,
+        OneM2MPrimitive.M2M_RSC_ACCEPTED_NON_BLOCKING_SYNCH,
+        OneM2MPrimitive.M2M_RSC_ACCEPTED_NON_BLOCKING_ASYNCH,
+    )
+
+    def __init__(
+        self,
+        request: Any,
+        to: str,
+        rqi: str,
+        originator: str,
+        poll_interval: Optional[float] = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ):
+        """Constructor
+
+        Args:
+            request (OneM2MRequest): Request used to poll the <request> resource.
+            to (str): URL the non-blocking request was sent to.
+            rqi (str): Request identifier of the non-blocking request.
+            originator (str): Originator of the polling requests.
+            poll_interval (float): Seconds before the first poll, doubled after every poll up to
+                max_poll_interval.  None disables polling, the handle then only resolves from a
+                notification.
+            max_poll_interval (float): Longest wait between two polls.
+        """
+        self.request = request
+        self.to = to
+        self.rqi = rqi
+        self.originator = originator
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+        # The CSE response accepting the request and the <request> resource it created.
+        self.accepted: Optional[OneM2MResponse] = None
+        self.request_uri: Optional[str] = None
+
+        self._future: Future = Future()
+        # The AsyncResponseListener the handle is registered with, see listen.
+        self._listener: Any = None
+
+    def _on_accepted(self, response: OneM2MResponse):
+        """Record the CSE's answer to the non-blocking request.
+        """
+        if response.rsc not in NonBlockingResponse.ACCEPTED_RSC:
+            # Processed in blocking mode.
+            self._resolve(response)
+            return
+
+        self.accepted = response
+
+        reference = response.pc.get('m2m:uri') if isinstance(response.pc, dict) else None
+        reference = reference or getattr(response, OneM2MPrimitive.M2M_PARAM_CONTENT, None)
+
+        if reference:
+            # SP relative references ('/cse/req-1') are relative to the CSE host.
+            reference = reference if '://' in reference else '/' + reference.lstrip('/')
+            self.request_uri = urllib.parse.urljoin(self.to, reference)
+
+        if self._listener is None and (self.request_uri is None or self.poll_interval is None):
+            try:
+                self._future.set_exception(UnresolvableRequestException(
+                    'Non-blocking request {} can neither be polled nor notified.'.format(self.rqi)
+                ))
+            except InvalidStateError:
+                pass
+
+    def _resolve(self, response: OneM2MResponse):
+        try:
+            self._future.set_result(response)
+        except InvalidStateError:
+            # Already resolved by the other channel.
+            pass
+
+    def _on_request_resource(self, response: OneM2MResponse):
+        """Resolve from a retrieved <request> resource if its operation is finished.
+        """
+        req = response.pc.get('m2m:req') if isinstance(response.pc, dict) else None
+
+        if req is not None and req.get('rs') in NonBlockingResponse.FINAL_REQUEST_STATUS:
+            self._resolve(OneM2MResponse.from_primitive(req.get('ol') or {}))
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def add_done_callback(self, fn: Callable[['NonBlockingResponse'], None]):
+        """Call fn with this handle once it is resolved (immediately if it already is)."""
+        self._future.add_done_callback(lambda _: fn(self))
+
+    def poll(self) -> bool:
+        """Retrieve the <request> resource once.
+
+        Returns:
+            True if the handle is resolved.
+        """
+        if not self.done() and self.request_uri is not None:
+            self._on_request_resource(
+                # The <request> resource changes under the cache, always ask the CSE.
+                self.request.retrieve(self.request_uri, {OneM2MPrimitive.M2M_PARAM_FROM: self.originator}, cached=False)
+            )
+
+        return self.done()
+
+    async def poll_async(self) -> bool:
+        """Asynchronously retrieve the <request> resource once.
+
+        Returns:
+            True if the handle is resolved.
+        """
+        if not self.done() and self.request_uri is not None:
+            self._on_request_resource(
+                await self.request.retrieve_async(
+                    self.request_uri, {OneM2MPrimitive.M2M_PARAM_FROM: self.originator}, cached=False
+                )
+            )
+
+        return self.done()
+
+    def _waits(self, timeout: Optional[float]):
+        """Yields how long to wait before each poll until timeout.
+
+        Raises:
+            TimeoutError: When the timeout has passed.
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        interval = self.poll_interval
+
+        while True:
+            wait = interval
+            if expires_at is not None:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError('Non-blocking request {} not completed after {}s.'.format(self.rqi, timeout))
+                wait = remaining if wait is None else min(wait, remaining)
+
+            yield wait
+
+            if interval is not None:
+                interval = min(interval * 2, self.max_poll_interval)
+
+    def result(self, timeout: Optional[float] = None) -> OneM2MResponse:
+        """Wait for the operation result, polling the <request> resource if enabled.
+
+        Args:
+            timeout: Seconds to wait.  None to wait until the result is available.
+
+        Returns:
+            OneM2MResponse: The response of the operation.
+
+        Raises:
+            TimeoutError: If the result is not available within timeout.
+            UnresolvableRequestException: If the handle can neither poll nor be notified.
+        """
+        if self.done():
+            return self._future.result()
+
+        for wait in self._waits(timeout):
+            try:
+                # Returns early if a notification resolves the handle meanwhile.
+                return self._future.result(wait)
+            except concurrent.futures.TimeoutError:
+                pass
+
+            if self.poll_interval is not None and self.poll():
+                return self._future.result()
+
+    async def wait(self, timeout: Optional[float] = None) -> OneM2MResponse:
+        """Asynchronous result, see result.
+        """
+        if self.done():
+            return self._future.result()
+
+        resolved = asyncio.wrap_future(self._future)
+
+        for wait in self._waits(timeout):
+            try:
+                # Shielded so a poll timeout does not cancel the handle.
+                return await asyncio.wait_for(asyncio.shield(resolved), wait)
+            except asyncio.TimeoutError:
+                pass
+
+            if self.poll_interval is not None and await self.poll_async():
+                return self._future.result()
+
+    def __await__(self):
+        return self.wait().__await__()
+
+    def listen(self, listener: Any):
+        """Resolve from the 'm2m:rsp' notification the CSE sends for this request.
+
+        Must be called before the request is sent, so an early notification is not missed.
+
+        Args:
+            listener: The started AsyncResponseListener the request's notification URI points to.
+
+        Raises:
+            InvalidArgumentException: If the listener runs its callbacks in other processes.
+        """
+        if not getattr(listener, 'in_process', True):
+            raise InvalidArgumentException('A multi-process listener cannot resolve a non-blocking request, use a threaded one.')
+
+        async def on_response(req: web.Request, res: web.Response):
+            body = await req.json()
+            self._resolve(OneM2MResponse.from_primitive(body.get('m2m:rsp') or {}))
+            return res
+
+        self._listener = listener
+        listener.set_rqi_cb(self.rqi, on_response)
+        # However the handle resolves: notification, poll or blocking answer.
+        self._future.add_done_callback(lambda _: self._unlisten())
+
+    def _unlisten(self):
+        """Remove the listener callback registered by listen, if any.
+        """
+        listener, self._listener = self._listener, None
+
+        if listener is not None:
+            listener.remove_rqi_cb(self.rqi)
+
+    def __repr__(self):
+        return '<NonBlockingResponse {} {}>'.format(self.rqi, 'done' if self.done() else 'pending')
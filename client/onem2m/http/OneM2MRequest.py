@@ -2,7 +2,7 @@
 
 #!/usr/bin/env python
 
-import requests, aiohttp, json, random, urllib
+import asyncio, builtins, time, requests, aiohttp, urllib, urllib3
 
 from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
 from client.onem2m.OneM2MOperation import OneM2MOperation
@@ -10,12 +10,17 @@ from client.onem2m.http.OneM2MResponse import OneM2MResponse
 from client.onem2m.OneM2MResource import OneM2MResource, OneM2MResourceContent
 from client.exceptions.BaseException import BaseException
 from client.onem2m.http.HttpHeader import HttpHeader
-
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.Deadline import Deadline
+from client.onem2m.http.EndpointPool import Endpoint
+from client.onem2m.http.PreparedRequest import PreparedRequest
+from client.onem2m.http.RequestIdGenerator import RequestIdGenerator
+from client.onem2m.codec.Codec import Codec
+from client.exceptions.DeadlineExceededException import DeadlineExceededException
+
+from enum import Enum
 from typing import Dict, Mapping, MutableMapping, Any, List, Optional
 
-import os, ssl
-ssl._create_default_https_context = ssl._create_unverified_context
-
 class OneM2MRequest(OneM2MPrimitive):
     """OneM2M request primitive to http mapping.
     """
@@ -84,6 +89,7 @@ class OneM2MRequest(OneM2MPrimitive):
     M2M_PARAM_SIZE_BELOW              = 'szb'
     M2M_PARAM_CONTENT_TYPE            = 'cty'
     M2M_PARAM_LIMIT                   = 'lim'
+    M2M_PARAM_OFFSET                  = 'ofst'
     M2M_PARAM_ATTRIBUTE               = 'atr'
     M2M_PARAM_FILTER_USAGE            = 'fu'
     M2M_PARAM_SEMANTICS_FILTER        = 'smf'
@@ -97,6 +103,7 @@ class OneM2MRequest(OneM2MPrimitive):
     QUERY_STRING_PARAMS: List[str] = [
         M2M_PARAM_RESPONSE_TYPE,
         M2M_PARAM_RESULT_PERSISTENCE,
+        M2M_PARAM_RESULT_CONTENT,
         M2M_PARAM_DELIVERY_AGGREGATION,
         M2M_PARAM_CREATED_BEFORE,
         M2M_PARAM_CREATED_AFTER,
@@ -111,6 +118,7 @@ class OneM2MRequest(OneM2MPrimitive):
         M2M_PARAM_SIZE_BELOW,
         M2M_PARAM_CONTENT_TYPE,
         M2M_PARAM_LIMIT,
+        M2M_PARAM_OFFSET,
         M2M_PARAM_ATTRIBUTE,
         M2M_PARAM_FILTER_USAGE,
         M2M_PARAM_SEMANTICS_FILTER,
@@ -122,13 +130,34 @@ class OneM2MRequest(OneM2MPrimitive):
         OneM2MPrimitive.M2M_PARAM_RESOURCE_NAME,
     ]
 
+    # Filter criteria that are only sent in the query string of discovery requests (fu=1).
+    # Elsewhere the resource type is carried by the Content-Type header of creates.
+    DISCOVERY_QUERY_STRING_PARAMS: List[str] = [
+        M2M_PARAM_RESOURCE_TYPE,
+    ]
+
     Parameters = MutableMapping[str, Any]
 
-    def __init__(self, to: str = None, params: Parameters = {}):
+    def __init__(
+        self,
+        to: str = None,
+        params: Parameters = None,
+        session: HttpSession = None,
+        timeout: float = None,
+        codec: Codec = None,
+        lazy_decode: bool = False,
+    ):
         """ Constructor.
            Args:
             to: The cse host
             params: The request params to convert to http headers.
+            session: Pooled HTTP session to send the request over.  When None, a new
+                connection is opened for every request.
+            timeout: Seconds until the request deadline.  Overrides any Deadline.scope and the
+                session timeout.
+            codec: Codec used to serialize the request content and parse the response.
+                Defaults to the standard library JSON codec.
+            lazy_decode: Decode response bodies on first access of 'pc', see OneM2MResponse.
         """
 
         # Target host.
@@ -137,7 +166,16 @@ class OneM2MRequest(OneM2MPrimitive):
         # No param requirements can be enforced because we dont know the requested operation
         # that will be performed yet.  OneM2M operations are dictated by the member function that is
         # called on the instance and param validation is performed in those functions.
-        self.params = params
+        self.params = {} if params is None else params
+
+        # Shared connection pool, normally owned by the CSE issuing this request.
+        self.session = session
+
+        self.timeout = timeout
+
+        self.codec = codec or OneM2MResponse.DEFAULT_CODEC
+
+        self.lazy_decode = lazy_decode
 
     def _validate_required_params(self, operation: str, params: Parameters):
         """Validates the required parameters (HTTP mapped ones only) for a specified OneM2M operation (Create, Retrieve, ect).
@@ -234,10 +272,19 @@ class OneM2MRequest(OneM2MPrimitive):
         # Strip query string in event its already been applied and append the query string indicator.
         to = to.split('?')[0] + '?'
 
+        filter_usage = params.get(OneM2MRequest.M2M_PARAM_FILTER_USAGE)
+        if isinstance(filter_usage, Enum):
+            filter_usage = filter_usage.value
+        discovery = str(filter_usage) == str(OneM2MPrimitive.M2M_FILTER_USAGE.Discovery.value)
+
         for param, value in params.items():
-            if param not in OneM2MPrimitive.M2M_PARAM_TO_HTTP_HEADER_MAP.keys() and param in OneM2MRequest.QUERY_STRING_PARAMS:
+            if param in OneM2MPrimitive.M2M_PARAM_TO_HTTP_HEADER_MAP.keys():
+                continue
+            if param in OneM2MRequest.QUERY_STRING_PARAMS or (discovery and param in OneM2MRequest.DISCOVERY_QUERY_STRING_PARAMS):
                 if to[-1] != '?':
                     to += '&'
+                if isinstance(value, Enum):
+                    value = value.value
                 to += '{}={}'.format(param, urllib.parse.quote(str(value)))
 
         # No query string, strip the '? and return the just 'to'.  Otherwise, return the modified to with query string.
@@ -252,6 +299,10 @@ class OneM2MRequest(OneM2MPrimitive):
               is found in 'params' or 'params' are None, the member 'to' and 'params' set in the
               constructor are used.
 
+           The params are copied before the request id and 'to' are added, so neither the argument
+           nor the constructor params are modified and the same params can be shared by concurrent
+           requests.
+
         Args:
             to: The 'to' param
             param: The remaining params
@@ -268,13 +319,17 @@ class OneM2MRequest(OneM2MPrimitive):
 
         assert params is not None
 
-        # Generate a random request id.
-        params[OneM2MPrimitive.M2M_PARAM_REQUEST_IDENTIFIER] = self._generate_rqi()
-
         # Params must be expressed as a dict.
         if isinstance(params, dict) is False:
             raise InvalidRequestParameterStructureException(params)
 
+        params = dict(params)
+
+        # Generate a unique request id, unless the caller has to know it before sending (e.g.
+        # to route the asynchronous response of a non-blocking request).
+        if not params.get(OneM2MPrimitive.M2M_PARAM_REQUEST_IDENTIFIER):
+            params[OneM2MPrimitive.M2M_PARAM_REQUEST_IDENTIFIER] = self._generate_rqi()
+
         # Use params 'to'.
         if to is None:
             # If params contains to...
@@ -293,6 +348,289 @@ class OneM2MRequest(OneM2MPrimitive):
 
         return to, params
 
+    def _start_deadline(self, headers: Optional[Dict[str, str]]) -> Optional[Deadline]:
+        """Resolves the request deadline and adds it to the headers as the request expiration.
+
+        The deadline comes from, in order: the request timeout, the enclosing Deadline.scope
+        and the session timeout.  An expiration set explicitly through the request params is
+        left untouched.
+
+        Args:
+            headers: The request headers.
+
+        Returns:
+            The deadline or None if the request has none.
+        """
+        deadline = None
+
+        if self.timeout is not None:
+            deadline = Deadline(self.timeout)
+        else:
+            deadline = Deadline.current()
+            if deadline is None and self.session is not None and self.session.timeout is not None:
+                deadline = Deadline(self.session.timeout)
+
+        if deadline is not None and headers is not None and OneM2MPrimitive.X_M2M_RET not in headers:
+            headers[OneM2MPrimitive.X_M2M_RET] = deadline.timestamp()
+
+        return deadline
+
+    def _attempt_timeout(self, deadline: Optional[Deadline]) -> Optional[float]:
+        """Socket timeout of the next attempt, the time left before the deadline.
+
+        Raises:
+            DeadlineExceededException: If the deadline has already passed.
+        """
+        if deadline is None:
+            return None
+
+        if deadline.expired():
+            raise DeadlineExceededException('Request deadline of {}s exceeded.'.format(deadline.timeout))
+
+        return deadline.remaining()
+
+    def _response(self, http_response, body: Optional[bytes] = None) -> OneM2MResponse:
+        """Maps a HTTP response to a OneM2MResponse with the request codec.
+        """
+        return OneM2MResponse(http_response, body, self.codec, self.lazy_decode)
+
+    def _cache(self):
+        """The session's ResourceCache, None if caching is disabled."""
+        return self.session.cache if self.session is not None else None
+
+    def _send(self, method: str, to: str, **kwargs: Any) -> requests.Response:
+        """Sends the HTTP request, see _send_http.  Writes invalidate the target's cached
+           retrieves once they complete.
+        """
+        try:
+            return self._send_http(method, to, **kwargs)
+        finally:
+            cache = self._cache()
+            if cache is not None and method != 'GET':
+                cache.invalidate(to)
+
+    def _flight_key(self, to: str, headers: Mapping[str, str]):
+        """Identifies retrieves with the same answer: target, query string and originator."""
+        return to, headers.get(OneM2MPrimitive.X_M2M_ORIGIN), headers.get(HttpHeader.ACCEPT)
+
+    def _get(self, to: str, headers: Dict[str, str], **kwargs: Any) -> OneM2MResponse:
+        """Sends a retrieve, sharing the answer of an identical retrieve already in flight
+           on the session.
+
+        Args:
+            to: Request URL.
+            headers: Request headers.
+            kwargs: Passed through to requests.
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            DeadlineExceededException: If the deadline passed while waiting for the shared retrieve.
+        """
+        flight = self.session.single_flight if self.session is not None else None
+
+        if flight is None:
+            return self._fetch(to, headers, **kwargs)
+
+        return flight.do(
+            self._flight_key(to, headers), lambda: self._fetch(to, headers, **kwargs), self._start_deadline(None)
+        )
+
+    def _fetch(self, to: str, headers: Dict[str, str], **kwargs: Any) -> OneM2MResponse:
+        """Sends a retrieve, answered from the session's ResourceCache when possible.
+
+        Args:
+            to: Request URL.
+            headers: Request headers.
+            kwargs: Passed through to requests.
+
+        Returns:
+            A OneM2MResponse object.
+        """
+        cache = self._cache()
+
+        if cache is None:
+            return self._response(self._send('GET', to, headers=headers, **kwargs))
+
+        key, entry, to, headers, conditional = cache.lookup(to, headers)
+        if entry is not None and entry.fresh():
+            return entry.response
+
+        http_response = self._send('GET', to, headers=headers, **kwargs)
+
+        return cache.resolve(
+            key,
+            entry,
+            http_response.status_code,
+            http_response.headers.get(HttpHeader.ETAG),
+            conditional,
+            lambda: self._response(http_response),
+        )
+
+    @staticmethod
+    def _is_throttled(status: int, headers) -> bool:
+        """Whether a response asks to slow down: Too Many Requests or a Retry-After."""
+        return status == 429 or HttpHeader.RETRY_AFTER in headers
+
+    @staticmethod
+    def _is_connect_error(err: Exception) -> bool:
+        """Whether a requests error happened before the connection was established."""
+        if isinstance(err, requests.ConnectTimeout):
+            return True
+
+        reason = getattr(err.args[0], 'reason', None) if isinstance(err, requests.ConnectionError) and err.args else None
+
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+    def _admit(self, headers: Optional[Dict[str, str]], deadline: Optional[Deadline]):
+        """Admits an attempt through the session's rate limiter and circuit breaker.
+
+        Returns:
+            The rate limiter permit (None without a rate limiter) and the attempt timeout.
+
+        Raises:
+            CircuitOpenException: If the CSE circuit breaker is open.
+            DeadlineExceededException: If the deadline passed before the attempt was admitted.
+        """
+        rate_limiter = self.session.rate_limiter
+        permit = None
+
+        if rate_limiter is not None:
+            permit = rate_limiter.acquire((headers or {}).get(OneM2MPrimitive.X_M2M_ORIGIN, ''), deadline)
+
+        return permit, self._admitted(permit, deadline)
+
+    async def _admit_async(self, headers: Optional[Dict[str, str]], deadline: Optional[Deadline]):
+        """Asynchronous _admit.
+        """
+        rate_limiter = self.session.rate_limiter
+        permit = None
+
+        if rate_limiter is not None:
+            permit = await rate_limiter.acquire_async((headers or {}).get(OneM2MPrimitive.X_M2M_ORIGIN, ''), deadline)
+
+        return permit, self._admitted(permit, deadline)
+
+    def _admitted(self, permit, deadline: Optional[Deadline]) -> Optional[float]:
+        """Checks the deadline and circuit breaker once the rate limiter admitted an attempt.
+        """
+        try:
+            timeout = self._attempt_timeout(deadline)
+
+            if self.session.circuit_breaker is not None:
+                self.session.circuit_breaker.before_request()
+        except Exception:
+            if permit is not None:
+                permit.release()
+            raise
+
+        return timeout
+
+    def _send_http(self, method: str, to: str, **kwargs: Any) -> requests.Response:
+        """Sends the HTTP request over the pooled session if one was provided.
+
+        Transient failures (connection errors, timeouts and the retry policy's HTTP statuses)
+        are retried according to the session's retry policy, and every attempt is admitted
+        and accounted for by the session's circuit breaker.  No attempt, and no wait between
+        attempts, outlasts the request deadline.
+
+        Args:
+            method: HTTP method.
+            to: Request URL.
+            kwargs: Passed through to requests.
+
+        Returns:
+            requests.Response: The HTTP response.
+
+        Raises:
+            CircuitOpenException: If the CSE circuit breaker is open.
+            DeadlineExceededException: If the deadline passed before an attempt could be made.
+        """
+        deadline = self._start_deadline(kwargs.get('headers'))
+
+        if self.session is None:
+            return requests.request(method, to, timeout=self._attempt_timeout(deadline), **kwargs)
+
+        retry_policy = self.session.retry_policy
+        circuit_breaker = self.session.circuit_breaker
+        endpoints = self.session.endpoints
+        tried: List[Endpoint] = []
+        attempt = 0
+
+        while True:
+            permit, timeout = self._admit(kwargs.get('headers'), deadline)
+            endpoint, url = endpoints.acquire(to, tried) if endpoints is not None else (None, to)
+
+            try:
+                http_response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except Exception as err:
+                # A front end that cannot be reached is skipped, the request never left.
+                failover = endpoint is not None and OneM2MRequest._is_connect_error(err)
+                if endpoint is not None:
+                    endpoints.release(endpoint, failover)
+                    tried.append(endpoint)
+                    failover = failover and endpoints.has_alternative(tried)
+                if circuit_breaker is not None:
+                    if failover:
+                        circuit_breaker.release_probe()
+                    else:
+                        circuit_breaker.record_failure()
+                transient = isinstance(err, (requests.ConnectionError, requests.Timeout))
+                if permit is not None:
+                    permit.release(error=transient and not failover)
+                if failover:
+                    continue
+                if not transient or retry_policy is None or not retry_policy.can_retry(method, kwargs.get('headers'), attempt):
+                    raise
+                delay = retry_policy.backoff(attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    raise
+                time.sleep(delay)
+                # Endpoints are only excluded within one failover sweep, a retry may use any.
+                tried = []
+                attempt += 1
+                continue
+            except builtins.BaseException:
+                # Cancelled or interrupted.  (BaseException is the client exception base here.)
+                if circuit_breaker is not None:
+                    circuit_breaker.release_probe()
+                if permit is not None:
+                    permit.release()
+                if endpoint is not None:
+                    endpoints.release(endpoint)
+                raise
+
+            if endpoint is not None:
+                endpoints.release(endpoint)
+
+            if permit is not None:
+                permit.release(http_response.status_code, http_response.headers.get(OneM2MPrimitive.X_M2M_RSC))
+
+            transient = retry_policy is not None and retry_policy.is_retryable_status(http_response.status_code)
+
+            if circuit_breaker is not None:
+                if OneM2MRequest._is_throttled(http_response.status_code, http_response.headers):
+                    # A CSE shedding load is up, throttling counts as neither failure nor success.
+                    circuit_breaker.release_probe()
+                elif transient or http_response.status_code >= 500:
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+
+            if not transient or not retry_policy.can_retry(method, kwargs.get('headers'), attempt):
+                return http_response
+
+            delay = retry_policy.backoff(attempt, http_response.headers.get(HttpHeader.RETRY_AFTER))
+            if deadline is not None and delay >= deadline.remaining():
+                return http_response
+
+            # Release the connection before waiting.
+            http_response.close()
+            time.sleep(delay)
+            tried = []
+            attempt += 1
+
     def _get_all_request_params(self):
         """Aggregates all of the query string and header request params.
 
@@ -328,16 +666,40 @@ class OneM2MRequest(OneM2MPrimitive):
                 # @todo do some logging
                 pass
 
-    def create(self, to: str, params: Parameters = None, content = None):
-        """ Synchronous OneM2M Create request.
+    def _encode_content(self, operation: str, content) -> Optional[bytes]:
+        """Serializes the request content with the request codec.
+
+        Args:
+            operation: The OneM2M operation.
+            content: A OneM2MResource
+
+        Returns:
+            The serialized body or None when there is no content.
+        """
+        # Extract entity members as dict.
+        if isinstance(content, OneM2MResource):
+            # Wrap the entity in a container json object
+            # entity_name = content.__class__.__name__.lower()
+            # @todo raise an ShortNameNotSet (OneM2MResource) expection.
+            entity_name = content.short_name
+
+            # Serialize straight to bytes with the request codec.
+            return self.codec.encode({entity_name: content.get_content()})
+
+        if operation == OneM2MOperation.Update:
+            raise Exception('Update must be an instance of OneM2MResource')
+
+        return None
+
+    def _prepare_create(self, to: Optional[str], params: Optional[Parameters]):
+        """Builds the HTTP request for a OneM2M Create operation.
 
         Args:
             to: Host (Overrides 'to' argument set in constructor.)
             params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
-            content: A OneM2MResource
 
         Returns:
-            A OneM2MResponse object.
+            The request URL and headers.
 
         Raises:
             RequiredRequestParameterMissingException: If a required parameter is not is not included.
@@ -356,38 +718,20 @@ class OneM2MRequest(OneM2MPrimitive):
 
         # Set the content type AND append the oneM2M resource type for the request.
         # @todo move this to member with setter function.
-        headers[HttpHeader.CONTENT_TYPE] = OneM2MPrimitive.CONTENT_TYPE_JSON + '; ty='+str(params['ty'])
-
-        # Extract entity members as dict.
-        if isinstance(content, OneM2MResource):
-            # Wrap the entity in a container json object
-            # entity_name = content.__class__.__name__.lower()
-            # @todo raise an ShortNameNotSet (OneM2MResource) expection.
-            entity_name = content.short_name
-            data = {entity_name: content.get_content()}
-
-            # Serialize dict. @todo data serialization must be dictated by content-type
-            json_data = json.dumps(data)
-
-            # HTTP POST implied by OneM2M Create Operation (function signature).
-            http_response = requests.post(to, headers = headers, data=json_data, verify=False)
-        else:
-            # HTTP POST implied by OneM2M Create Operation (function signature).
-            http_response = requests.post(to, headers = headers, verify=False)
+        headers[HttpHeader.CONTENT_TYPE] = self.codec.content_type + '; ty='+str(params['ty'])
+        headers[HttpHeader.ACCEPT] = self.codec.get_accept()
 
-        # Return a OneM2MResponse instance.
-        return OneM2MResponse(http_response)
+        return to, headers
 
-    def update(self, to=None, params=None, content=None):
-        """ Synchronous OneM2M update request.
+    def _prepare_update(self, to: Optional[str], params: Optional[Parameters]):
+        """Builds the HTTP request for a OneM2M Update operation.
 
         Args:
             to: Host (Overrides 'to' argument set in constructor.)
             params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
-            content: A OneM2MResource
 
         Returns:
-            A OneM2MResponse object.
+            The request URL and headers.
 
         Raises:
             RequiredRequestParameterMissingException: If a required parameter is not is not included.
@@ -405,34 +749,20 @@ class OneM2MRequest(OneM2MPrimitive):
 
         # Set the content type for the request.
         # @todo move this to member with setter function.
-        headers[HttpHeader.CONTENT_TYPE] = OneM2MPrimitive.CONTENT_TYPE_JSON
+        headers[HttpHeader.CONTENT_TYPE] = self.codec.content_type
+        headers[HttpHeader.ACCEPT] = self.codec.get_accept()
 
-        # Extract entity members as dict.
-        if isinstance(content, OneM2MResource):
-            entity_name = content.short_name
-            data = {entity_name: content.get_content()}
+        return to, headers
 
-            # Serialize dict. @todo data serialization must be dictated by content-type
-            json_data = json.dumps(data)
-
-            # HTTP POST implied by OneM2M Create Operation (function signature).
-            http_response = requests.put(to, headers=headers, data=json_data)
-
-            # Return a OneM2MResponse instance.
-            return OneM2MResponse(http_response)
-        else:
-            raise Exception('Update must be an instance of OneM2MResource')
-
-    def retrieve(self, to=None, params=None):
-        """ Synchronous OneM2M Retrieve request.
+    def _prepare_retrieve(self, to: Optional[str], params: Optional[Parameters]):
+        """Builds the HTTP request for a OneM2M Retrieve operation.
 
         Args:
             to: Host (Overrides 'to' argument set in constructor.)
             params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
-            content: A OneM2MResource
 
         Returns:
-            A OneM2MResponse object.
+            The request URL and headers.
 
         Raises:
             RequiredRequestParameterMissingException: If a required parameter is not is not included.
@@ -447,22 +777,19 @@ class OneM2MRequest(OneM2MPrimitive):
 
         # Convert OneM2M request params to headers for HTTP request.
         headers = self._map_params_to_headers(params)
+        headers[HttpHeader.ACCEPT] = self.codec.get_accept()
 
-        # HTTP GET implied by OneM2M retrieve Operation (function signature).
-        http_response = requests.get(to, headers=headers, verify=False)
+        return to, headers
 
-        # Return a OneM2MResponse instance.
-        return OneM2MResponse(http_response)
-
-    def delete(self, to=None, params=None):
-        """ Synchronous OneM2M Delete operation.
+    def _prepare_delete(self, to: Optional[str], params: Optional[Parameters]):
+        """Builds the HTTP request for a OneM2M Delete operation.
 
         Args:
             to: Host (Overrides 'to' argument set in constructor.)
-            param: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
 
         Returns:
-            A OneM2MResponse object.
+            The request URL and headers.
         """
 
         # Process arguments.
@@ -474,47 +801,435 @@ class OneM2MRequest(OneM2MPrimitive):
 
         # Build headers for HTTP request.
         headers = self._map_params_to_headers(params)
+        headers[HttpHeader.ACCEPT] = self.codec.get_accept()
+
+        return to, headers
+
+    def create(self, to: str, params: Parameters = None, content = None):
+        """ Synchronous OneM2M Create request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            content: A OneM2MResource
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        to, headers = self._prepare_create(to, params)
+        data = self._encode_content(OneM2MOperation.Create, content)
 
         # HTTP POST implied by OneM2M Create Operation (function signature).
-        http_response = requests.delete(to, headers=headers)
+        http_response = self._send('POST', to, headers=headers, data=data)
 
         # Return a OneM2MResponse instance.
-        return OneM2MResponse(http_response)
+        return self._response(http_response)
+
+    def update(self, to=None, params=None, content=None):
+        """ Synchronous OneM2M update request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            content: A OneM2MResource
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        to, headers = self._prepare_update(to, params)
+        data = self._encode_content(OneM2MOperation.Update, content)
+
+        # HTTP PUT implied by OneM2M Update Operation (function signature).
+        http_response = self._send('PUT', to, headers=headers, data=data)
+
+        # Return a OneM2MResponse instance.
+        return self._response(http_response)
+
+    def retrieve(self, to=None, params=None, cached=True):
+        """ Synchronous OneM2M Retrieve request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            cached: Answer from the session's cache and share identical retrieves in flight.
+                False always asks the CSE, e.g. to poll a resource.
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        to, headers = self._prepare_retrieve(to, params)
+
+        # HTTP GET implied by OneM2M retrieve Operation (function signature).
+        if not cached:
+            return self._response(self._send('GET', to, headers=headers))
+
+        return self._get(to, headers)
+
+    def delete(self, to=None, params=None):
+        """ Synchronous OneM2M Delete operation.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            param: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+
+        Returns:
+            A OneM2MResponse object.
+        """
+        to, headers = self._prepare_delete(to, params)
+
+        # HTTP DELETE implied by OneM2M Delete Operation (function signature).
+        http_response = self._send('DELETE', to, headers=headers)
+
+        # Return a OneM2MResponse instance.
+        return self._response(http_response)
 
     def notify(self, to=None, params=None):
         pass
 
-    async def create_async(self, to, params=None, content=None):
-        """Asynchronous create (POST) OneM2M request.
+    def prepare(self, operation: str, to: str = None, params: Parameters = None) -> PreparedRequest:
+        """Builds a reusable request for the specified operation.
+
+        The URL, query string and headers are mapped and validated once.  Each send of the
+        returned request only adds a new request identifier and serializes the content.
 
         Args:
+            operation: The OneM2M operation (Create, Retrieve, Update or Delete).
             to: Host (Overrides 'to' argument set in constructor.)
-            param: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
-            content: ...
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+
+        Returns:
+            A PreparedRequest bound to this request's session, codec and timeout.
+
+        Raises:
+            InvalidOneM2MOperationException: If the operation is not supported.
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        builders = {
+            OneM2MOperation.Create: self._prepare_create,
+            OneM2MOperation.Retrieve: self._prepare_retrieve,
+            OneM2MOperation.Update: self._prepare_update,
+            OneM2MOperation.Delete: self._prepare_delete,
+        }
+
+        if operation not in builders:
+            raise InvalidOneM2MOperationException('Unsupported operation "{}".'.format(operation))
+
+        to, headers = builders[operation](to, params)
+
+        # A new request identifier is generated on every send.
+        headers.pop(OneM2MPrimitive.X_M2M_RI, None)
+
+        return PreparedRequest(
+            self,
+            operation,
+            OneM2MPrimitive.OPS_TO_METHOD_MAPPING[operation],
+            to,
+            headers,
+        )
+
+    def request(self, operation: str, to: str = None, params: Parameters = None, content = None):
+        """Synchronous OneM2M request for the specified operation.
+
+        Args:
+            operation: The OneM2M operation (Create, Retrieve, Update or Delete).
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            content: A OneM2MResource for Create and Update operations.
 
         Returns:
             A OneM2MResponse object.
+
+        Raises:
+            InvalidOneM2MOperationException: If the operation is not supported.
         """
-        # Ensure form of params.
-        if params is not None and isinstance(params, dict) is False:
-            raise Exception('Headers must be dict')
+        if operation == OneM2MOperation.Create:
+            return self.create(to, params, content)
+        elif operation == OneM2MOperation.Retrieve:
+            return self.retrieve(to, params)
+        elif operation == OneM2MOperation.Update:
+            return self.update(to, params, content)
+        elif operation == OneM2MOperation.Delete:
+            return self.delete(to, params)
 
-        # If params is set to None, check if the instance was initialized with paramters.
-        # Raises an exception @todo implement MissingRequiredParamException.
-        self._validate_required_params(OneM2MOperation.Create, params)
+        raise InvalidOneM2MOperationException('Unsupported operation "{}".'.format(operation))
+
+    async def _send_async(self, method: str, to: str, **kwargs: Any) -> OneM2MResponse:
+        """Sends the HTTP request on the event loop and maps the reply to a OneM2MResponse.
+           Writes invalidate the target's cached retrieves once they complete.
+
+        Args:
+            method: HTTP method.
+            to: Request URL.
+            kwargs: Passed through to HttpSession.request_async.
+
+        Returns:
+            A OneM2MResponse object.
+        """
+        try:
+            http_response, body = await self._send_async_http(method, to, **kwargs)
+        finally:
+            cache = self._cache()
+            if cache is not None and method != 'GET':
+                cache.invalidate(to)
+
+        return self._response(http_response, body)
+
+    async def _get_async(self, to: str, headers: Dict[str, str], **kwargs: Any) -> OneM2MResponse:
+        """Asynchronous _get.
+        """
+        flight = self.session.single_flight if self.session is not None else None
+
+        if flight is None:
+            return await self._fetch_async(to, headers, **kwargs)
+
+        return await flight.do_async(
+            self._flight_key(to, headers), lambda: self._fetch_async(to, headers, **kwargs), self._start_deadline(None)
+        )
+
+    async def _fetch_async(self, to: str, headers: Dict[str, str], **kwargs: Any) -> OneM2MResponse:
+        """Asynchronous _fetch.
+        """
+        cache = self._cache()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(to) as resp:
-                # Map the client response to the OneM2MResponse.
-                return resp
+        if cache is None:
+            return await self._send_async('GET', to, headers=headers, **kwargs)
+
+        key, entry, to, headers, conditional = cache.lookup(to, headers)
+        if entry is not None and entry.fresh():
+            return entry.response
+
+        http_response, body = await self._send_async_http('GET', to, headers=headers, **kwargs)
+
+        return cache.resolve(
+            key,
+            entry,
+            http_response.status,
+            http_response.headers.get(HttpHeader.ETAG),
+            conditional,
+            lambda: self._response(http_response, body),
+        )
+
+    async def _send_async_http(self, method: str, to: str, **kwargs: Any):
+        """Sends the HTTP request on the event loop.
+
+        Retries, circuit breaking and deadlines follow the same rules as the synchronous path.
+        When the deadline passes mid-request the request is cancelled and its connection slot freed.
+
+        Args:
+            method: HTTP method.
+            to: Request URL.
+            kwargs: Passed through to HttpSession.request_async.
+
+        Returns:
+            The aiohttp response and its body.
+
+        Raises:
+            CircuitOpenException: If the CSE circuit breaker is open.
+            DeadlineExceededException: If the deadline passed before an attempt could be made.
+        """
+        deadline = self._start_deadline(kwargs.get('headers'))
+
+        if self.session is None:
+            # No shared pool, a one-shot request like the synchronous path's requests.request.
+            timeout = aiohttp.ClientTimeout(total=self._attempt_timeout(deadline))
+            async with aiohttp.request(method, to, timeout=timeout, **kwargs) as http_response:
+                return http_response, await http_response.read()
+
+        retry_policy = self.session.retry_policy
+        circuit_breaker = self.session.circuit_breaker
+        endpoints = self.session.endpoints
+        tried: List[Endpoint] = []
+        attempt = 0
+
+        while True:
+            permit, timeout = await self._admit_async(kwargs.get('headers'), deadline)
+            endpoint, url = endpoints.acquire(to, tried) if endpoints is not None else (None, to)
+
+            try:
+                http_response, body = await self.session.request_async(method, url, timeout=timeout, **kwargs)
+            except Exception as err:
+                # A front end that cannot be reached is skipped, the request never left.
+                failover = endpoint is not None and isinstance(err, aiohttp.ClientConnectorError)
+                if endpoint is not None:
+                    endpoints.release(endpoint, failover)
+                    tried.append(endpoint)
+                    failover = failover and endpoints.has_alternative(tried)
+                if circuit_breaker is not None:
+                    if failover:
+                        circuit_breaker.release_probe()
+                    else:
+                        circuit_breaker.record_failure()
+                transient = isinstance(err, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+                if permit is not None:
+                    permit.release(error=transient and not failover)
+                if failover:
+                    continue
+                if not transient or retry_policy is None or not retry_policy.can_retry(method, kwargs.get('headers'), attempt):
+                    raise
+                delay = retry_policy.backoff(attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    raise
+                await asyncio.sleep(delay)
+                # Endpoints are only excluded within one failover sweep, a retry may use any.
+                tried = []
+                attempt += 1
+                continue
+            except builtins.BaseException:
+                # Cancelled or interrupted.  (BaseException is the client exception base here.)
+                if circuit_breaker is not None:
+                    circuit_breaker.release_probe()
+                if permit is not None:
+                    permit.release()
+                if endpoint is not None:
+                    endpoints.release(endpoint)
+                raise
+
+            if endpoint is not None:
+                endpoints.release(endpoint)
+
+            if permit is not None:
+                permit.release(http_response.status, http_response.headers.get(OneM2MPrimitive.X_M2M_RSC))
+
+            transient = retry_policy is not None and retry_policy.is_retryable_status(http_response.status)
+
+            if circuit_breaker is not None:
+                if OneM2MRequest._is_throttled(http_response.status, http_response.headers):
+                    # A CSE shedding load is up, throttling counts as neither failure nor success.
+                    circuit_breaker.release_probe()
+                elif transient or http_response.status >= 500:
+                    circuit_breaker.record_failure()
+                else:
+                    circuit_breaker.record_success()
+
+            if not transient or not retry_policy.can_retry(method, kwargs.get('headers'), attempt):
+                return http_response, body
+
+            delay = retry_policy.backoff(attempt, http_response.headers.get(HttpHeader.RETRY_AFTER))
+            if deadline is not None and delay >= deadline.remaining():
+                return http_response, body
+
+            await asyncio.sleep(delay)
+            tried = []
+            attempt += 1
+
+    async def create_async(self, to: str = None, params: Parameters = None, content = None):
+        """Asynchronous OneM2M Create request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            content: A OneM2MResource
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        to, headers = self._prepare_create(to, params)
+        data = self._encode_content(OneM2MOperation.Create, content)
+
+        return await self._send_async('POST', to, headers=headers, data=data)
+
+    async def update_async(self, to=None, params=None, content=None):
+        """Asynchronous OneM2M Update request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            content: A OneM2MResource
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        to, headers = self._prepare_update(to, params)
+        data = self._encode_content(OneM2MOperation.Update, content)
+
+        return await self._send_async('PUT', to, headers=headers, data=data)
+
+    async def retrieve_async(self, to=None, params=None, cached=True):
+        """Asynchronous OneM2M Retrieve request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            cached: Answer from the session's cache and share identical retrieves in flight.
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            RequiredRequestParameterMissingException: If a required parameter is not is not included.
+        """
+        to, headers = self._prepare_retrieve(to, params)
+
+        if not cached:
+            return await self._send_async('GET', to, headers=headers)
+
+        return await self._get_async(to, headers)
+
+    async def delete_async(self, to=None, params=None):
+        """Asynchronous OneM2M Delete request.
+
+        Args:
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+
+        Returns:
+            A OneM2MResponse object.
+        """
+        to, headers = self._prepare_delete(to, params)
+
+        return await self._send_async('DELETE', to, headers=headers)
+
+    async def request_async(self, operation: str, to: str = None, params: Parameters = None, content = None):
+        """Asynchronous OneM2M request for the specified operation.
+
+        Args:
+            operation: The OneM2M operation (Create, Retrieve, Update or Delete).
+            to: Host (Overrides 'to' argument set in constructor.)
+            params: Dict of OneM2MParams (Overrides 'params' argument set in constructor.)
+            content: A OneM2MResource for Create and Update operations.
+
+        Returns:
+            A OneM2MResponse object.
+
+        Raises:
+            InvalidOneM2MOperationException: If the operation is not supported.
+        """
+        if operation == OneM2MOperation.Create:
+            return await self.create_async(to, params, content)
+        elif operation == OneM2MOperation.Retrieve:
+            return await self.retrieve_async(to, params)
+        elif operation == OneM2MOperation.Update:
+            return await self.update_async(to, params, content)
+        elif operation == OneM2MOperation.Delete:
+            return await self.delete_async(to, params)
+
+        raise InvalidOneM2MOperationException('Unsupported operation "{}".'.format(operation))
 
     def _generate_rqi(self):
-        """Generate a random request id.
+        """Generate a unique request id with the session's generator.
 
         Returns:
             str: web.Request id.
         """
-        return str(random.randrange(1000000, 999999999999))
+        if self.session is not None:
+            return self.session.request_id_generator()
+
+        return RequestIdGenerator.DEFAULT()
 
     def get_headers(self):
         return self.headers
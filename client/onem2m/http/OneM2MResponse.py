@@ -8,9 +8,11 @@ from client.onem2m.http.HttpHeader import HttpHeader
 from client.onem2m.OneM2MPrimitive import OneM2MPrimitive, MissingRequiredControlParams
 from client.onem2m.OneM2MOperation import OneM2MOperation
 from client.onem2m.OneM2MResource import OneM2MResource
+from client.onem2m.codec.Codec import Codec
+from client.onem2m.codec.JsonCodec import JsonCodec
 
 from aiohttp import web
-from typing import Mapping, List, Optional
+from typing import Any, Mapping, List, Optional
 
 class OneM2MResponse(OneM2MPrimitive):
     # An exception will be thrown if the http_response object from the requests
@@ -60,29 +62,106 @@ class OneM2MResponse(OneM2MPrimitive):
     cn: Optional[str] = None
     rqi: Optional[str] = None
 
-    def __init__(self, http_response: web.Response):
+    DEFAULT_CODEC: Codec = JsonCodec()
+
+    # Marks a body that has not been decoded yet.
+    _UNDECODED = object()
+
+    # Raw message body and how to decode it.
+    _raw: bytes = b''
+    _codec: Optional[Codec] = None
+    _content_type: Optional[str] = None
+    _pc: Any = None
+
+    def __init__(
+        self, http_response: web.Response, body: Optional[bytes] = None, codec: Codec = None, lazy: bool = False
+    ):
         """Converts HTTP response message to onem2m response primitive.
 
         Args:
-            http_response: requests response instance.
+            http_response: requests or aiohttp client response instance.
+            body: The raw message body.  Required for aiohttp responses, whose body
+                can only be read asynchronously.
+            codec: Codec used to decode the body.  Defaults to JsonCodec, which is also used
+                when the body is JSON but the codec is not.
+            lazy: Decode the body into 'pc' on first access instead of now.  Callers that only
+                check 'rsc' never pay for decoding.
         """
 
         http_response.raise_for_status() # type: ignore
 
         try:
-            self.pc = None
-
             # Map headers to parameters.
             # Raises MissingRequiredControlParams exception if a required control header is missing.
             self._map_http_headers_to_m2m_params(http_response.headers)
 
-            # Store the message body as the Content (pc) param.
-            if http_response.text is not None and 'Content-Type' in http_response.headers and 'json' in http_response.headers['Content-Type']:
-                self.pc = json.loads(http_response.text)
+            # Set after the mapping, which replaces the instance members.
+            # Decode from the raw bytes, not a decoded str copy.
+            self._raw = (body if body is not None else http_response.content) or b''
+            self._codec = codec or OneM2MResponse.DEFAULT_CODEC
+            self._content_type = http_response.headers.get('Content-Type')
+            self._pc = OneM2MResponse._UNDECODED
+
+            if not lazy:
+                self._pc = self._decode()
 
         except Exception as e:
             raise e
 
+    def _decode(self):
+        """Decodes the raw body with the response codec.
+
+        Returns:
+            The decoded content or None if there is no body or it has an unknown format.
+        """
+        # The CSE may answer in another format than requested, fall back to the default codec
+        # in that case.
+        if self._raw and self._content_type is not None:
+            for candidate in (self._codec, OneM2MResponse.DEFAULT_CODEC):
+                if candidate.matches(self._content_type):
+                    return candidate.decode(self._raw)
+
+        return None
+
+    @property
+    def pc(self):
+        """The Content (pc) param, the decoded message body."""
+        if self._pc is OneM2MResponse._UNDECODED:
+            self._pc = self._decode()
+
+        return self._pc
+
+    @pc.setter
+    def pc(self, value):
+        self._pc = value
+
+    @property
+    def raw(self) -> bytes:
+        """The message body as received (empty for responses built from a primitive)."""
+        return self._raw
+
+    @classmethod
+    def from_primitive(cls, primitive: Mapping[str, Any]) -> 'OneM2MResponse':
+        """Builds a response from a serialized response primitive, e.g. the operation result
+           of a <request> resource or the 'm2m:rsp' of a notification.
+
+        Args:
+            primitive: The response primitive members (rsc, rqi, pc, ...).
+
+        Returns:
+            OneM2MResponse: The response.
+        """
+        response = cls.__new__(cls)
+        response.__dict__ = {k: v for k, v in primitive.items() if k != OneM2MResource.M2M_ATTR_PRIMITIVE_CONTENT}
+
+        # Response status codes are kept as strings, like the X-M2M-RSC header.
+        if response.__dict__.get(OneM2MPrimitive.M2M_PARAM_RESPONSE_STATUS_CODE) is not None:
+            response.rsc = str(response.rsc)
+
+        response.pc = primitive.get(OneM2MResource.M2M_ATTR_PRIMITIVE_CONTENT)
+
+        return response
+
     def _map_http_headers_to_m2m_params(self, headers: Mapping[str, str]):
         """Converts HTTP headers onem2m2 response primitive params and stores them
            instance members.
@@ -118,6 +197,12 @@ class OneM2MResponse(OneM2MPrimitive):
         self.__dict__ = onem2m_params
 
 
+    def __str__(self):
+        members = {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
+        members[OneM2MResource.M2M_ATTR_PRIMITIVE_CONTENT] = self.pc
+
+        return json.dumps(members)
+
     def dump(self, name: str):
         
         print('{} Response code: {}'.format(name, self.rsc))
@@ -0,0 +1,90 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+
+from typing import Any, Dict, Optional
+
+
+class PreparedRequest:
+    """A OneM2M request whose URL, query string and static headers are computed once.
+
+    Built by OneM2MRequest.prepare.  Each send only copies the static headers, adds a fresh
+    request identifier (and the deadline) and serializes the content, so sending the same
+    operation to the same target many times skips the parameter mapping and validation.
+    """
+
+    def __init__(
+        self,
+        request: Any,
+        operation: str,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+    ):
+        """Constructor
+
+        Args:
+            request (OneM2MRequest): Request that prepared this one.  Provides the session,
+                codec, timeout and request identifiers.
+            operation (str): The OneM2M operation.
+            method (str): HTTP method.
+            url (str): Target URL, query string included.
+            headers (dict): Headers shared by every send, without the request identifier.
+        """
+        self.request = request
+        self.operation = operation
+        self.method = method
+        self.url = url
+        self.headers = headers
+
+    def _build(self, content) -> Dict[str, Any]:
+        """Per send request arguments: headers with a new request identifier and the body.
+        """
+        headers = dict(self.headers)
+        headers[OneM2MPrimitive.X_M2M_RI] = self.request._generate_rqi()
+
+        kwargs: Dict[str, Any] = {'headers': headers}
+
+        data = self.request._encode_content(self.operation, content)
+        if data is not None:
+            kwargs['data'] = data
+
+        return kwargs
+
+    def send(self, content=None) -> OneM2MResponse:
+        """Synchronously send the request.
+
+        Args:
+            content: A OneM2MResource for Create and Update operations.
+
+        Returns:
+            A OneM2MResponse object.
+        """
+        kwargs = self._build(content)
+
+        if self.method == 'GET':
+            return self.request._get(self.url, **kwargs)
+
+        return self.request._response(self.request._send(self.method, self.url, **kwargs))
+
+    async def send_async(self, content=None) -> OneM2MResponse:
+        """Asynchronously send the request.
+
+        Args:
+            content: A OneM2MResource for Create and Update operations.
+
+        Returns:
+            A OneM2MResponse object.
+        """
+        kwargs = self._build(content)
+
+        if self.method == 'GET':
+            return await self.request._get_async(self.url, **kwargs)
+
+        return await self.request._send_async(self.method, self.url, **kwargs)
+
+    def __repr__(self):
+        return '<PreparedRequest {} {}>'.format(self.method, self.url)
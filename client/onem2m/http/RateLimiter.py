@@ -0,0 +1,159 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, threading, time
+
+from client.onem2m.http.AdaptiveConcurrency import AdaptiveConcurrency
+from client.onem2m.http.Deadline import Deadline
+from client.onem2m.http.TokenBucket import TokenBucket
+from client.exceptions.DeadlineExceededException import DeadlineExceededException
+
+from typing import Collection, Dict, Optional, Tuple
+
+
+class RateLimiter:
+    """Per originator request rate limit and adaptive concurrency for one CSE.
+
+    CSEs throttle per originator, so each originator (X-M2M-Origin) gets its own token
+    bucket, capping its request rate at 'rate', and its own AdaptiveConcurrency limit,
+    which grows while requests succeed and backs off when the CSE answers with a throttling
+    HTTP status (429, 5xx), a throttling response status code or a transport failure.
+    Every attempt, retries included, goes through the limiter.
+    """
+
+    DEFAULT_THROTTLE_STATUS = (429,)
+
+    class Permit:
+        """Admission of one request, released with its outcome."""
+
+        def __init__(self, limiter: 'RateLimiter', concurrency: AdaptiveConcurrency, started_at: float):
+            self.limiter = limiter
+            self.concurrency = concurrency
+            self.started_at = started_at
+            self._released = False
+
+        def release(self, status: Optional[int] = None, rsc: Optional[str] = None, error: bool = False):
+            """Release the permit.
+
+            Args:
+                status: HTTP status of the response.
+                rsc: Response status code of the response.
+                error: The request failed with a transient transport error.
+                    Without status or error the outcome is unknown and leaves the limit unchanged.
+            """
+            if self._released:
+                return
+            self._released = True
+
+            throttled = error or (status is not None and self.limiter.is_throttled(status, rsc))
+            self.concurrency.release(self.started_at, throttled, completed=status is not None)
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        initial_concurrency: float = 4,
+        min_concurrency: float = 1,
+        max_concurrency: float = 100,
+        throttle_status: Collection[int] = DEFAULT_THROTTLE_STATUS,
+        throttle_rsc: Collection[str] = (),
+    ):
+        """Constructor
+
+        Args:
+            rate (float): Requests per second allowed per originator.  No rate limit when None.
+            burst (float): Requests an idle originator may send back to back.  Defaults to
+                one second's worth of requests.
+            initial_concurrency (float): Starting concurrency limit per originator.
+            min_concurrency (float): Lowest concurrency limit.
+            max_concurrency (float): Highest concurrency limit.
+            throttle_status (collection): HTTP statuses signalling throttling, on top of 5xx.
+            throttle_rsc (collection): Response status codes the CSE signals throttling with.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.throttle_status = frozenset(throttle_status)
+        self.throttle_rsc = frozenset(str(rsc) for rsc in throttle_rsc)
+
+        self._originators: Dict[str, Tuple[Optional[TokenBucket], AdaptiveConcurrency]] = {}
+        self._lock = threading.Lock()
+
+    def is_throttled(self, status: int, rsc: Optional[str] = None) -> bool:
+        return status >= 500 or status in self.throttle_status or (rsc is not None and rsc in self.throttle_rsc)
+
+    def _limits(self, originator: str) -> Tuple[Optional[TokenBucket], AdaptiveConcurrency]:
+        with self._lock:
+            limits = self._originators.get(originator)
+
+            if limits is None:
+                bucket = TokenBucket(self.rate, self.burst) if self.rate is not None else None
+                concurrency = AdaptiveConcurrency(
+                    self.initial_concurrency, self.min_concurrency, self.max_concurrency
+                )
+                limits = self._originators[originator] = (bucket, concurrency)
+
+            return limits
+
+    def concurrency(self, originator: str) -> AdaptiveConcurrency:
+        """The adaptive concurrency limit of an originator."""
+        return self._limits(originator)[1]
+
+    def _reserve(self, bucket: Optional[TokenBucket], deadline: Optional[Deadline]) -> float:
+        """Reserve a token, without waiting past the deadline.
+
+        Raises:
+            DeadlineExceededException: If the token is only available after the deadline.
+        """
+        if bucket is None:
+            return 0.0
+
+        delay = bucket.reserve()
+
+        if deadline is not None and delay > deadline.remaining():
+            bucket.refund()
+            raise DeadlineExceededException('Request deadline of {}s exceeded.'.format(deadline.timeout))
+
+        return delay
+
+    def acquire(self, originator: str, deadline: Optional[Deadline] = None) -> 'RateLimiter.Permit':
+        """Wait until the originator may send a request.
+
+        Raises:
+            DeadlineExceededException: If the deadline passes while waiting.
+        """
+        bucket, concurrency = self._limits(originator)
+
+        started_at = concurrency.acquire(deadline)
+
+        try:
+            delay = self._reserve(bucket, deadline)
+        except DeadlineExceededException:
+            concurrency.release(started_at, completed=False)
+            raise
+
+        if delay:
+            time.sleep(delay)
+
+        return RateLimiter.Permit(self, concurrency, started_at)
+
+    async def acquire_async(self, originator: str, deadline: Optional[Deadline] = None) -> 'RateLimiter.Permit':
+        """Asynchronous acquire.
+        """
+        bucket, concurrency = self._limits(originator)
+
+        started_at = await concurrency.acquire_async(deadline)
+        permit = RateLimiter.Permit(self, concurrency, started_at)
+
+        try:
+            delay = self._reserve(bucket, deadline)
+            if delay:
+                await asyncio.sleep(delay)
+        except BaseException:
+            permit.release()
+            raise
+
+        return permit
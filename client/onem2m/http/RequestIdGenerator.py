@@ -0,0 +1,99 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import contextvars, itertools, os, secrets
+
+from contextlib import contextmanager
+
+from typing import Callable, Iterator, Optional
+
+
+class RequestIdGenerator:
+    """Generates unique oneM2M request identifiers (rqi).
+
+    Identifiers are '<prefix>-<n>' where n comes from a per generator counter and the prefix
+    identifies the process: its pid plus random bytes, so workers on different hosts or
+    containers sharing a pid do not collide.  A forked child picks a new prefix.  The counter
+    is an itertools.count, whose increment is atomic, so no lock is taken in threads or tasks.
+
+    Inside a RequestIdGenerator.trace block the trace identifier is prepended,
+    '<trace>.<prefix>-<n>', so responses and notifications can be correlated with the trace.
+    Any callable returning a string can be used instead, see HttpSession.
+    """
+
+    # Trace identifier of the current thread / asyncio task, see RequestIdGenerator.trace.
+    _trace: contextvars.ContextVar = contextvars.ContextVar('onem2m_trace_id', default=None)
+
+    # Bumped in forked children so generators renew their prefix.
+    _fork_generation = 0
+
+    DEFAULT: 'RequestIdGenerator'
+
+    def __init__(self, prefix: str = None, on_generate: Callable[[str, Optional[str]], None] = None):
+        """Constructor
+
+        Args:
+            prefix (str): Fixed instance prefix, without '.'.  It must be unique per process, a
+                forked child keeps it.  Derived from the process when None.
+            on_generate (callable): Called with (rqi, trace id) for every generated identifier,
+                e.g. to record the rqi in a tracing span.
+        """
+        if prefix is not None and '.' in prefix:
+            raise ValueError('Request identifier prefix cannot contain ".".')
+
+        self.fixed_prefix = prefix
+        self.on_generate = on_generate
+        self._counter = itertools.count(1)
+        self._renew_prefix()
+
+    def _renew_prefix(self):
+        self._generation = RequestIdGenerator._fork_generation
+        self.prefix = self.fixed_prefix or '{:x}{}'.format(os.getpid(), secrets.token_hex(3))
+
+    def __call__(self) -> str:
+        if self._generation != RequestIdGenerator._fork_generation:
+            self._renew_prefix()
+
+        rqi = '{}-{}'.format(self.prefix, next(self._counter))
+
+        trace_id = RequestIdGenerator._trace.get()
+        if trace_id is not None:
+            rqi = '{}.{}'.format(trace_id, rqi)
+
+        if self.on_generate is not None:
+            self.on_generate(rqi, trace_id)
+
+        return rqi
+
+    @staticmethod
+    def trace_id(rqi: str) -> Optional[str]:
+        """The trace identifier embedded in a request identifier, if any."""
+        trace_id, separator, _ = str(rqi).rpartition('.')
+        return trace_id if separator else None
+
+    @staticmethod
+    @contextmanager
+    def trace(trace_id: str) -> Iterator[str]:
+        """Embed trace_id in the identifier of every request issued in the block.
+
+        The trace is bound to the current thread or asyncio task.
+
+        Args:
+            trace_id: The trace identifier.
+        """
+        token = RequestIdGenerator._trace.set(str(trace_id))
+        try:
+            yield trace_id
+        finally:
+            RequestIdGenerator._trace.reset(token)
+
+    @staticmethod
+    def _after_fork():
+        RequestIdGenerator._fork_generation += 1
+
+
+RequestIdGenerator.DEFAULT = RequestIdGenerator()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=RequestIdGenerator._after_fork)
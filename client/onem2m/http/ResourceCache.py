@@ -0,0 +1,225 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import threading, time, urllib.parse
+
+from collections import OrderedDict
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpHeader import HttpHeader
+
+from typing import Any, Callable, Dict, Mapping, Optional, Set, Tuple
+
+# (path, query string, originator) identifying a cached retrieve.
+CacheKey = Tuple[str, str, str]
+
+
+class CacheEntry:
+    """A cached retrieve response and the validators used to revalidate it."""
+
+    def __init__(self, response: Any, etag: Optional[str], ttl: float):
+        self.response = response
+        self.etag = etag
+        self.ttl = ttl
+        self.expires_at = time.monotonic() + ttl
+
+        # stateTag and lastModifiedTime of the retrieved resource, if it has them.
+        resource = None
+        pc = response.pc
+        if isinstance(pc, dict) and len(pc) == 1:
+            resource = next(iter(pc.values()))
+
+        self.st = resource.get('st') if isinstance(resource, dict) else None
+        self.lt = resource.get('lt') if isinstance(resource, dict) else None
+
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def refresh(self):
+        """Restart the TTL after a successful revalidation."""
+        self.expires_at = time.monotonic() + self.ttl
+
+
+class ResourceCache:
+    """Client side cache of retrieve responses, keyed by URI, query string and originator.
+
+    Entries younger than 'ttl' are served without a request.  Older entries are revalidated
+    with a conditional retrieve: If-None-Match with the ETag, and the stateTag bigger (stb)
+    or, without a stateTag, the modified since (ms) filter criteria.  The cached response
+    is reused when the CSE answers 304 Not Modified, or with an empty body because the
+    resource does not match the criteria, i.e. has not changed.
+
+    Creates, updates and deletes sent through the same session invalidate the entries of
+    their target.  The least recently used entries are evicted beyond max_entries.  Cached
+    responses are shared, callers must not modify them.
+    """
+
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_TTL         = 5.0
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL, revalidate: bool = True):
+        """Constructor
+
+        Args:
+            max_entries (int): Maximum number of cached responses.
+            ttl (float): Seconds a response is served without contacting the CSE.
+            revalidate (bool): Revalidate expired entries with a conditional retrieve instead of
+                dropping them.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.revalidate = revalidate
+
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+        self._entries: 'OrderedDict[CacheKey, CacheEntry]' = OrderedDict()
+        # Keys per path, for invalidation.
+        self._paths: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(to: str, headers: Mapping[str, str]) -> CacheKey:
+        path, _, query = to.partition('?')
+        return path, query, headers.get(OneM2MPrimitive.X_M2M_ORIGIN, '')
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def put(self, key: CacheKey, response: Any, etag: Optional[str] = None):
+        entry = CacheEntry(response, etag, self.ttl)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._paths.setdefault(key[0], set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget_path(evicted)
+
+    def _forget_path(self, key: CacheKey):
+        keys = self._paths.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._paths[key[0]]
+
+    def invalidate(self, to: str):
+        """Drop every entry of the resource at 'to', whatever the query string and originator."""
+        path = to.partition('?')[0]
+
+        with self._lock:
+            for key in self._paths.pop(path, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def conditional(self, to: str, headers: Dict[str, str], entry: CacheEntry) -> Tuple[str, Dict[str, str], bool]:
+        """Turns a retrieve into a conditional retrieve of an expired entry.
+
+        Returns:
+            The URL and headers to send, and whether the retrieve carries filter criteria
+            (an empty answer then means unchanged).
+        """
+        headers = dict(headers)
+
+        if entry.etag:
+            headers[HttpHeader.IF_NONE_MATCH] = entry.etag
+
+        query = urllib.parse.parse_qs(to.partition('?')[2])
+
+        # Filter criteria only apply to plain retrieves, not to discovery.
+        criteria = None
+        if 'fu' not in query:
+            if entry.st is not None:
+                criteria = ('stb', entry.st)
+            elif entry.lt is not None:
+                criteria = ('ms', entry.lt)
+
+        if criteria is None:
+            return to, headers, False
+
+        to += '&' if '?' in to else '?'
+        to += 'fu={}&{}={}'.format(
+            OneM2MPrimitive.M2M_FILTER_USAGE.ConditionalRetrieval.value,
+            criteria[0],
+            urllib.parse.quote(str(criteria[1])),
+        )
+
+        return to, headers, True
+
+    def lookup(self, to: str, headers: Dict[str, str]) -> Tuple[CacheKey, Optional[CacheEntry], str, Dict[str, str], bool]:
+        """Finds the entry of a retrieve and builds the request to send, if any.
+
+        Returns:
+            The cache key, the cached entry (None on a miss), the URL and headers to send,
+            and whether the request is conditional.  A fresh entry needs no request.
+        """
+        key = ResourceCache.key(to, headers)
+        entry = self.get(key)
+
+        if entry is not None and entry.fresh():
+            self.hits += 1
+            return key, entry, to, headers, False
+
+        if entry is None or not self.revalidate:
+            self.misses += 1
+            return key, None, to, headers, False
+
+        self.revalidations += 1
+        to, headers, conditional = self.conditional(to, headers, entry)
+
+        return key, entry, to, headers, conditional
+
+    def resolve(
+        self,
+        key: CacheKey,
+        entry: Optional[CacheEntry],
+        status: int,
+        etag: Optional[str],
+        conditional: bool,
+        build: Callable[[], Any],
+    ) -> Any:
+        """Maps the answer to a (conditional) retrieve to the response to return, caching it.
+
+        Args:
+            key: The cache key.
+            entry: The revalidated entry, None on a miss.
+            status: HTTP status of the answer.
+            etag: ETag of the answer.
+            conditional: Whether the retrieve carried filter criteria.
+            build: Builds the OneM2MResponse of the answer.
+
+        Returns:
+            OneM2MResponse: The cached response if unchanged, otherwise the new one.
+        """
+        if entry is not None and status == 304:
+            entry.refresh()
+            return entry.response
+
+        response = build()
+
+        if entry is not None and conditional and not response.raw:
+            entry.refresh()
+            return entry.response
+
+        if response.rsc == OneM2MPrimitive.M2M_RSC_OK:
+            self.put(key, response, etag)
+        else:
+            self.invalidate(key[0])
+
+        return response
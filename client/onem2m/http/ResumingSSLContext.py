@@ -0,0 +1,144 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import ssl, threading, time, weakref
+
+from typing import Dict, Optional
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """Client SSLContext that resumes the last TLS session of each server.
+
+    Every connection wrapped by the context offers the most recent session (TLS 1.2 session
+    id or TLS 1.3 ticket) negotiated with the same server name, so reconnects skip the full
+    handshake while the certificate chain of the original handshake stays verified.  Works
+    for blocking sockets (requests) and memory BIOs (asyncio / aiohttp).
+    """
+
+    def __new__(cls, protocol: int = ssl.PROTOCOL_TLS_CLIENT, *args, **kwargs):
+        return super().__new__(cls, protocol, *args, **kwargs)
+
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT):
+        super().__init__()
+
+        self.sslsocket_class = _ResumingSSLSocket
+        self.sslobject_class = _ResumingSSLObject
+
+        # Number of handshakes and of those that resumed a session.
+        self.handshakes = 0
+        self.resumed = 0
+
+        self._sessions: Dict[str, ssl.SSLSession] = {}
+        # Open connections per server, whose session may have been updated by a ticket.
+        self._connections: Dict[str, weakref.WeakSet] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, server_hostname: Optional[str]) -> Optional[ssl.SSLSession]:
+        """The most recent resumable session of server_hostname."""
+        if server_hostname is None:
+            return None
+
+        with self._lock:
+            for connection in list(self._connections.get(server_hostname, ())):
+                self._remember_locked(server_hostname, connection.session)
+
+            session = self._sessions.get(server_hostname)
+
+            if session is not None and session.time + session.timeout <= time.time():
+                del self._sessions[server_hostname]
+                session = None
+
+            return session
+
+    def _remember(self, server_hostname: Optional[str], session: Optional[ssl.SSLSession]):
+        with self._lock:
+            self._remember_locked(server_hostname, session)
+
+    def _remember_locked(self, server_hostname: Optional[str], session: Optional[ssl.SSLSession]):
+        if server_hostname is None or session is None:
+            return
+
+        current = self._sessions.get(server_hostname)
+        if current is None or session.time >= current.time:
+            self._sessions[server_hostname] = session
+
+    def _on_handshake(self, connection):
+        with self._lock:
+            self.handshakes += 1
+            if connection.session_reused:
+                self.resumed += 1
+
+            self._remember_locked(connection.server_hostname, connection.session)
+            self._connections.setdefault(connection.server_hostname, weakref.WeakSet()).add(connection)
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True, suppress_ragged_eofs=True,
+                    server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = self._session(server_hostname)
+
+        return super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = self._session(server_hostname)
+
+        return super().wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname, session=session
+        )
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    """Reports handshakes to its ResumingSSLContext, and the session once the first data is read.
+
+    TLS 1.3 servers send the session ticket after the handshake, it is processed by the first
+    read (recv and recv_into read through read).
+    """
+
+    _read_once = False
+
+    def do_handshake(self, block=False):
+        super().do_handshake(block)
+
+        if not self.server_side:
+            self.context._on_handshake(self)
+
+    def read(self, len=1024, buffer=None):
+        data = super().read(len, buffer)
+
+        if not self._read_once and not self.server_side:
+            self._read_once = True
+            self.context._remember(self.server_hostname, self.session)
+
+        return data
+
+
+class _ResumingSSLObject(ssl.SSLObject):
+    """Reports handshakes to its ResumingSSLContext, and the session once the first data is read.
+
+    TLS 1.3 servers send the session ticket after the handshake, it is processed by the first read.
+    """
+
+    _read_once = False
+
+    def do_handshake(self):
+        super().do_handshake()
+
+        if not self.server_side:
+            self.context._on_handshake(self)
+
+    def read(self, len=1024, buffer=None):
+        data = super().read(len, buffer)
+
+        if not self._read_once and not self.server_side:
+            self._read_once = True
+            self.context._remember(self.server_hostname, self.session)
+
+        return data
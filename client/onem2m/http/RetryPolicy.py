@@ -0,0 +1,97 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import random
+
+from typing import Mapping, Optional, Tuple
+
+
+class RetryPolicy:
+    """Retry rules for transient request failures.
+
+    Retrieve (GET) and Delete (DELETE) are idempotent and are retried freely.  Create (POST)
+    and Update (PUT) are retried unless retry_create is False.  Every request carries a request
+    identifier, generated when the caller sets none, which stays the same across attempts so
+    the CSE can recognise a repeated request.
+
+    Delays follow exponential backoff with full jitter: attempt n sleeps a random time in
+    [0, min(backoff_max, backoff_base * 2^n)].  A Retry-After header on the failed response
+    takes precedence, capped at backoff_max.
+    """
+
+    IDEMPOTENT_METHODS: Tuple[str, ...] = ('GET', 'DELETE', 'HEAD', 'OPTIONS')
+
+    # Too Many Requests, Bad Gateway, Service Unavailable, Gateway Timeout.
+    DEFAULT_RETRY_STATUSES: Tuple[int, ...] = (429, 502, 503, 504)
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        retry_statuses: Tuple[int, ...] = DEFAULT_RETRY_STATUSES,
+        retry_create: bool = True,
+        jitter: bool = True,
+    ):
+        """Constructor
+
+        Args:
+            max_retries (int): Retries after the first attempt.
+            backoff_base (float): Delay in seconds before the first retry (before jitter).
+            backoff_max (float): Upper bound of any single delay in seconds.
+            retry_statuses (tuple): HTTP status codes treated as transient.
+            retry_create (bool): Retry Create/Update requests.
+            jitter (bool): Randomise delays to avoid synchronised retry storms.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.retry_create = retry_create
+        self.jitter = jitter
+        self._random = random.Random()
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def can_retry(self, method: str, headers: Optional[Mapping[str, str]], attempt: int) -> bool:
+        """Determine if a failed attempt may be repeated.
+
+        Args:
+            method: HTTP method of the request.
+            headers: Request headers, for policies that look at the request.
+            attempt: Number of attempts already retried (0 after the first failure).
+
+        Returns:
+            True if the request should be sent again.
+        """
+        if attempt >= self.max_retries:
+            return False
+
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            return True
+
+        # Every attempt of a request reuses its rqi, so a CSE can spot a repeated Create/Update.
+        return self.retry_create
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts already retried.
+            retry_after: Retry-After header of the failed response, if any.
+
+        Returns:
+            Seconds to wait.
+        """
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.backoff_max)
+            except ValueError:
+                # HTTP-date form is not supported, fall back to backoff.
+                pass
+
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+
+        return self._random.uniform(0, delay) if self.jitter else delay
@@ -0,0 +1,108 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, concurrent.futures, threading
+
+from client.onem2m.http.Deadline import Deadline
+from client.exceptions.DeadlineExceededException import DeadlineExceededException
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one.
+
+    The first caller for a key runs the call, callers arriving while it is in flight wait
+    for it and receive the same result or exception.  Blocking calls are shared between
+    threads, asynchronous calls between the tasks of an event loop.  Nothing is kept once
+    the call completes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, concurrent.futures.Future] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        # Number of calls answered by another caller's call.
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], deadline: Optional[Deadline] = None) -> Any:
+        """Run fn, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identifies identical calls.
+            fn: The call.
+            deadline: Deadline of the caller, bounds the wait for an in-flight call.
+
+        Returns:
+            The result of fn.
+
+        Raises:
+            DeadlineExceededException: If the in-flight call outlasts the deadline.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            try:
+                return future.result(deadline.remaining() if deadline is not None else None)
+            except concurrent.futures.TimeoutError:
+                if future.done():
+                    # The shared call itself timed out.
+                    raise
+                raise DeadlineExceededException('Request deadline of {}s exceeded.'.format(deadline.timeout))
+
+        try:
+            result = fn()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]], deadline: Optional[Deadline] = None
+    ) -> Any:
+        """Asynchronous do.  The shared call runs in its own task, so cancelling one caller
+           does not cancel it for the others.
+
+        Raises:
+            DeadlineExceededException: If the in-flight call outlasts the deadline.
+        """
+        loop_key = (asyncio.get_running_loop(), key)
+
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            leader = task is None
+            if leader:
+                task = self._tasks[loop_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._forget(loop_key))
+            else:
+                self.shared += 1
+
+        shared = asyncio.shield(task)
+
+        if leader or deadline is None:
+            return await shared
+
+        try:
+            return await asyncio.wait_for(shared, deadline.remaining())
+        except asyncio.TimeoutError:
+            if task.done():
+                # The shared call itself timed out.
+                raise
+            raise DeadlineExceededException('Request deadline of {}s exceeded.'.format(deadline.timeout))
+
+    def _forget(self, loop_key):
+        with self._lock:
+            self._tasks.pop(loop_key, None)
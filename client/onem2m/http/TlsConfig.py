@@ -0,0 +1,88 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import ssl, threading
+
+from requests import certs
+
+from client.onem2m.http.ResumingSSLContext import ResumingSSLContext
+
+from typing import Optional
+
+
+class TlsConfig:
+    """TLS settings of the connections to a CSE.
+
+    Builds a single verified ResumingSSLContext, shared by every connection of the CSE's
+    session, blocking and asynchronous.  The trust store and client certificate are loaded
+    once instead of per connection, and reconnects resume the previous TLS session instead
+    of running a full handshake.
+    """
+
+    def __init__(
+        self,
+        ca_file: Optional[str] = None,
+        ca_path: Optional[str] = None,
+        ca_data: Optional[str] = None,
+        cert_file: Optional[str] = None,
+        key_file: Optional[str] = None,
+        key_password: Optional[str] = None,
+        verify: bool = True,
+        check_hostname: bool = True,
+        minimum_version: ssl.TLSVersion = ssl.TLSVersion.TLSv1_2,
+    ):
+        """Constructor
+
+        Args:
+            ca_file (str): PEM file of the CAs trusted to sign the CSE certificate.
+            ca_path (str): Directory of trusted CA certificates.
+            ca_data (str): PEM encoded trusted CA certificates.
+                Without ca_file, ca_path and ca_data the CA bundle of requests (certifi) is trusted.
+            cert_file (str): PEM file of the client certificate (chain), for CSEs that
+                authenticate the AE with TLS.
+            key_file (str): Private key of the client certificate, if not in cert_file.
+            key_password (str): Password of the private key.
+            verify (bool): Verify the CSE certificate.  Only disable against test CSEs.
+            check_hostname (bool): Match the CSE certificate against the host name.
+            minimum_version (ssl.TLSVersion): Oldest TLS version accepted.
+        """
+        self.ca_file = ca_file
+        self.ca_path = ca_path
+        self.ca_data = ca_data
+        self.cert_file = cert_file
+        self.key_file = key_file
+        self.key_password = key_password
+        self.verify = verify
+        self.check_hostname = check_hostname and verify
+        self.minimum_version = minimum_version
+
+        self._context: Optional[ResumingSSLContext] = None
+        self._lock = threading.Lock()
+
+    def _build_context(self) -> ResumingSSLContext:
+        context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.minimum_version = self.minimum_version
+
+        if self.verify:
+            if self.ca_file is None and self.ca_path is None and self.ca_data is None:
+                context.load_verify_locations(cafile=certs.where())
+            else:
+                context.load_verify_locations(cafile=self.ca_file, capath=self.ca_path, cadata=self.ca_data)
+
+        context.check_hostname = self.check_hostname
+        context.verify_mode = ssl.CERT_REQUIRED if self.verify else ssl.CERT_NONE
+
+        if self.cert_file is not None:
+            context.load_cert_chain(self.cert_file, self.key_file, self.key_password)
+
+        return context
+
+    def context(self) -> ResumingSSLContext:
+        """The SSLContext of the CSE connections, built on first use.
+        """
+        with self._lock:
+            if self._context is None:
+                self._context = self._build_context()
+
+            return self._context
@@ -0,0 +1,52 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import threading, time
+
+
+class TokenBucket:
+    """Token bucket holding up to 'burst' tokens, refilled at 'rate' tokens per second.
+
+    Callers reserve a token and wait the delay returned.  Reservations may overdraw the
+    bucket, so waiting callers are served in order and the long term rate never exceeds
+    'rate'.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """Constructor
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (float): Bucket capacity, the number of requests that may be sent back to back.
+        """
+        if rate <= 0:
+            raise ValueError('Token bucket rate must be positive.')
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token.
+
+        Returns:
+            Seconds to wait before using it.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self):
+        """Return a reserved token that was not used."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
@@ -1,5 +1,7 @@
 from client.onem2m.OneM2MResource import OneM2MResource, OneM2MResourceContent
 
+from typing import Any, Dict, Optional
+
 
 # {
 #     "sub": {
@@ -17,8 +19,37 @@ class Subscription(OneM2MResource):
     M2M_ATTR_EVENT_NOTIFICATION_CRITERIA = 'm2m:enc'
     M2M_ATTR_NOTIFICATION_URI            = 'nu'
     M2M_ATTR_NCT                         = 'nct'     # @note can not find in docs.
+    M2M_ATTR_BATCH_NOTIFY                = 'bn'
+    M2M_ATTR_BATCH_NOTIFY_NUMBER         = 'num'
+    M2M_ATTR_BATCH_NOTIFY_DURATION       = 'dur'
 
     def __init__(self, subscription: OneM2MResourceContent):
         """
         """
         super().__init__('m2m:sub', subscription)
+
+    @staticmethod
+    def batch_notify(size: Optional[int] = None, duration: Optional[float] = None) -> Dict[str, Any]:
+        """The batchNotify ('bn') attribute, asking the CSE to aggregate notifications.
+
+        The CSE sends an 'm2m:agn' once size notifications are pending or duration seconds
+        after the first one.
+
+        Args:
+            size: Notifications per aggregated notification.
+            duration: Seconds the CSE may hold a notification back.
+
+        Returns:
+            The 'bn' attribute value.
+        """
+        bn: Dict[str, Any] = {}
+
+        if size is not None:
+            bn[Subscription.M2M_ATTR_BATCH_NOTIFY_NUMBER] = size
+
+        if duration is not None:
+            # xs:duration, which has no exponent form.
+            seconds = '{:f}'.format(duration).rstrip('0').rstrip('.')
+            bn[Subscription.M2M_ATTR_BATCH_NOTIFY_DURATION] = 'PT{}S'.format(seconds)
+
+        return bn
@@ -0,0 +1,66 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, inspect
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+from client.onem2m.resource.ContentInstance import ContentInstance
+from client.exceptions.InvalidArgumentException import InvalidArgumentException
+
+from tests.FakeCSE import FakeCSE
+
+
+class AsyncCSETests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = await FakeCSE().start()
+        self.cse = AsyncCSE(self.fake.host, self.fake.port)
+        self.cse.ae = AE({'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'})
+
+    async def asyncTearDown(self):
+        await self.cse.close()
+        await self.fake.close()
+
+    def test_mirrors_cse_surface(self):
+        """AsyncCSE exposes every public CSE request method as a coroutine or async generator."""
+        print(self.shortDescription())
+
+        for name, member in inspect.getmembers(CSE, inspect.isfunction):
+            if name.startswith('_') or name in ('get_to', 'deadline', 'resource', 'submit', 'map'):
+                continue
+            member = getattr(AsyncCSE, name)
+            self.assertTrue(
+                inspect.iscoroutinefunction(member) or inspect.isasyncgenfunction(member),
+                '{} is not a coroutine'.format(name),
+            )
+
+        # Not a CSE: the blocking thread pool API is not inherited.
+        self.assertNotIsInstance(self.cse, CSE)
+        self.assertFalse(hasattr(self.cse, 'submit'))
+
+    async def test_concurrent_requests(self):
+        """Concurrent AsyncCSE calls run on the event loop and return OneM2MResponse objects."""
+        print(self.shortDescription())
+
+        responses = await asyncio.gather(
+            *[self.cse.create_content_instance('/PN_CSE/cnt', ContentInstance({'con': i})) for i in range(20)],
+            self.cse.retrieve_resource('/PN_CSE/cnt', OneM2MPrimitive.M2M_RESOURCE_TYPES.Container.value),
+            self.cse.delete_resource('/PN_CSE/cnt'),
+        )
+
+        self.assertTrue(all(isinstance(r, OneM2MResponse) for r in responses))
+        self.assertEqual(len(self.fake.received), 22)
+        self.assertEqual(
+            sorted(r.method for r in self.fake.received), ['DELETE', 'GET'] + ['POST'] * 20
+        )
+
+    async def test_registration_with_invalid_arg(self):
+        """AE registration fails with non AE instance argument."""
+        print(self.shortDescription())
+
+        with self.assertRaises(InvalidArgumentException):
+            await self.cse.register_ae('blah')
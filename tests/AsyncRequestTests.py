@@ -0,0 +1,98 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+
+class AsyncRequestTests(unittest.IsolatedAsyncioTestCase):
+    """Asynchronous request engine tests against a local aiohttp server.
+    """
+
+    async def asyncSetUp(self):
+        self.received = []
+
+        async def handler(req: web.Request):
+            body = await req.read()
+            self.received.append((req.method, req.path_qs, dict(req.headers), body))
+
+            return web.json_response(
+                {'m2m:cin': {'con': 'ok'}},
+                content_type=OneM2MPrimitive.CONTENT_TYPE_JSON,
+                headers={
+                    OneM2MPrimitive.X_M2M_ORIGIN: 'CSE',
+                    OneM2MPrimitive.X_M2M_RI: req.headers[OneM2MPrimitive.X_M2M_RI],
+                    OneM2MPrimitive.X_M2M_RSC: OneM2MPrimitive.M2M_RSC_OK,
+                },
+            )
+
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handler)
+
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = HttpSession()
+
+    async def asyncTearDown(self):
+        await self.session.close_async()
+        await self.server.close()
+
+    def url(self, path: str):
+        return str(self.server.make_url(path))
+
+    async def test_create_async(self):
+        """create_async(): Sends a POST with mapped headers and returns a OneM2MResponse."""
+        print(self.shortDescription())
+
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: 'C123',
+            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value,
+        }
+
+        req = OneM2MRequest(session=self.session)
+        res = await req.create_async(self.url('/PN_CSE/cnt'), params, ContentInstance({'con': 'value'}))
+
+        self.assertIsInstance(res, OneM2MResponse)
+        self.assertEqual(res.rsc, OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(res.pc, {'m2m:cin': {'con': 'ok'}})
+
+        method, path_qs, headers, body = self.received[0]
+        self.assertEqual(method, 'POST')
+        self.assertEqual(path_qs, '/PN_CSE/cnt')
+        self.assertEqual(headers['Content-Type'], OneM2MPrimitive.CONTENT_TYPE_JSON + '; ty=4')
+        self.assertEqual(headers[OneM2MPrimitive.X_M2M_ORIGIN], 'C123')
+        self.assertEqual(json.loads(body), {'m2m:cin': {'con': 'value'}})
+
+    async def test_request_without_session(self):
+        """retrieve_async() without a session sends a one-shot request."""
+        print(self.shortDescription())
+
+        res = await OneM2MRequest().retrieve_async(self.url('/PN_CSE/cnt'), {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'})
+
+        self.assertEqual(res.rsc, OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(res.pc, {'m2m:cin': {'con': 'ok'}})
+        self.assertEqual(self.received[0][0], 'GET')
+
+    async def test_all_operations_share_session(self):
+        """retrieve_async/update_async/delete_async reuse one long-lived ClientSession."""
+        print(self.shortDescription())
+
+        params = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+        req = OneM2MRequest(session=self.session)
+
+        await req.retrieve_async(self.url('/PN_CSE/cnt'), dict(params))
+        client_session = self.session.async_session
+        await req.update_async(self.url('/PN_CSE/cnt'), dict(params), ContentInstance({'con': 'x'}))
+        await req.delete_async(self.url('/PN_CSE/cnt'), dict(params))
+
+        self.assertIs(self.session.async_session, client_session)
+        self.assertEqual([r[0] for r in self.received], ['GET', 'PUT', 'DELETE'])
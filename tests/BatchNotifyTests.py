@@ -0,0 +1,132 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, json
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from client.ae.AE import AE
+from client.ae.AsyncResponseListener import AsyncResponseListenerFactory
+from client.ae.Notification import Notification
+from client.ae.NotificationDispatcher import NotificationDispatcher
+from client.cse.CSE import CSE
+from client.onem2m.resource.Subscription import Subscription
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+def sgn(sur: str, i: int) -> dict:
+    return {'sur': sur, 'nev': {'net': 3, 'rep': {'m2m:cin': {'con': i}}}}
+
+
+def con(n: Notification):
+    return n.representation['m2m:cin']['con']
+
+
+class BatchNotifyTests(unittest.TestCase):
+    def test_create_subscription(self):
+        """create_subscription(): Batch size and duration are sent as batchNotify."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+        cse = CSE(fake.host, fake.port)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            cse.create_subscription('/PN_CSE/cnt', 'sub', 'http://ae:8080/notify', batch_size=100, batch_duration=2.5)
+            cse.create_subscription('/PN_CSE/cnt', 'sub2', 'http://ae:8080/notify')
+        finally:
+            cse.close()
+            fake.stop_thread()
+
+        batched, plain = [json.loads(b)['m2m:sub'] for b in fake.bodies]
+        self.assertEqual(batched['bn'], {'num': 100, 'dur': 'PT2.5S'})
+        self.assertNotIn('bn', plain)
+        self.assertIn('ty=23', fake.received[0].headers['Content-Type'])
+
+
+    def test_duration_format(self):
+        """Subscription.batch_notify(): The duration is a fixed-point xs:duration."""
+        print(self.shortDescription())
+
+        self.assertEqual(Subscription.batch_notify(duration=1e6), {'dur': 'PT1000000S'})
+        self.assertEqual(Subscription.batch_notify(duration=86400.25), {'dur': 'PT86400.25S'})
+        self.assertEqual(Subscription.batch_notify(duration=0.001), {'dur': 'PT0.001S'})
+        self.assertEqual(Subscription.batch_notify(duration=30), {'dur': 'PT30S'})
+
+
+class AggregatedNotificationTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.listener = AsyncResponseListenerFactory().get_instance()
+        self.listener.dispatcher = NotificationDispatcher()
+        self.client = TestClient(TestServer(self.listener._application()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        for sur in ('/sub-a', '/sub-b'):
+            self.listener.remove_notification_cb(sur)
+        await self.listener.dispatcher.close()
+        await self.client.close()
+
+    async def _notify_aggregated(self, sgns):
+        return await self.client.post('/notify', json={'m2m:agn': {'m2m:sgn': sgns}})
+
+    async def test_dispatch(self):
+        """Aggregated notifications reach batch callbacks as one list per subscription."""
+        print(self.shortDescription())
+
+        batches, singles = [], []
+        self.listener.set_notification_cb('/sub-a', batches.append, batch=True)
+        self.listener.set_notification_cb('/sub-b', singles.append)
+
+        res = await self._notify_aggregated([sgn('/sub-a', 0), sgn('/sub-b', 1), sgn('/sub-a', 2), sgn('/sub-c', 3)])
+        await self.listener.dispatcher.join()
+
+        self.assertEqual(res.status, 200)
+        self.assertEqual([[con(n) for n in batch] for batch in batches], [[0, 2]])
+        self.assertEqual([con(n) for n in singles], [1])
+        self.assertEqual(self.listener.dispatcher.accepted, 2)
+
+    async def test_single_notification_batch(self):
+        """Batch callbacks get a list for plain notifications too."""
+        print(self.shortDescription())
+
+        batches = []
+        self.listener.set_notification_cb('/sub-a', batches.append, batch=True)
+
+        await self.client.post('/notify', json={'m2m:sgn': sgn('/sub-a', 0)})
+        await self._notify_aggregated(sgn('/sub-a', 1))
+        await self.listener.dispatcher.join()
+
+        self.assertEqual([[con(n) for n in batch] for batch in batches], [[0], [1]])
+
+    async def test_stream(self):
+        """Streams unpack aggregated notifications."""
+        print(self.shortDescription())
+
+        stream = self.listener.stream('/sub-a', batch=500, timeout=0.2)
+        await self._notify_aggregated([sgn('/sub-a', i) for i in range(300)])
+        await self._notify_aggregated([sgn('/sub-a', i) for i in range(300, 600)])
+
+        batches = [[con(n) for n in await stream.__anext__()] for _ in range(2)]
+
+        self.assertEqual([len(batch) for batch in batches], [500, 100])
+        self.assertEqual(sum(batches, []), list(range(600)))
+
+    async def test_reject_whole_request(self):
+        """An aggregated notification that does not fit the queue is rejected as a whole."""
+        print(self.shortDescription())
+
+        dispatcher = self.listener.dispatcher = NotificationDispatcher(queue_size=2)
+        singles = []
+        self.listener.set_notification_cb('/sub-b', singles.append)
+
+        res = await self._notify_aggregated([sgn('/sub-b', i) for i in range(3)])
+        await dispatcher.join()
+
+        self.assertEqual(res.status, 503)
+        self.assertEqual(singles, [])
+        self.assertEqual(dispatcher.rejected, 3)
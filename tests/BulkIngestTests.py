@@ -0,0 +1,92 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, json
+
+from aiohttp import web
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class EchoCSE(FakeCSE):
+    """Echoes the created content back and tracks the peak number of requests in flight."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+        self.responder = self.echo
+
+    async def echo(self, req: web.Request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        cin = json.loads(await req.read())['m2m:cin']
+        if cin['con'] == 'fail':
+            return web.Response(status=500)
+
+        return self.reply(req, {'m2m:cin': cin}, OneM2MPrimitive.M2M_RSC_CREATED, 201)
+
+
+class BulkIngestTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = EchoCSE().start_in_thread()
+        self.cse = CSE(self.fake.host, self.fake.port)
+        self.cse.ae = AE(dict(AE_ATTRIBUTES))
+
+    def tearDown(self):
+        self.cse.close()
+        self.fake.stop_thread()
+
+    def test_results_in_order_with_bounded_concurrency(self):
+        """create_content_instances(): Returns per item results in order without exceeding concurrency."""
+        print(self.shortDescription())
+
+        items = (('/PN_CSE/cnt', i) for i in range(40))
+
+        result = self.cse.create_content_instances(items, concurrency=5)
+
+        self.assertEqual(result.succeeded, 40)
+        self.assertEqual(result.failed, 0)
+        self.assertEqual([r.pc['m2m:cin']['con'] for r in result.results], list(range(40)))
+        self.assertLessEqual(self.fake.peak, 5)
+        self.assertGreater(result.throughput, 0)
+
+    def test_failures_are_reported(self):
+        """create_content_instances(): Failed items are reported without stopping the batch."""
+        print(self.shortDescription())
+
+        items = [('/PN_CSE/cnt', 'ok'), ('/PN_CSE/cnt', 'fail'), ('/PN_CSE/cnt', 'ok')]
+
+        result = self.cse.create_content_instances(items, concurrency=2)
+
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual(result.failures, [1])
+        self.assertIsInstance(result.results[1], Exception)
+
+    def test_async_iterable(self):
+        """AsyncCSE.create_content_instances(): Accepts an async iterable of items."""
+        print(self.shortDescription())
+
+        async def items():
+            for i in range(10):
+                yield '/PN_CSE/cnt', i
+
+        async def run():
+            async with AsyncCSE(self.fake.host, self.fake.port) as cse:
+                cse.ae = AE(dict(AE_ATTRIBUTES))
+                return await cse.create_content_instances(items(), concurrency=3)
+
+        result = asyncio.run(run())
+
+        self.assertEqual([r.pc['m2m:cin']['con'] for r in result.results], list(range(10)))
@@ -0,0 +1,97 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, threading, time
+
+from concurrent.futures import wait
+
+from client.cse.CSE import CSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.Deadline import Deadline
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class CSEThreadingTests(unittest.TestCase):
+    def setUp(self):
+        self.cse = CSE('localhost', 8100, max_workers=8)
+
+    def tearDown(self):
+        self.cse.close()
+
+    def test_params_not_modified(self):
+        """Requests leave the caller's and the default params untouched."""
+        print(self.shortDescription())
+
+        params = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+
+        to, resolved = OneM2MRequest()._resolve_params('http://localhost:8100/PN_CSE', params)
+
+        self.assertEqual(params, {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'})
+        self.assertIn(OneM2MPrimitive.M2M_PARAM_REQUEST_IDENTIFIER, resolved)
+        self.assertEqual(OneM2MRequest().params, {})
+        self.assertIsNot(OneM2MRequest().params, OneM2MRequest().params)
+
+    def test_submit(self):
+        """submit(): Runs on the pool in the caller's context."""
+        print(self.shortDescription())
+
+        with Deadline.scope(60) as deadline:
+            future = self.cse.submit(lambda x: (threading.current_thread().name, Deadline.current(), x), 1)
+
+        name, current, x = future.result()
+
+        self.assertTrue(name.startswith('onem2m-cse'))
+        self.assertIs(current, deadline)
+        self.assertEqual(x, 1)
+
+    def test_map_bounded(self):
+        """map(): Returns futures in order and runs at most 'workers' calls at once."""
+        print(self.shortDescription())
+
+        lock = threading.Lock()
+        state = {'in_flight': 0, 'peak': 0}
+
+        def call(a, b):
+            with lock:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+            time.sleep(0.01)
+            with lock:
+                state['in_flight'] -= 1
+            if a == 3:
+                raise ValueError(a)
+            return a + b
+
+        futures = self.cse.map(call, range(10), range(10), workers=3)
+        wait(futures)
+
+        self.assertLessEqual(state['peak'], 3)
+        self.assertIsInstance(futures[3].exception(), ValueError)
+        self.assertEqual([f.result() for i, f in enumerate(futures) if i != 3], [2 * i for i in range(10) if i != 3])
+
+    def test_concurrent_requests(self):
+        """Requests from many threads reach the CSE with distinct identifiers."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+        cse = CSE(fake.host, fake.port, max_workers=8)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            futures = cse.map(
+                cse.create_content_instance, ['/PN_CSE/cnt'] * 40, [ContentInstance({'con': i}) for i in range(40)]
+            )
+            responses = [f.result() for f in futures]
+        finally:
+            cse.close()
+            fake.stop_thread()
+
+        self.assertTrue(all(r.rsc == OneM2MPrimitive.M2M_RSC_CREATED for r in responses))
+        self.assertEqual(len({r.headers[OneM2MPrimitive.X_M2M_RI] for r in fake.received}), 40)
@@ -0,0 +1,137 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, json
+
+from client.cse.CSE import CSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.codec.Codec import Codec
+from client.onem2m.codec.JsonCodec import JsonCodec
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from tests.FakeCSE import FakeCSE
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.encoded = []
+        self.decoded = []
+
+    def encode(self, obj):
+        data = super().encode(obj)
+        self.encoded.append(data)
+        return data
+
+    def decode(self, data):
+        self.decoded.append(data)
+        return super().decode(data)
+
+
+class CodecTests(unittest.TestCase):
+    def test_codec_is_abstract(self):
+        """Codec: Cannot be instantiated without encode, decode and matches."""
+        print(self.shortDescription())
+
+        with self.assertRaises(TypeError):
+            Codec()
+
+    def test_json_codec_round_trip(self):
+        """JsonCodec: Encodes to compact UTF-8 bytes and decodes from bytes."""
+        print(self.shortDescription())
+
+        codec = JsonCodec()
+        obj = {'m2m:cin': {'con': 'température', 'cs': 4}}
+
+        data = codec.encode(obj)
+
+        self.assertIsInstance(data, bytes)
+        self.assertNotIn(b' ', data)
+        self.assertEqual(codec.decode(data), obj)
+        self.assertTrue(codec.matches(OneM2MPrimitive.CONTENT_TYPE_JSON))
+
+    def test_orjson_codec(self):
+        """OrjsonCodec: Is a drop-in replacement for JsonCodec."""
+        print(self.shortDescription())
+
+        try:
+            from client.onem2m.codec.OrjsonCodec import OrjsonCodec
+            codec = OrjsonCodec()
+        except ImportError:
+            self.skipTest('orjson is not installed')
+
+        obj = {'m2m:cin': {'con': [1, 2, 3]}}
+        self.assertEqual(json.loads(codec.encode(obj)), obj)
+        self.assertEqual(codec.decode(JsonCodec().encode(obj)), obj)
+
+    def test_cse_codec(self):
+        """CSE(codec=...): The configured codec serializes requests and parses responses from raw bytes."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+        self.addCleanup(fake.stop_thread)
+
+        codec = CountingCodec()
+        cse = CSE(fake.host, fake.port, codec=codec)
+        cse.ae = AE({'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'})
+        self.addCleanup(cse.close)
+
+        res = cse.create_content_instance('/PN_CSE/cnt', ContentInstance({'con': 1}))
+
+        self.assertEqual(codec.encoded, [fake.bodies[0]])
+        self.assertEqual(len(codec.decoded), 1)
+        self.assertIsInstance(codec.decoded[0], bytes)
+        self.assertEqual(res.pc, {'m2m:cin': {'ri': 'cin1'}})
+
+
+class CborCodecTests(unittest.TestCase):
+    def setUp(self):
+        try:
+            from client.onem2m.codec.CborCodec import CborCodec
+            self.codec = CborCodec()
+        except ImportError:
+            self.skipTest('cbor2 is not installed')
+
+    def test_cbor_is_smaller_than_json(self):
+        """CborCodec: Round trips content in fewer bytes than JSON."""
+        print(self.shortDescription())
+
+        obj = {'m2m:cin': {'con': {'kwh': 12.5, 'ts': 1602345678, 'ok': True}, 'cnf': 'application/json', 'lbl': ['a', 'b']}}
+
+        data = self.codec.encode(obj)
+
+        self.assertEqual(self.codec.decode(data), obj)
+        self.assertLess(len(data), len(JsonCodec().encode(obj)))
+
+    def test_content_negotiation(self):
+        """CSE(codec=CborCodec()): Sends CBOR, accepts CBOR or JSON and decodes either reply."""
+        print(self.shortDescription())
+
+        codec = self.codec
+        fake = FakeCSE()
+
+        async def respond(req):
+            reply = FakeCSE.reply(req)
+            if 'cbor' in req.headers['Accept'] and req.method == 'POST':
+                reply.body = codec.encode({'m2m:cin': {'ri': 'cbor'}})
+                reply.content_type = OneM2MPrimitive.CONTENT_TYPE_CBOR
+            else:
+                reply.body = JsonCodec().encode({'m2m:cin': {'ri': 'json'}})
+            return reply
+
+        fake.responder = respond
+        fake.start_in_thread()
+        self.addCleanup(fake.stop_thread)
+
+        cse = CSE(fake.host, fake.port, codec=codec)
+        cse.ae = AE({'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'})
+        self.addCleanup(cse.close)
+
+        created = cse.create_content_instance('/PN_CSE/cnt', ContentInstance({'con': 1}))
+        retrieved = cse.retrieve_resource('/PN_CSE/cnt', 4)
+
+        self.assertTrue(fake.received[0].headers['Content-Type'].startswith(OneM2MPrimitive.CONTENT_TYPE_CBOR))
+        self.assertEqual(codec.decode(fake.bodies[0]), {'m2m:cin': {'con': 1}})
+        self.assertEqual(created.pc, {'m2m:cin': {'ri': 'cbor'}})
+        self.assertEqual(retrieved.pc, {'m2m:cin': {'ri': 'json'}})
@@ -0,0 +1,115 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, gzip, json, zlib
+
+from aiohttp import web
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.Compression import Compression
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from tests.FakeCSE import FakeCSE
+
+PARAMS = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+LARGE = 'x' * 4096
+CREATE_PARAMS = {**PARAMS, OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value}
+
+
+async def gzip_responder(req: web.Request):
+    """Reply with a large gzip encoded content instance."""
+    body = gzip.compress(json.dumps({'m2m:cin': {'con': LARGE}}).encode())
+    return web.Response(
+        status=200,
+        body=body,
+        content_type=OneM2MPrimitive.CONTENT_TYPE_JSON,
+        headers={
+            'Content-Encoding': 'gzip',
+            OneM2MPrimitive.X_M2M_ORIGIN: 'CSE',
+            OneM2MPrimitive.X_M2M_RI: req.headers.get(OneM2MPrimitive.X_M2M_RI, ''),
+            OneM2MPrimitive.X_M2M_RSC: OneM2MPrimitive.M2M_RSC_OK,
+        },
+    )
+
+
+class CompressionTests(unittest.TestCase):
+    def test_threshold(self):
+        """Bodies smaller than the threshold are sent uncompressed."""
+        print(self.shortDescription())
+
+        compression = Compression(request_threshold=100)
+
+        self.assertEqual(compression.compress(b'small'), (b'small', None))
+
+        data, encoding = compression.compress(LARGE.encode())
+        self.assertEqual(encoding, 'gzip')
+        self.assertEqual(gzip.decompress(data), LARGE.encode())
+        self.assertGreater(compression.bytes_saved, 0)
+
+    def test_decompress(self):
+        """Gzip and deflate bodies, with or without zlib header, are decoded."""
+        print(self.shortDescription())
+
+        compression = Compression()
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw_deflate = raw.compress(b'data') + raw.flush()
+
+        self.assertEqual(compression.decompress(gzip.compress(b'data'), 'gzip'), b'data')
+        self.assertEqual(compression.decompress(zlib.compress(b'data'), 'deflate'), b'data')
+        self.assertEqual(compression.decompress(raw_deflate, 'deflate'), b'data')
+        self.assertEqual(compression.decompress(b'data', None), b'data')
+
+    def test_sync_round_trip(self):
+        """The blocking client compresses large bodies and counts compressed responses."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+        compression = Compression(request_threshold=1024)
+
+        try:
+            with HttpSession(compression=compression) as session:
+                request = OneM2MRequest(session=session)
+                request.create(fake.url('/PN_CSE/cnt'), dict(CREATE_PARAMS), ContentInstance({'con': LARGE}))
+
+                fake.responder = gzip_responder
+                response = request.retrieve(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+        finally:
+            fake.stop_thread()
+
+        self.assertEqual(fake.received[0].headers['Content-Encoding'], 'gzip')
+        self.assertIn('gzip', fake.received[0].headers['Accept-Encoding'])
+        # The server decodes the request body according to its Content-Encoding.
+        self.assertEqual(json.loads(fake.bodies[0]), {'m2m:cin': {'con': LARGE}})
+        self.assertEqual(response.pc['m2m:cin']['con'], LARGE)
+        self.assertLess(compression.bytes_received, compression.bytes_received_uncompressed)
+
+
+class AsyncCompressionTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = await FakeCSE().start()
+        self.compression = Compression(request_threshold=1024)
+        self.session = HttpSession(compression=self.compression)
+
+    async def asyncTearDown(self):
+        await self.session.close_async()
+        await self.fake.close()
+
+    async def test_async_round_trip(self):
+        """The asynchronous client compresses large bodies and decodes compressed responses."""
+        print(self.shortDescription())
+
+        request = OneM2MRequest(session=self.session)
+        await request.create_async(self.fake.url('/PN_CSE/cnt'), dict(CREATE_PARAMS), ContentInstance({'con': LARGE}))
+        await request.create_async(self.fake.url('/PN_CSE/cnt'), dict(CREATE_PARAMS), ContentInstance({'con': 1}))
+
+        self.fake.responder = gzip_responder
+        response = await request.retrieve_async(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+        self.assertEqual(self.fake.received[0].headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Encoding', self.fake.received[1].headers)
+        self.assertEqual(response.pc['m2m:cin']['con'], LARGE)
+        self.assertLess(self.compression.bytes_received, self.compression.bytes_received_uncompressed)
+        self.assertLess(self.compression.bytes_sent, self.compression.bytes_sent_uncompressed)
@@ -0,0 +1,94 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, re
+
+import requests
+from aiohttp import web
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.Deadline import Deadline
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class SlowCSE(FakeCSE):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.responder = self.slow
+
+    async def slow(self, req: web.Request):
+        await asyncio.sleep(self.delay)
+        return None
+
+
+class DeadlineTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = SlowCSE(0).start_in_thread()
+        self.addCleanup(self.fake.stop_thread)
+
+        self.cse = CSE(self.fake.host, self.fake.port, session=HttpSession(timeout=5))
+        self.cse.ae = AE(dict(AE_ATTRIBUTES))
+        self.addCleanup(self.cse.close)
+
+    def test_timestamp_format(self):
+        """Deadline.timestamp(): Formats the deadline as a oneM2M UTC timestamp."""
+        print(self.shortDescription())
+
+        self.assertRegex(Deadline(1).timestamp(), r'^\d{8}T\d{6}$')
+
+    def test_request_expiration_header(self):
+        """Requests carry X-M2M-RET from the session timeout unless one is set explicitly."""
+        print(self.shortDescription())
+
+        self.cse.retrieve_resource('/PN_CSE/cnt', 3)
+        self.assertRegex(self.fake.received[-1].headers[OneM2MPrimitive.X_M2M_RET], r'^\d{8}T\d{6}$')
+
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: 'C123',
+            OneM2MPrimitive.M2M_PARAM_REQUEST_EXPIRATION: '20300101T000000',
+        }
+        OneM2MRequest(session=self.cse.session).retrieve(self.fake.url('/PN_CSE/cnt'), params)
+        self.assertEqual(self.fake.received[-1].headers[OneM2MPrimitive.X_M2M_RET], '20300101T000000')
+
+    def test_scope_bounds_stalled_request(self):
+        """A deadline scope turns into a socket timeout on a stalled CSE."""
+        print(self.shortDescription())
+
+        self.fake.delay = 2
+
+        with self.assertRaises(requests.Timeout):
+            with self.cse.deadline(0.2):
+                self.cse.retrieve_resource('/PN_CSE/cnt', 3)
+
+    def test_nested_scope_only_shortens(self):
+        """Deadline.scope(): A nested scope can not extend the enclosing deadline."""
+        print(self.shortDescription())
+
+        with Deadline.scope(1) as outer:
+            with Deadline.scope(60) as inner:
+                self.assertIs(inner, outer)
+        self.assertIsNone(Deadline.current())
+
+    def test_async_request_is_cancelled(self):
+        """The async engine cancels a request when its deadline passes."""
+        print(self.shortDescription())
+
+        self.fake.delay = 2
+
+        async def run():
+            async with AsyncCSE(self.fake.host, self.fake.port, session=HttpSession(timeout=0.2)) as cse:
+                cse.ae = AE(dict(AE_ATTRIBUTES))
+                await cse.retrieve_resource('/PN_CSE/cnt', 3)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run())
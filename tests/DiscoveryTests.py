@@ -0,0 +1,122 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, threading
+
+from aiohttp import web
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class PagingCSE(FakeCSE):
+    """Answers discovery requests with a page of the 'lim' URIs starting at 'ofst'."""
+
+    def __init__(self, total: int):
+        super().__init__()
+        self.uris = ['/PN_CSE/nod{}'.format(i) for i in range(total)]
+        self.responder = self.discover
+
+    async def discover(self, req: web.Request):
+        offset = int(req.query.get('ofst', 0))
+        limit = int(req.query.get('lim', len(self.uris)))
+        return self.reply(req, {'m2m:uril': self.uris[offset:offset + limit]})
+
+
+class DiscoveryTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = PagingCSE(25).start_in_thread()
+        self.cse = CSE(self.fake.host, self.fake.port)
+        self.cse.ae = AE(dict(AE_ATTRIBUTES))
+
+    def tearDown(self):
+        self.cse.close()
+        self.fake.stop_thread()
+
+    def test_pages(self):
+        """iter_discover(): Pages through every result with lim/ofst and the filter criteria."""
+        print(self.shortDescription())
+
+        uris = list(self.cse.iter_discover(page_size=10, drt=1, ty=14))
+
+        self.assertEqual(uris, self.fake.uris)
+        self.assertEqual([r.query['ofst'] for r in self.fake.received], ['0', '10', '20'])
+
+        query = self.fake.received[0].query
+        self.assertEqual((query['fu'], query['lim'], query['ty'], query['drt']), ('1', '10', '14', '1'))
+
+    def test_lazy(self):
+        """iter_discover(): Requests a page only when the previous one is consumed."""
+        print(self.shortDescription())
+
+        uris = self.cse.iter_discover(page_size=10)
+
+        self.assertEqual(next(uris), '/PN_CSE/nod0')
+        self.assertEqual(len(self.fake.received), 1)
+
+    def test_prefetch(self):
+        """iter_discover(): Prefetches the next page while the current one is consumed."""
+        print(self.shortDescription())
+
+        uris = self.cse.iter_discover(page_size=10, prefetch=True)
+        next(uris)
+        self.cse._close_executor()
+
+        self.assertEqual(len(self.fake.received), 2)
+        self.assertEqual(len(list(uris)), 24)
+
+    def test_prefetch_cancelled(self):
+        """iter_discover(): Cancels the prefetch when the consumer stops early."""
+        print(self.shortDescription())
+
+        cse = CSE(self.fake.host, self.fake.port, max_workers=1)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+        # Keeps the prefetch queued.
+        busy = threading.Event()
+        cse.submit(busy.wait, 5)
+
+        uris = cse.iter_discover(page_size=10, prefetch=True)
+        next(uris)
+        uris.close()
+
+        busy.set()
+        cse.close()
+
+        self.assertEqual(len(self.fake.received), 1)
+
+    def test_offset_ignored(self):
+        """iter_discover(): Stops when the CSE ignores the offset."""
+        print(self.shortDescription())
+
+        async def first_page(req):
+            return self.fake.reply(req, {'m2m:uril': self.fake.uris[:10]})
+
+        self.fake.responder = first_page
+
+        self.assertEqual(list(self.cse.iter_discover(page_size=10)), self.fake.uris[:10])
+
+
+class AsyncDiscoveryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_async_pages(self):
+        """AsyncCSE.iter_discover(): Yields every result, with or without prefetch."""
+        print(self.shortDescription())
+
+        fake = await PagingCSE(25).start()
+        cse = AsyncCSE(fake.host, fake.port)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            uris = [uri async for uri in cse.iter_discover(page_size=10)]
+            prefetched = [uri async for uri in cse.iter_discover(page_size=10, prefetch=True)]
+        finally:
+            await cse.close()
+            await fake.close()
+
+        self.assertEqual(uris, fake.uris)
+        self.assertEqual(prefetched, fake.uris)
@@ -0,0 +1,188 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import requests, unittest, socket, time
+
+from unittest import mock
+
+from client.ae.AE import AE
+from client.cse.CSE import CSE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.CircuitBreaker import CircuitBreaker
+from client.onem2m.http.EndpointPool import EndpointPool
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.RetryPolicy import RetryPolicy
+
+from tests.FakeCSE import FakeCSE
+
+PARAMS = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+
+
+def unused_port() -> int:
+    """A local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def netloc(fake: FakeCSE) -> str:
+    return '{}:{}'.format(fake.host, fake.port)
+
+
+class EndpointPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.fakes = [FakeCSE().start_in_thread(), FakeCSE().start_in_thread()]
+
+    def tearDown(self):
+        for fake in self.fakes:
+            fake.stop_thread()
+
+    def _retrieve(self, pool: EndpointPool, paths):
+        with HttpSession(endpoints=pool) as session:
+            request = OneM2MRequest(session=session)
+            for path in paths:
+                request.retrieve('http://{}/PN_CSE/{}'.format(pool.endpoints[0].netloc, path), dict(PARAMS))
+
+    def test_least_outstanding(self):
+        """Requests are spread over the endpoints with the fewest requests in flight."""
+        print(self.shortDescription())
+
+        pool = EndpointPool([netloc(f) for f in self.fakes], health_check_interval=None)
+        self._retrieve(pool, ['cnt'] * 10)
+
+        self.assertEqual([len(f.received) for f in self.fakes], [5, 5])
+        self.assertEqual([e.outstanding for e in pool.endpoints], [0, 0])
+
+    def test_consistent_hash(self):
+        """A resource path always maps to the same endpoint, paths spread over all of them."""
+        print(self.shortDescription())
+
+        pool = EndpointPool([netloc(f) for f in self.fakes], EndpointPool.CONSISTENT_HASH, health_check_interval=None)
+        paths = ['cnt{}'.format(i) for i in range(20)]
+        self._retrieve(pool, paths + paths)
+
+        first = {r.path for r in self.fakes[0].received}
+        second = {r.path for r in self.fakes[1].received}
+
+        self.assertTrue(first and second)
+        # Both retrieves of a path reached the same endpoint.
+        self.assertFalse(first & second)
+
+    def test_failover(self):
+        """An unreachable endpoint is skipped and taken out of rotation."""
+        print(self.shortDescription())
+
+        dead = '127.0.0.1:{}'.format(unused_port())
+        pool = EndpointPool([dead, netloc(self.fakes[0])], health_check_interval=None)
+        self._retrieve(pool, ['cnt'] * 4)
+
+        self.assertEqual(len(self.fakes[0].received), 4)
+        self.assertFalse(pool.endpoints[0].healthy)
+        self.assertEqual(pool.endpoints[0].failures, 1)
+
+        pool.health_check = lambda endpoint: True
+        pool.check_health()
+        self.assertTrue(pool.endpoints[0].healthy)
+
+    def test_failover_half_open_probe(self):
+        """A half-open probe that fails over is not counted as a failure nor left in flight."""
+        print(self.shortDescription())
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.before_request()
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        dead = '127.0.0.1:{}'.format(unused_port())
+        pool = EndpointPool([dead, netloc(self.fakes[0])], health_check_interval=None)
+
+        with HttpSession(endpoints=pool, circuit_breaker=breaker) as session:
+            OneM2MRequest(session=session).retrieve('http://{}/PN_CSE/cnt'.format(dead), dict(PARAMS))
+
+        self.assertEqual(len(self.fakes[0].received), 1)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_retry_timeouts(self):
+        """Every retry of a request is routed over the pool, even once each endpoint timed out."""
+        print(self.shortDescription())
+
+        pool = EndpointPool([netloc(f) for f in self.fakes], health_check_interval=None)
+        policy = RetryPolicy(max_retries=3, backoff_base=0.01, jitter=False)
+
+        with HttpSession(endpoints=pool, retry_policy=policy) as session:
+            with mock.patch.object(session.session, 'request', side_effect=requests.ReadTimeout()) as request:
+                with self.assertRaises(requests.ReadTimeout):
+                    OneM2MRequest(session=session).retrieve('http://{}/PN_CSE/cnt'.format(pool.endpoints[0].netloc), dict(PARAMS))
+
+        # Each attempt went to an endpoint of the pool, alternating over both.
+        self.assertEqual(request.call_count, 4)
+        self.assertEqual([e.requests for e in pool.endpoints], [2, 2])
+        self.assertEqual([e.outstanding for e in pool.endpoints], [0, 0])
+
+    def test_other_hosts(self):
+        """Requests to hosts outside the pool are sent as is."""
+        print(self.shortDescription())
+
+        pool = EndpointPool(['127.0.0.1:{}'.format(unused_port())], health_check_interval=None)
+
+        with HttpSession(endpoints=pool) as session:
+            OneM2MRequest(session=session).retrieve(self.fakes[1].url('/PN_CSE/cnt'), dict(PARAMS))
+
+        self.assertEqual(len(self.fakes[1].received), 1)
+        self.assertEqual(pool.endpoints[0].requests, 0)
+
+    def test_cse_endpoints(self):
+        """CSE: Requests to the CSE host are routed over its endpoints."""
+        print(self.shortDescription())
+
+        dead = unused_port()
+        pool = EndpointPool(['127.0.0.1:{}'.format(dead), netloc(self.fakes[1])])
+        cse = CSE('127.0.0.1', dead, endpoints=pool)
+        cse.ae = AE({'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'})
+
+        try:
+            response = cse.retrieve_resource('PN_CSE/cnt', OneM2MPrimitive.M2M_RESOURCE_TYPES.Container.value)
+        finally:
+            cse.close()
+
+        self.assertEqual(response.rsc, OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(len(self.fakes[1].received), 1)
+
+
+    def test_health_check_default_port(self):
+        """The health check uses the default port of the scheme and survives bad ports."""
+        print(self.shortDescription())
+
+        pool = EndpointPool(['cse', 'cse:https', '[::1]:8080'], health_check_interval=None)
+        cse, bad, ipv6 = pool.endpoints
+
+        self.assertEqual(cse.address, ('cse', 80))
+        self.assertEqual(ipv6.address, ('::1', 8080))
+
+        pool.acquire('https://cse/PN_CSE')
+        self.assertEqual(cse.address, ('cse', 443))
+
+        self.assertFalse(EndpointPool.tcp_health_check(bad))
+
+
+class AsyncEndpointPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_async_failover(self):
+        """The asynchronous client fails over the same way."""
+        print(self.shortDescription())
+
+        fake = await FakeCSE().start()
+        pool = EndpointPool(['127.0.0.1:{}'.format(unused_port()), netloc(fake)], health_check_interval=None)
+        session = HttpSession(endpoints=pool)
+
+        try:
+            request = OneM2MRequest(session=session)
+            for i in range(3):
+                await request.retrieve_async('http://{}/PN_CSE/cnt{}'.format(pool.endpoints[0].netloc, i), dict(PARAMS))
+        finally:
+            await session.close_async()
+            await fake.close()
+
+        self.assertEqual(len(fake.received), 3)
+        self.assertFalse(pool.endpoints[0].healthy)
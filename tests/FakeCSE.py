@@ -0,0 +1,93 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import asyncio, json, ssl, threading
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+
+from typing import Any, Callable, List, Optional
+
+
+class FakeCSE:
+    """Minimal in-process CSE used by the request engine tests.
+
+    Records every request it receives and answers with a oneM2M response.  The reply can
+    be customised by assigning a coroutine to 'responder', which receives the
+    aiohttp request and returns an aiohttp response (or None for the default reply).
+    """
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None):
+        self.received: List[web.Request] = []
+        self.bodies: List[bytes] = []
+        self.responder: Optional[Callable] = None
+        self.server: Optional[TestServer] = None
+        # Serve HTTPS with this server context.
+        self.ssl_context = ssl_context
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self._handler)
+
+        self.server = TestServer(app)
+        await self.server.start_server(ssl=self.ssl_context)
+
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            await self.server.close()
+
+    def start_in_thread(self):
+        """Serve from a background event loop, for tests of the blocking client."""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+
+        return self
+
+    def stop_thread(self):
+        asyncio.run_coroutine_threadsafe(self.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    @property
+    def host(self) -> str:
+        return self.server.host
+
+    @property
+    def port(self) -> int:
+        return self.server.port
+
+    def url(self, path: str) -> str:
+        return str(self.server.make_url(path))
+
+    @staticmethod
+    def reply(req: web.Request, pc: Any = None, rsc: str = OneM2MPrimitive.M2M_RSC_OK, status: int = 200):
+        """Build a oneM2M response to req."""
+        return web.Response(
+            status=status,
+            body=json.dumps(pc).encode() if pc is not None else None,
+            content_type=OneM2MPrimitive.CONTENT_TYPE_JSON,
+            headers={
+                OneM2MPrimitive.X_M2M_ORIGIN: 'CSE',
+                OneM2MPrimitive.X_M2M_RI: req.headers.get(OneM2MPrimitive.X_M2M_RI, ''),
+                OneM2MPrimitive.X_M2M_RSC: rsc,
+            },
+        )
+
+    async def _handler(self, req: web.Request):
+        self.received.append(req)
+        self.bodies.append(await req.read())
+
+        if self.responder is not None:
+            res = await self.responder(req)
+            if res is not None:
+                return res
+
+        if req.method == 'POST':
+            return self.reply(req, {'m2m:cin': {'ri': 'cin{}'.format(len(self.received))}}, OneM2MPrimitive.M2M_RSC_CREATED, 201)
+
+        return self.reply(req, {'m2m:cin': {'con': 'value'}})
@@ -0,0 +1,127 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio
+from unittest import mock
+
+import requests
+
+from client.cse.CSE import CSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+
+
+def build_response(status: int = 200, rsc: str = OneM2MPrimitive.M2M_RSC_OK):
+    """Build a requests.Response that looks like it came from a CSE."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers[OneM2MPrimitive.X_M2M_ORIGIN] = 'CSE'
+    response.headers[OneM2MPrimitive.X_M2M_RI] = '123'
+    response.headers[OneM2MPrimitive.X_M2M_RSC] = rsc
+    response._content = b''
+    return response
+
+
+class HttpSessionTests(unittest.TestCase):
+    def test_pool_configuration(self):
+        """HttpSession mounts adapters with the configured pool limits."""
+        print(self.shortDescription())
+
+        session = HttpSession(pool_connections=4, pool_maxsize=32, pool_block=True)
+
+        for prefix in ('http://', 'https://'):
+            adapter = session.session.get_adapter(prefix + 'localhost')
+            self.assertEqual(adapter._pool_connections, 4)
+            self.assertEqual(adapter._pool_maxsize, 32)
+            self.assertTrue(adapter._pool_block)
+
+    def test_keep_alive_header(self):
+        """HttpSession requests connection close when keep-alive is disabled."""
+        print(self.shortDescription())
+
+        self.assertEqual(HttpSession().session.headers['Connection'], 'keep-alive')
+        self.assertEqual(HttpSession(keep_alive=False).session.headers['Connection'], 'close')
+
+    def test_cse_requests_share_session(self):
+        """Every request issued by a CSE goes through the CSE owned session."""
+        print(self.shortDescription())
+
+        cse = CSE('localhost', 8100)
+        cse.ae = AE({'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'})
+
+        with mock.patch.object(cse.session, 'request', return_value=build_response()) as request:
+            cse.retrieve_resource('/PN_CSE/cnt', OneM2MPrimitive.M2M_RESOURCE_TYPES.Container.value)
+            cse.delete_resource('/PN_CSE/cnt')
+
+        self.assertEqual([c.args[0] for c in request.call_args_list], ['GET', 'DELETE'])
+
+    def test_request_without_session(self):
+        """OneM2MRequest without a session falls back to a one-off request."""
+        print(self.shortDescription())
+
+        with mock.patch('requests.request', return_value=build_response()) as request:
+            OneM2MRequest().retrieve('http://localhost:8100/PN_CSE', {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'})
+
+        request.assert_called_once()
+
+    def test_async_session_replaced_on_new_loop(self):
+        """The aiohttp session of a finished event loop is closed when a new loop replaces it."""
+        print(self.shortDescription())
+
+        session = HttpSession()
+
+        async def get():
+            async_session = session.get_async_session()
+            # Let the close of the replaced session run.
+            await asyncio.sleep(0)
+            return async_session
+
+        first = asyncio.run(get())
+
+        async def replace():
+            second = await get()
+            self.assertIsNot(first, second)
+            self.assertTrue(first.closed)
+            await session.close_async()
+
+        asyncio.run(replace())
+
+    def test_async_session_of_idle_loop_closed(self):
+        """The aiohttp session of an idle event loop is closed without that loop running again."""
+        print(self.shortDescription())
+
+        session = HttpSession()
+        idle = asyncio.new_event_loop()
+        self.addCleanup(idle.close)
+
+        async def get():
+            return session.get_async_session()
+
+        first = idle.run_until_complete(get())
+
+        async def replace():
+            second = await get()
+            self.assertIsNot(first, second)
+            self.assertTrue(first.closed)
+            await session.close_async()
+
+        asyncio.run(replace())
+
+    def test_close_on_running_loop(self):
+        """close() called from a coroutine closes the aiohttp session on its running loop."""
+        print(self.shortDescription())
+
+        session = HttpSession()
+
+        async def close():
+            async_session = session.get_async_session()
+            session.close()
+            self.assertIsNone(session.async_session)
+            # Let the scheduled close run.
+            await asyncio.sleep(0.01)
+            return async_session
+
+        self.assertTrue(asyncio.run(close()).closed)
@@ -0,0 +1,241 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, json
+
+from aiohttp import web
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.OneM2MOperation import OneM2MOperation
+from client.onem2m.resource.ContentInstance import ContentInstance
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.ResourceCache import ResourceCache
+from client.exceptions.InvalidArgumentException import InvalidArgumentException
+from client.exceptions.UnresolvableRequestException import UnresolvableRequestException
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class NonBlockingCSE(FakeCSE):
+    """Accepts non-blocking requests and completes them after a number of polls."""
+
+    def __init__(self, polls_until_done: int = 2):
+        super().__init__()
+        self.polls_until_done = polls_until_done
+        self.polls = 0
+        self.pending = {}
+        self.responder = self.non_blocking
+
+    async def non_blocking(self, req: web.Request):
+        if req.path.startswith('/PN_CSE/req-'):
+            self.polls += 1
+            rqi = self.pending[req.path]
+            if self.polls < self.polls_until_done:
+                return self.reply(req, {'m2m:req': {'rs': 3}})
+            return self.reply(req, {'m2m:req': {'rs': 1, 'ol': {'rsc': 2004, 'rqi': rqi, 'pc': {'m2m:cin': {'con': 'done'}}}}})
+
+        if req.query.get('rt') in ('1', '2'):
+            path = '/PN_CSE/req-{}'.format(len(self.pending) + 1)
+            self.pending[path] = req.headers[OneM2MPrimitive.X_M2M_RI]
+            return self.reply(req, {'m2m:uri': path}, OneM2MPrimitive.M2M_RSC_ACCEPTED_NON_BLOCKING_SYNCH, 202)
+
+        return None
+
+
+class StubListener:
+    """Stands in for the AsyncResponseListener callback registry."""
+
+    def __init__(self):
+        self.rqi_cb_map = {}
+
+    def set_rqi_cb(self, rqi, cb):
+        self.rqi_cb_map[str(rqi)] = cb
+
+    def remove_rqi_cb(self, rqi):
+        self.rqi_cb_map.pop(str(rqi), None)
+
+
+class StubRequest:
+    def __init__(self, body):
+        self.body = body
+
+    async def json(self):
+        return self.body
+
+
+class NonBlockingRequestTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = NonBlockingCSE().start_in_thread()
+        self.cse = CSE(self.fake.host, self.fake.port)
+        self.cse.ae = AE(dict(AE_ATTRIBUTES))
+
+    def tearDown(self):
+        self.cse.close()
+        self.fake.stop_thread()
+
+    def test_polling(self):
+        """send_non_blocking(): Polls the <request> resource until the operation completes."""
+        print(self.shortDescription())
+
+        handle = self.cse.send_non_blocking(
+            OneM2MOperation.Update, '/PN_CSE/cnt', ContentInstance({'con': 1}), poll_interval=0.01
+        )
+
+        self.assertFalse(handle.done())
+        self.assertEqual(handle.request_uri, self.fake.url('/PN_CSE/req-1'))
+
+        response = handle.result(timeout=5)
+
+        self.assertEqual(response.rsc, OneM2MPrimitive.M2M_RSC_UPDATED)
+        self.assertEqual(response.pc, {'m2m:cin': {'con': 'done'}})
+        self.assertEqual(response.rqi, handle.rqi)
+        self.assertEqual(self.fake.received[0].query['rt'], '1')
+        self.assertEqual(self.fake.polls, 2)
+
+    def test_timeout(self):
+        """result(): Raises TimeoutError when the operation does not complete in time."""
+        print(self.shortDescription())
+
+        self.fake.polls_until_done = 1000
+        handle = self.cse.send_non_blocking(OneM2MOperation.Delete, '/PN_CSE/cnt', poll_interval=0.01)
+
+        with self.assertRaises(TimeoutError):
+            handle.result(timeout=0.05)
+
+    def test_listener(self):
+        """send_non_blocking(): Resolves from the asynchronous response notification."""
+        print(self.shortDescription())
+
+        listener = StubListener()
+
+        with self.assertRaises(InvalidArgumentException):
+            self.cse.send_non_blocking(OneM2MOperation.Delete, '/PN_CSE/cnt', listener=listener)
+
+        handle = self.cse.send_non_blocking(
+            OneM2MOperation.Delete, '/PN_CSE/cnt', notification_uri='http://ae:8080/', listener=listener
+        )
+
+        received = self.fake.received[0]
+        self.assertEqual(received.query['rt'], '2')
+        self.assertEqual(received.headers[OneM2MPrimitive.X_M2M_RTU], 'http://ae:8080/')
+        self.assertIn(handle.rqi, listener.rqi_cb_map)
+
+        notification = StubRequest({'m2m:rsp': {'rsc': 2002, 'rqi': handle.rqi}})
+        asyncio.run(listener.rqi_cb_map[handle.rqi](notification, web.Response()))
+
+        self.assertEqual(handle.result(timeout=0).rsc, OneM2MPrimitive.M2M_RSC_DELETED)
+        self.assertEqual(listener.rqi_cb_map, {})
+        self.assertEqual(self.fake.polls, 0)
+
+    def test_unresolvable(self):
+        """result(): Raises when the handle can neither poll nor be notified."""
+        print(self.shortDescription())
+
+        handle = self.cse.send_non_blocking(OneM2MOperation.Delete, '/PN_CSE/cnt', poll_interval=None)
+
+        self.assertTrue(handle.done())
+        with self.assertRaises(UnresolvableRequestException):
+            handle.result()
+
+        async def accepted(req: web.Request):
+            # No <request> resource to poll.
+            return self.fake.reply(req, None, OneM2MPrimitive.M2M_RSC_ACCEPTED_NON_BLOCKING_SYNCH, 202)
+
+        self.fake.responder = accepted
+        handle = self.cse.send_non_blocking(OneM2MOperation.Delete, '/PN_CSE/cnt', poll_interval=0.01)
+
+        self.assertIsNone(handle.request_uri)
+        with self.assertRaises(UnresolvableRequestException):
+            handle.result(timeout=5)
+
+    def test_multi_process_listener(self):
+        """send_non_blocking(): A listener running its callbacks in other processes is rejected."""
+        print(self.shortDescription())
+
+        listener = StubListener()
+        listener.in_process = False
+
+        with self.assertRaises(InvalidArgumentException):
+            self.cse.send_non_blocking(
+                OneM2MOperation.Delete, '/PN_CSE/cnt', notification_uri='http://ae:8080/', listener=listener
+            )
+
+        self.assertEqual(listener.rqi_cb_map, {})
+        self.assertEqual(self.fake.received, [])
+
+    def test_blocking_fallback(self):
+        """send_non_blocking(): Resolves immediately when the CSE answers in blocking mode."""
+        print(self.shortDescription())
+
+        self.fake.responder = None
+
+        handle = self.cse.send_non_blocking(OneM2MOperation.Retrieve, '/PN_CSE/cnt')
+
+        self.assertTrue(handle.done())
+        self.assertEqual(handle.result().rsc, OneM2MPrimitive.M2M_RSC_OK)
+
+    def test_listener_released(self):
+        """send_non_blocking(): The listener callback is removed on a blocking answer or a failed send."""
+        print(self.shortDescription())
+
+        listener = StubListener()
+        self.fake.responder = None
+
+        handle = self.cse.send_non_blocking(
+            OneM2MOperation.Retrieve, '/PN_CSE/cnt', notification_uri='http://ae:8080/', listener=listener
+        )
+
+        self.assertTrue(handle.done())
+        self.assertEqual(listener.rqi_cb_map, {})
+
+        # Nothing listens on port 1.
+        self.cse.port = 1
+
+        with self.assertRaises(Exception):
+            self.cse.send_non_blocking(
+                OneM2MOperation.Delete, '/PN_CSE/cnt', notification_uri='http://ae:8080/', listener=listener
+            )
+
+        self.assertEqual(listener.rqi_cb_map, {})
+
+    def test_polls_bypass_cache(self):
+        """Polls of the <request> resource are not answered from the session's cache."""
+        print(self.shortDescription())
+
+        cse = CSE(self.fake.host, self.fake.port, session=HttpSession(cache=ResourceCache(ttl=60)))
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+        self.addCleanup(cse.close)
+
+        handle = cse.send_non_blocking(OneM2MOperation.Delete, '/PN_CSE/cnt', poll_interval=0.01)
+
+        self.assertEqual(handle.result(timeout=5).rsc, OneM2MPrimitive.M2M_RSC_UPDATED)
+        self.assertEqual(self.fake.polls, 2)
+
+
+class AsyncNonBlockingRequestTests(unittest.IsolatedAsyncioTestCase):
+    async def test_await(self):
+        """AsyncCSE.send_non_blocking(): Many outstanding handles resolve when awaited."""
+        print(self.shortDescription())
+
+        fake = await NonBlockingCSE(polls_until_done=1).start()
+        cse = AsyncCSE(fake.host, fake.port)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            handles = [
+                await cse.send_non_blocking(OneM2MOperation.Delete, '/PN_CSE/cnt{}'.format(i), poll_interval=0.01)
+                for i in range(5)
+            ]
+            responses = await asyncio.gather(*handles)
+        finally:
+            await cse.close()
+            await fake.close()
+
+        self.assertEqual([r.rqi for r in responses], [h.rqi for h in handles])
+        self.assertTrue(all(r.rsc == OneM2MPrimitive.M2M_RSC_UPDATED for r in responses))
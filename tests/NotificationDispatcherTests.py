@@ -0,0 +1,193 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, functools, os, tempfile, threading
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from client.ae.AsyncResponseListener import AsyncResponseListenerFactory
+from client.ae.Notification import Notification
+from client.ae.NotificationDispatcher import NotificationDispatcher
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+
+SUR = '/PN_CSE/sub-dispatch'
+
+
+def notification(i: int) -> dict:
+    return {'m2m:sgn': {'sur': SUR, 'nev': {'net': 3, 'rep': {'m2m:cin': {'con': i}}}}}
+
+
+def record_pid(path: str, n: Notification):
+    """Process pool callback, must be importable."""
+    with open(path, 'a') as f:
+        f.write('{} {}\n'.format(os.getpid(), n.representation['m2m:cin']['con']))
+
+
+class NotificationDispatcherTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.listener = AsyncResponseListenerFactory().get_instance()
+        self.client = TestClient(TestServer(self.listener._application()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        self.listener.remove_notification_cb(SUR)
+        await self.listener.dispatcher.close()
+        await self.client.close()
+
+    async def _notify(self, i: int):
+        return await self.client.post('/notify', json=notification(i))
+
+    async def test_sync_callback_on_pool(self):
+        """Plain callbacks run on the pool and receive the parsed notification."""
+        print(self.shortDescription())
+
+        self.listener.dispatcher = NotificationDispatcher(workers=2)
+        received = []
+        self.listener.set_notification_cb(SUR, lambda n: received.append((n, threading.current_thread())))
+
+        res = await self._notify(1)
+        await self.listener.dispatcher.join()
+
+        self.assertEqual(res.status, 200)
+        self.assertEqual(res.headers[OneM2MPrimitive.X_M2M_RSC], OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(received[0][0].sur, SUR)
+        self.assertEqual(received[0][0].representation, {'m2m:cin': {'con': 1}})
+        self.assertIsNot(received[0][1], threading.current_thread())
+
+    async def test_slow_callback_does_not_stall(self):
+        """A slow callback does not hold back the other notifications."""
+        print(self.shortDescription())
+
+        self.listener.dispatcher = NotificationDispatcher(workers=2)
+        release = threading.Event()
+        done = []
+
+        def cb(n: Notification):
+            if n.representation['m2m:cin']['con'] == 0:
+                release.wait(5)
+            done.append(n.representation['m2m:cin']['con'])
+
+        self.listener.set_notification_cb(SUR, cb)
+
+        for i in range(3):
+            self.assertEqual((await self._notify(i)).status, 200)
+
+        while len(done) < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+        await self.listener.dispatcher.join()
+
+        self.assertEqual(done, [1, 2, 0])
+
+    async def test_async_callback(self):
+        """Coroutine callbacks are awaited on the listener's loop."""
+        print(self.shortDescription())
+
+        self.listener.dispatcher = NotificationDispatcher()
+        received = []
+
+        async def cb(n: Notification):
+            await asyncio.sleep(0)
+            received.append(n.representation['m2m:cin']['con'])
+
+        self.listener.set_notification_cb(SUR, cb)
+        await asyncio.gather(*[self._notify(i) for i in range(5)])
+        await self.listener.dispatcher.join()
+
+        self.assertEqual(sorted(received), list(range(5)))
+
+    async def test_rqi_callback_on_pool(self):
+        """rqi callbacks build the answer by default, dispatched ones run on the dispatcher."""
+        print(self.shortDescription())
+
+        self.listener.dispatcher = NotificationDispatcher(workers=2)
+        received = []
+        self.listener.set_rqi_cb(SUR, lambda body: received.append((body, threading.current_thread())), dispatch=True)
+
+        try:
+            res = await self._notify(1)
+            await self.listener.dispatcher.join()
+
+            self.assertEqual(res.status, 200)
+            self.assertEqual(received[0][0], notification(1))
+            self.assertIsNot(received[0][1], threading.current_thread())
+
+            async def respond(req, res):
+                res.set_status(201)
+                return res
+
+            self.listener.set_rqi_cb(SUR, respond)
+            self.assertEqual((await self._notify(2)).status, 201)
+            self.assertEqual(len(received), 1)
+        finally:
+            self.listener.remove_rqi_cb(SUR)
+
+    async def test_reject_when_full(self):
+        """A full queue answers 503 with a Retry-After hint."""
+        print(self.shortDescription())
+
+        dispatcher = self.listener.dispatcher = NotificationDispatcher(workers=1, queue_size=1, retry_after=3)
+        release = threading.Event()
+        self.listener.set_notification_cb(SUR, lambda n: release.wait(5))
+
+        statuses = []
+        for i in range(3):
+            res = await self._notify(i)
+            statuses.append(res.status)
+            # Let the worker take the first notification off the queue.
+            await asyncio.sleep(0.05)
+
+        release.set()
+        await dispatcher.join()
+
+        self.assertEqual(statuses, [200, 200, 503])
+        self.assertEqual(res.headers['Retry-After'], '3')
+        self.assertEqual((dispatcher.accepted, dispatcher.rejected), (2, 1))
+
+    async def test_drop_oldest(self):
+        """DROP_OLDEST keeps the most recent notifications."""
+        print(self.shortDescription())
+
+        dispatcher = self.listener.dispatcher = NotificationDispatcher(
+            workers=1, queue_size=2, overflow=NotificationDispatcher.DROP_OLDEST
+        )
+        release = threading.Event()
+        done = []
+
+        def cb(n: Notification):
+            release.wait(5)
+            done.append(n.representation['m2m:cin']['con'])
+
+        self.listener.set_notification_cb(SUR, cb)
+
+        self.assertEqual((await self._notify(0)).status, 200)
+        await asyncio.sleep(0.05)
+        for i in range(1, 5):
+            self.assertEqual((await self._notify(i)).status, 200)
+
+        release.set()
+        await dispatcher.join()
+
+        self.assertEqual(done, [0, 3, 4])
+        self.assertEqual(dispatcher.dropped, 2)
+
+    async def test_process_pool(self):
+        """Plain callbacks can run on a process pool."""
+        print(self.shortDescription())
+
+        self.listener.dispatcher = NotificationDispatcher(workers=2, use_processes=True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pids')
+            self.listener.set_notification_cb(SUR, functools.partial(record_pid, path))
+
+            for i in range(4):
+                await self._notify(i)
+            await self.listener.dispatcher.join()
+
+            with open(path) as f:
+                lines = [line.split() for line in f]
+
+        self.assertEqual(sorted(int(con) for _, con in lines), list(range(4)))
+        self.assertNotIn(str(os.getpid()), {pid for pid, _ in lines})
@@ -0,0 +1,127 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from client.ae.AsyncResponseListener import AsyncResponseListenerFactory
+from client.ae.NotificationDispatcher import NotificationDispatcher
+from client.ae.NotificationRouter import NotificationRouter
+
+
+def handler(name: str):
+    return lambda n: name
+
+
+class NotificationRouterTests(unittest.TestCase):
+    def setUp(self):
+        self.router = NotificationRouter()
+
+    def _route(self, uri: str):
+        route = self.router.match(uri)
+        return route.handler(None) if route is not None else None
+
+    def test_exact(self):
+        """Exact subscription references match only themselves."""
+        print(self.shortDescription())
+
+        self.router.add('/PN_CSE/nod-1/lcoi/sub', handler('a'))
+
+        self.assertEqual(self._route('/PN_CSE/nod-1/lcoi/sub'), 'a')
+        self.assertEqual(self._route('/PN_CSE/nod-1/lcoi/sub/'), 'a')
+        self.assertIsNone(self._route('/PN_CSE/nod-1/lcoi'))
+        self.assertIsNone(self._route('/PN_CSE/nod-1/lcoi/sub/x'))
+
+    def test_prefix(self):
+        """Prefixes match whole segments, the longest one wins."""
+        print(self.shortDescription())
+
+        self.router.add('/PN_CSE', handler('cse'), prefix=True)
+        self.router.add('/PN_CSE/nod-1', handler('nod-1'), prefix=True)
+
+        self.assertEqual(self._route('/PN_CSE/nod-1'), 'nod-1')
+        self.assertEqual(self._route('/PN_CSE/nod-1/lcoi/sub'), 'nod-1')
+        self.assertEqual(self._route('/PN_CSE/nod-10/lcoi/sub'), 'cse')
+        self.assertIsNone(self._route('/OTHER_CSE/sub'))
+
+    def test_pattern(self):
+        """Glob patterns match segment by segment."""
+        print(self.shortDescription())
+
+        self.router.add('/PN_CSE/nod-*/lcoi/*', handler('lcoi'))
+
+        self.assertEqual(self._route('/PN_CSE/nod-1/lcoi/sub'), 'lcoi')
+        self.assertEqual(self._route('/PN_CSE/nod-abc/lcoi/sub-2'), 'lcoi')
+        self.assertIsNone(self._route('/PN_CSE/nod-1/lcoi'))
+        self.assertIsNone(self._route('/PN_CSE/nod-1/lcoi/sub/x'))
+        self.assertIsNone(self._route('/PN_CSE/dev-1/lcoi/sub'))
+
+    def test_precedence(self):
+        """Exact beats pattern beats prefix beats fallback."""
+        print(self.shortDescription())
+
+        self.router.add('/PN_CSE', handler('prefix'), prefix=True)
+        self.router.add('/PN_CSE/*/lcoi/*', handler('loose'))
+        self.router.add('/PN_CSE/nod-*/lcoi/*', handler('pattern'))
+        self.router.add('/PN_CSE/nod-1/lcoi/*', handler('specific'))
+        self.router.add('/PN_CSE/nod-1/lcoi/sub', handler('exact'))
+        self.router.set_fallback(handler('fallback'))
+
+        self.assertEqual(self._route('/PN_CSE/nod-1/lcoi/sub'), 'exact')
+        self.assertEqual(self._route('/PN_CSE/nod-1/lcoi/other'), 'specific')
+        self.assertEqual(self._route('/PN_CSE/nod-2/lcoi/sub'), 'pattern')
+        self.assertEqual(self._route('/PN_CSE/dev-2/lcoi/sub'), 'loose')
+        self.assertEqual(self._route('/PN_CSE/dev-2/temp/sub'), 'prefix')
+        self.assertEqual(self._route('/OTHER/sub'), 'fallback')
+
+    def test_remove(self):
+        """Removal unregisters one route and prunes the trie."""
+        print(self.shortDescription())
+
+        self.router.add('/PN_CSE/nod-*/lcoi/*', handler('pattern'))
+        self.router.add('/PN_CSE/nod-1', handler('prefix'), prefix=True)
+        self.router.add('/PN_CSE/nod-1', handler('exact'))
+        self.assertEqual(len(self.router), 3)
+
+        self.assertTrue(self.router.remove('/PN_CSE/nod-1'))
+        self.assertFalse(self.router.remove('/PN_CSE/nod-1'))
+        self.assertEqual(self._route('/PN_CSE/nod-1'), 'prefix')
+
+        self.assertTrue(self.router.remove('/PN_CSE/nod-1', prefix=True))
+        self.assertTrue(self.router.remove('/PN_CSE/nod-*/lcoi/*'))
+        self.assertEqual(len(self.router), 0)
+        self.assertTrue(self.router._root.empty())
+
+
+class ListenerRoutingTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.listener = AsyncResponseListenerFactory().get_instance()
+        self.listener.dispatcher = NotificationDispatcher()
+        self.client = TestClient(TestServer(self.listener._application()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        self.listener.remove_notification_cb('/PN_CSE/nod-*/lcoi/*')
+        self.listener.remove_fallback_notification_cb()
+        await self.listener.dispatcher.close()
+        await self.client.close()
+
+    async def test_pattern_batch(self):
+        """One batch callback receives the notifications of every matching subscription."""
+        print(self.shortDescription())
+
+        batches, others = [], []
+        self.listener.set_notification_cb('/PN_CSE/nod-*/lcoi/*', batches.append, batch=True)
+        self.listener.set_fallback_notification_cb(others.append)
+
+        sgns = [{'sur': '/PN_CSE/nod-{}/lcoi/sub'.format(i), 'nev': {'net': 3}} for i in range(100)]
+        sgns.append({'sur': '/PN_CSE/dev-1/temp/sub', 'nev': {'net': 3}})
+        res = await self.client.post('/notify', json={'m2m:agn': {'m2m:sgn': sgns}})
+        await self.listener.dispatcher.join()
+
+        self.assertEqual(res.status, 200)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([n.sur for n in batches[0]], [sgn['sur'] for sgn in sgns[:100]])
+        self.assertEqual([n.sur for n in others], ['/PN_CSE/dev-1/temp/sub'])
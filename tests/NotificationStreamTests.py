@@ -0,0 +1,146 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, threading
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from client.ae.AsyncResponseListener import AsyncResponseListenerFactory
+from client.ae.Notification import Notification
+from client.ae.NotificationDispatcher import NotificationDispatcher
+
+SUR = '/PN_CSE/sub-stream'
+
+
+def notification(i: int) -> dict:
+    return {'m2m:sgn': {'sur': SUR, 'nev': {'net': 3, 'rep': {'m2m:cin': {'con': i}}}}}
+
+
+def con(n: Notification):
+    return n.representation['m2m:cin']['con']
+
+
+class NotificationStreamTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.listener = AsyncResponseListenerFactory().get_instance()
+        self.listener.dispatcher = NotificationDispatcher()
+        self.client = TestClient(TestServer(self.listener._application()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        self.listener.remove_notification_cb(SUR)
+        await self.listener.dispatcher.close()
+        await self.client.close()
+
+    async def _notify(self, i: int):
+        return await self.client.post('/notify', json=notification(i))
+
+    async def test_stream(self):
+        """Notifications are yielded in order, the stream ends once closed and drained."""
+        print(self.shortDescription())
+
+        stream = self.listener.stream(SUR, timeout=0.2)
+        for i in range(3):
+            self.assertEqual((await self._notify(i)).status, 200)
+        await self.listener.dispatcher.join()
+        stream.close()
+
+        received = [con(n) async for n in stream]
+
+        self.assertEqual(received, [0, 1, 2])
+        self.assertTrue(stream.closed)
+        self.assertIsNone(self.listener.notification_routes.get(SUR))
+
+    async def test_batches(self):
+        """Full batches are yielded right away, the rest when the timeout expires."""
+        print(self.shortDescription())
+
+        stream = self.listener.stream(SUR, batch=3, timeout=0.2)
+        for i in range(7):
+            await self._notify(i)
+        await self.listener.dispatcher.join()
+
+        batches = [[con(n) for n in await stream.__anext__()] for _ in range(3)]
+
+        self.assertEqual(batches, [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertFalse(stream.closed)
+
+    async def test_quiet_period(self):
+        """A gap longer than the timeout does not end the stream."""
+        print(self.shortDescription())
+
+        stream = self.listener.stream(SUR, batch=10, timeout=0.1)
+
+        async def consume():
+            return [[con(n) for n in batch] async for batch in stream]
+
+        consumer = asyncio.ensure_future(consume())
+        for i in range(2):
+            await self._notify(i)
+        await asyncio.sleep(0.3)
+        for i in range(2, 4):
+            await self._notify(i)
+        await self.listener.dispatcher.join()
+        await asyncio.sleep(0.2)
+
+        self.assertFalse(consumer.done())
+        self.assertIsNotNone(self.listener.notification_routes.get(SUR))
+
+        stream.close()
+        self.assertEqual(await asyncio.wait_for(consumer, 1), [[0, 1], [2, 3]])
+
+    async def test_close(self):
+        """close ends the iteration once the buffered notifications are consumed."""
+        print(self.shortDescription())
+
+        stream = self.listener.stream(SUR)
+
+        async def consume():
+            return [con(n) async for n in stream]
+
+        consumer = asyncio.ensure_future(consume())
+        for i in range(2):
+            await self._notify(i)
+        await self.listener.dispatcher.join()
+        stream.close()
+
+        self.assertEqual(await asyncio.wait_for(consumer, 1), [0, 1])
+
+    async def test_other_loop(self):
+        """Notifications can be put from the loop of another thread."""
+        print(self.shortDescription())
+
+        stream = self.listener.stream(SUR, batch=10, timeout=0.2)
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        try:
+            for i in range(4):
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(stream.put(Notification(notification(i)['m2m:sgn'])), loop)
+                )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+        stream.close()
+        self.assertEqual([[con(n) for n in batch] async for batch in stream], [[0, 1, 2, 3]])
+
+    async def test_backpressure(self):
+        """A full buffer holds the dispatcher back until its queue overflows."""
+        print(self.shortDescription())
+
+        self.listener.dispatcher = NotificationDispatcher(workers=1, queue_size=1)
+        stream = self.listener.stream(SUR, timeout=0.2, buffer_size=1)
+
+        statuses = []
+        for i in range(4):
+            statuses.append((await self._notify(i)).status)
+            await asyncio.sleep(0.05)
+
+        # One buffered, one held by the worker, one queued.
+        self.assertEqual(statuses, [200, 200, 200, 503])
+        self.assertEqual([con(await stream.__anext__()) for _ in range(3)], [0, 1, 2])
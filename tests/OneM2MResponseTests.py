@@ -0,0 +1,82 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, json
+from unittest import mock
+
+import requests
+
+from client.cse.CSE import CSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.OneM2MResponse import OneM2MResponse
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+def build_response(pc):
+    """Build a requests.Response with a JSON body that looks like it came from a CSE."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = OneM2MPrimitive.CONTENT_TYPE_JSON
+    response.headers[OneM2MPrimitive.X_M2M_ORIGIN] = 'CSE'
+    response.headers[OneM2MPrimitive.X_M2M_RI] = '123'
+    response.headers[OneM2MPrimitive.X_M2M_RSC] = OneM2MPrimitive.M2M_RSC_OK
+    response._content = json.dumps(pc).encode()
+    return response
+
+
+class OneM2MResponseTests(unittest.TestCase):
+    def test_eager_decoding(self):
+        """Bodies are decoded when the response is built by default."""
+        print(self.shortDescription())
+
+        with mock.patch.object(OneM2MResponse.DEFAULT_CODEC, 'decode', wraps=OneM2MResponse.DEFAULT_CODEC.decode) as decode:
+            response = OneM2MResponse(build_response({'m2m:cin': {'con': 1}}))
+            decode.assert_called_once()
+
+        self.assertEqual(response.pc, {'m2m:cin': {'con': 1}})
+
+    def test_lazy_decoding(self):
+        """Lazy responses decode on first access of pc and keep the raw body."""
+        print(self.shortDescription())
+
+        body = {'m2m:cin': {'con': 1}}
+
+        with mock.patch.object(OneM2MResponse.DEFAULT_CODEC, 'decode', wraps=OneM2MResponse.DEFAULT_CODEC.decode) as decode:
+            response = OneM2MResponse(build_response(body), lazy=True)
+            self.assertEqual(response.rsc, OneM2MPrimitive.M2M_RSC_OK)
+            decode.assert_not_called()
+
+            self.assertEqual(response.pc, body)
+            self.assertEqual(response.pc, body)
+            decode.assert_called_once()
+
+        self.assertEqual(json.loads(response.raw), body)
+        self.assertEqual(json.loads(str(response))['pc'], body)
+
+    def test_result_content_nothing(self):
+        """create_content_instance(): Sends rcn=0 and leaves the empty reply undecoded."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+        cse = CSE(fake.host, fake.port, lazy_decode=True)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            response = cse.create_content_instance(
+                '/PN_CSE/cnt', ContentInstance({'con': 1}), OneM2MPrimitive.M2M_RESULT_CONTENT_TYPES.Nothing
+            )
+            cse.create_content_instance('/PN_CSE/cnt', ContentInstance({'con': 2}))
+        finally:
+            cse.close()
+            fake.stop_thread()
+
+        self.assertEqual(response.rsc, OneM2MPrimitive.M2M_RSC_CREATED)
+        self.assertEqual(fake.received[0].query['rcn'], '0')
+        self.assertNotIn('rcn', fake.received[1].query)
+        self.assertIs(response._pc, OneM2MResponse._UNDECODED)
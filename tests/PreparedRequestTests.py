@@ -0,0 +1,102 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, json
+from unittest import mock
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.OneM2MOperation import OneM2MOperation
+from client.onem2m.http.OneM2MRequest import OneM2MRequest, InvalidOneM2MOperationException
+from client.onem2m.resource.ContentInstance import ContentInstance
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class PreparedRequestTests(unittest.TestCase):
+    def test_prepare_maps_once(self):
+        """prepare(): Maps the params once and leaves the caller's params untouched."""
+        print(self.shortDescription())
+
+        params = {
+            OneM2MPrimitive.M2M_PARAM_FROM: 'C123',
+            OneM2MRequest.M2M_PARAM_LIMIT: 5,
+            OneM2MPrimitive.M2M_PARAM_RESOURCE_TYPE: OneM2MPrimitive.M2M_RESOURCE_TYPES.ContentInstance.value,
+        }
+        request = OneM2MRequest()
+
+        prepared = request.prepare(OneM2MOperation.Create, 'http://localhost:8100/PN_CSE/cnt', params)
+
+        self.assertEqual(prepared.method, 'POST')
+        self.assertEqual(prepared.url, 'http://localhost:8100/PN_CSE/cnt?lim=5')
+        self.assertEqual(prepared.headers[OneM2MPrimitive.X_M2M_ORIGIN], 'C123')
+        self.assertNotIn(OneM2MPrimitive.X_M2M_RI, prepared.headers)
+        self.assertEqual(len(params), 3)
+
+        with mock.patch.object(request, '_map_params_to_headers') as map_headers, \
+                mock.patch.object(request, '_send') as send, \
+                mock.patch.object(request, '_response'):
+            prepared.send(ContentInstance({'con': 1}))
+            prepared.send(ContentInstance({'con': 2}))
+
+        map_headers.assert_not_called()
+        rqis = [c.kwargs['headers'][OneM2MPrimitive.X_M2M_RI] for c in send.call_args_list]
+        self.assertNotEqual(rqis[0], rqis[1])
+        self.assertEqual(json.loads(send.call_args_list[1].kwargs['data']), {'m2m:cin': {'con': 2}})
+
+    def test_prepare_invalid_operation(self):
+        """prepare(): Raises on unsupported operations."""
+        print(self.shortDescription())
+
+        with self.assertRaises(InvalidOneM2MOperationException):
+            OneM2MRequest().prepare(OneM2MOperation.Notify, 'http://localhost:8100/PN_CSE')
+
+    def test_resource_handle(self):
+        """resource(): Handle operations reach the CSE with fresh request identifiers."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+        cse = CSE(fake.host, fake.port)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            cnt = cse.resource('/PN_CSE/cnt')
+            responses = [cnt.create_content_instance(ContentInstance({'con': i})) for i in range(3)]
+            cnt.retrieve(OneM2MPrimitive.M2M_RESOURCE_TYPES.Container.value)
+            cnt.delete()
+        finally:
+            cse.close()
+            fake.stop_thread()
+
+        self.assertTrue(all(r.rsc == OneM2MPrimitive.M2M_RSC_CREATED for r in responses))
+        self.assertEqual([r.method for r in fake.received], ['POST'] * 3 + ['GET', 'DELETE'])
+        self.assertEqual(len({r.headers[OneM2MPrimitive.X_M2M_RI] for r in fake.received}), 5)
+        self.assertEqual([json.loads(b)['m2m:cin']['con'] for b in fake.bodies[:3]], [0, 1, 2])
+        self.assertEqual(fake.received[0].path, '/PN_CSE/cnt')
+
+
+class AsyncPreparedRequestTests(unittest.IsolatedAsyncioTestCase):
+    async def test_resource_handle_async(self):
+        """resource(): Asynchronous handle operations share the prepared request."""
+        print(self.shortDescription())
+
+        fake = await FakeCSE().start()
+        cse = AsyncCSE(fake.host, fake.port)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+
+        try:
+            cnt = cse.resource('/PN_CSE/cnt')
+            response = await cnt.create_content_instance_async(ContentInstance({'con': 'a'}))
+            await cnt.create_content_instance_async(ContentInstance({'con': 'b'}))
+        finally:
+            await cse.close()
+            await fake.close()
+
+        self.assertEqual(response.rsc, OneM2MPrimitive.M2M_RSC_CREATED)
+        self.assertEqual(len(cnt._prepared), 1)
+        self.assertEqual(len(fake.received), 2)
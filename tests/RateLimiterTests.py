@@ -0,0 +1,181 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, time, requests
+
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.AdaptiveConcurrency import AdaptiveConcurrency
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.RateLimiter import RateLimiter
+from client.onem2m.http.TokenBucket import TokenBucket
+
+from tests.FakeCSE import FakeCSE
+
+PARAMS = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+
+
+class ThrottlingCSE(FakeCSE):
+    """Answers 429 to requests beyond 'capacity' in flight, and records the peak concurrency."""
+
+    def __init__(self, capacity: int, delay: float = 0.02):
+        super().__init__()
+        self.capacity = capacity
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.throttled = 0
+        self.responder = self.throttle
+
+    async def throttle(self, req: web.Request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                return web.Response(status=429)
+
+            await asyncio.sleep(self.delay)
+            return None
+        finally:
+            self.in_flight -= 1
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_token_bucket(self):
+        """TokenBucket: Reservations beyond the burst wait for the refill."""
+        print(self.shortDescription())
+
+        bucket = TokenBucket(rate=50, burst=2)
+        delays = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.02, delta=0.005)
+        self.assertAlmostEqual(delays[3], 0.04, delta=0.005)
+
+    def test_aimd(self):
+        """AdaptiveConcurrency: Additive increase on success, one decrease per congestion event."""
+        print(self.shortDescription())
+
+        concurrency = AdaptiveConcurrency(initial_limit=4, max_limit=10)
+        started = [concurrency.acquire() for _ in range(4)]
+
+        for started_at in started[:2]:
+            concurrency.release(started_at)
+        self.assertGreater(concurrency.limit, 4)
+
+        limit = concurrency.limit
+        concurrency.release(started[2], throttled=True)
+        self.assertAlmostEqual(concurrency.limit, limit / 2)
+
+        # Sent before the decrease, part of the same congestion event.
+        concurrency.release(started[3], throttled=True)
+        self.assertAlmostEqual(concurrency.limit, limit / 2)
+        self.assertEqual(concurrency.in_flight, 0)
+
+    def test_throttling_signals(self):
+        """RateLimiter: 429, 5xx and the configured rsc codes are throttling."""
+        print(self.shortDescription())
+
+        limiter = RateLimiter(throttle_rsc=['5207'])
+
+        self.assertTrue(limiter.is_throttled(429))
+        self.assertTrue(limiter.is_throttled(503))
+        self.assertTrue(limiter.is_throttled(200, '5207'))
+        self.assertFalse(limiter.is_throttled(404, '4004'))
+        self.assertIsNot(limiter.concurrency('C1'), limiter.concurrency('C2'))
+
+    def test_rate(self):
+        """Requests of an originator are spaced by the rate once the burst is spent."""
+        print(self.shortDescription())
+
+        fake = FakeCSE().start_in_thread()
+
+        try:
+            with HttpSession(rate_limiter=RateLimiter(rate=20, burst=1)) as session:
+                request = OneM2MRequest(session=session)
+                start = time.monotonic()
+                for _ in range(5):
+                    request.retrieve(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+                elapsed = time.monotonic() - start
+        finally:
+            fake.stop_thread()
+
+        self.assertGreaterEqual(elapsed, 0.19)
+
+    def test_adapts_to_throttling(self):
+        """The concurrency limit backs off below the CSE capacity."""
+        print(self.shortDescription())
+
+        fake = ThrottlingCSE(capacity=3).start_in_thread()
+        limiter = RateLimiter(initial_concurrency=8)
+
+        def retrieve(i):
+            try:
+                request.retrieve(fake.url('/PN_CSE/cnt{}'.format(i)), dict(PARAMS))
+            except requests.HTTPError:
+                pass
+
+        try:
+            with HttpSession(rate_limiter=limiter, pool_maxsize=16) as session:
+                request = OneM2MRequest(session=session)
+                with ThreadPoolExecutor(16) as pool:
+                    list(pool.map(retrieve, range(60)))
+        finally:
+            fake.stop_thread()
+
+        self.assertLessEqual(fake.peak, 8)
+        self.assertGreater(fake.throttled, 0)
+        self.assertLess(limiter.concurrency('C123').limit, 8)
+        self.assertEqual(limiter.concurrency('C123').in_flight, 0)
+
+
+class AsyncRateLimiterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_async_concurrency_limit(self):
+        """Coroutines wait for the originator's concurrency limit."""
+        print(self.shortDescription())
+
+        fake = await ThrottlingCSE(capacity=100).start()
+        limiter = RateLimiter(initial_concurrency=2, max_concurrency=2)
+        session = HttpSession(rate_limiter=limiter)
+
+        try:
+            request = OneM2MRequest(session=session)
+            await asyncio.gather(*[
+                request.retrieve_async(fake.url('/PN_CSE/cnt{}'.format(i)), dict(PARAMS)) for i in range(10)
+            ])
+        finally:
+            await session.close_async()
+            await fake.close()
+
+        self.assertEqual(fake.peak, 2)
+        self.assertEqual(len(fake.received), 10)
+        self.assertEqual(limiter.concurrency('C123').in_flight, 0)
+
+    async def test_cancelled_request_releases(self):
+        """Cancelling a request in flight frees its slot."""
+        print(self.shortDescription())
+
+        fake = await ThrottlingCSE(capacity=100, delay=1.0).start()
+        limiter = RateLimiter(initial_concurrency=1, max_concurrency=1)
+        session = HttpSession(rate_limiter=limiter, coalesce_retrieves=False)
+
+        try:
+            task = asyncio.ensure_future(
+                OneM2MRequest(session=session).retrieve_async(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            )
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        finally:
+            await session.close_async()
+            await fake.close()
+
+        self.assertEqual(limiter.concurrency('C123').in_flight, 0)
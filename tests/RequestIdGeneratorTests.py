@@ -0,0 +1,104 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, os, threading
+from unittest import mock
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.RequestIdGenerator import RequestIdGenerator
+
+
+class RequestIdGeneratorTests(unittest.TestCase):
+    def test_unique_across_threads(self):
+        """Identifiers generated concurrently from many threads never collide."""
+        print(self.shortDescription())
+
+        generator = RequestIdGenerator()
+        generated = [[] for _ in range(8)]
+
+        def generate(out):
+            for _ in range(5000):
+                out.append(generator())
+
+        threads = [threading.Thread(target=generate, args=(out,)) for out in generated]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        rqis = sum(generated, [])
+        self.assertEqual(len(set(rqis)), 40000)
+        self.assertTrue(all(rqi.startswith(generator.prefix + '-') for rqi in rqis))
+
+    def test_instance_prefix(self):
+        """Generators have distinct prefixes unless one is given."""
+        print(self.shortDescription())
+
+        self.assertNotEqual(RequestIdGenerator().prefix, RequestIdGenerator().prefix)
+        self.assertEqual(RequestIdGenerator('worker1')(), 'worker1-1')
+
+        with self.assertRaises(ValueError):
+            RequestIdGenerator('a.b')
+
+    def test_prefix_renewed_after_fork(self):
+        """A forked child uses a new prefix."""
+        print(self.shortDescription())
+
+        generator = RequestIdGenerator()
+        prefix = generator.prefix
+
+        RequestIdGenerator._after_fork()
+        with mock.patch('os.getpid', return_value=os.getpid() + 1):
+            rqi = generator()
+
+        self.assertNotEqual(generator.prefix, prefix)
+        self.assertTrue(rqi.startswith(generator.prefix))
+
+    def test_trace_correlation(self):
+        """Identifiers embed the trace of the current context and report it."""
+        print(self.shortDescription())
+
+        seen = []
+        generator = RequestIdGenerator('p', on_generate=lambda rqi, trace: seen.append((rqi, trace)))
+
+        with RequestIdGenerator.trace('4bf92f35.00f067aa'):
+            traced = generator()
+        untraced = generator()
+
+        self.assertEqual(traced, '4bf92f35.00f067aa.p-1')
+        self.assertEqual(RequestIdGenerator.trace_id(traced), '4bf92f35.00f067aa')
+        self.assertIsNone(RequestIdGenerator.trace_id(untraced))
+        self.assertEqual(seen, [(traced, '4bf92f35.00f067aa'), (untraced, None)])
+
+    def test_trace_per_task(self):
+        """Concurrent asyncio tasks keep their own trace."""
+        print(self.shortDescription())
+
+        generator = RequestIdGenerator('p')
+
+        async def traced(trace_id):
+            with RequestIdGenerator.trace(trace_id):
+                await asyncio.sleep(0)
+                return generator()
+
+        async def run():
+            return await asyncio.gather(*[traced('t{}'.format(i)) for i in range(10)])
+
+        rqis = asyncio.run(run())
+
+        self.assertEqual([RequestIdGenerator.trace_id(rqi) for rqi in rqis], ['t{}'.format(i) for i in range(10)])
+
+    def test_session_generator(self):
+        """Requests use the generator of their session."""
+        print(self.shortDescription())
+
+        session = HttpSession(request_id_generator=lambda: 'fixed')
+        request = OneM2MRequest(session=session)
+
+        to, params = request._resolve_params('http://localhost:8100/PN_CSE', {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'})
+
+        self.assertEqual(params[OneM2MPrimitive.M2M_PARAM_REQUEST_IDENTIFIER], 'fixed')
+        self.assertTrue(OneM2MRequest()._generate_rqi().startswith(RequestIdGenerator.DEFAULT.prefix))
@@ -0,0 +1,146 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest
+
+from aiohttp import web
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.ResourceCache import ResourceCache
+
+from tests.FakeCSE import FakeCSE
+
+PARAMS = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+
+
+class VersionedContainer:
+    """Responder serving a container whose stateTag is 'st', honoring stb and If-None-Match."""
+
+    def __init__(self, etag: bool = False):
+        self.st = 1
+        self.etag = etag
+
+    async def __call__(self, req: web.Request):
+        if req.method != 'GET':
+            return None
+
+        if self.etag and req.headers.get('If-None-Match') == str(self.st):
+            return web.Response(status=304)
+
+        stb = req.query.get('stb')
+        if stb is not None and self.st <= int(stb):
+            # Does not match the filter criteria, i.e. unchanged.
+            return FakeCSE.reply(req)
+
+        res = FakeCSE.reply(req, {'m2m:cnt': {'rn': 'cnt', 'st': self.st, 'lt': '20200921T205114'}})
+        if self.etag:
+            res.headers['ETag'] = str(self.st)
+
+        return res
+
+
+class ResourceCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeCSE().start_in_thread()
+        self.container = VersionedContainer()
+        self.fake.responder = self.container
+
+    def tearDown(self):
+        self.fake.stop_thread()
+
+    def test_lru_eviction(self):
+        """The least recently used entries are evicted beyond max_entries."""
+        print(self.shortDescription())
+
+        cache = ResourceCache(max_entries=2)
+        with HttpSession(cache=cache) as session:
+            request = OneM2MRequest(session=session)
+            for name in ('a', 'b', 'a', 'c'):
+                request.retrieve(self.fake.url('/PN_CSE/' + name), dict(PARAMS))
+
+        paths = {key[0].rpartition('/')[2] for key in cache._entries}
+        self.assertEqual(paths, {'a', 'c'})
+
+    def test_fresh_hit(self):
+        """Fresh entries are served without a request, per originator."""
+        print(self.shortDescription())
+
+        with HttpSession(cache=ResourceCache(ttl=60)) as session:
+            request = OneM2MRequest(session=session)
+            first = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            second = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            request.retrieve(self.fake.url('/PN_CSE/cnt'), {OneM2MPrimitive.M2M_PARAM_FROM: 'C456'})
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.fake.received), 2)
+
+    def test_revalidate_state_tag(self):
+        """Expired entries are revalidated with the stateTag and reused while unchanged."""
+        print(self.shortDescription())
+
+        with HttpSession(cache=ResourceCache(ttl=0)) as session:
+            request = OneM2MRequest(session=session)
+            first = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            second = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+            self.container.st = 2
+            third = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+        self.assertEqual(self.fake.received[1].query.get('stb'), '1')
+        self.assertEqual(self.fake.received[1].query.get('fu'), '2')
+        self.assertIs(first, second)
+        self.assertEqual(third.pc['m2m:cnt']['st'], 2)
+
+    def test_etag_not_modified(self):
+        """A 304 answer to If-None-Match reuses the cached response."""
+        print(self.shortDescription())
+
+        self.container.etag = True
+
+        with HttpSession(cache=ResourceCache(ttl=0)) as session:
+            request = OneM2MRequest(session=session)
+            first = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            second = request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+        self.assertEqual(self.fake.received[1].headers.get('If-None-Match'), '1')
+        self.assertIs(first, second)
+
+    def test_write_invalidates(self):
+        """Writes to a resource drop its cached retrieves."""
+        print(self.shortDescription())
+
+        cache = ResourceCache(ttl=60)
+        with HttpSession(cache=cache) as session:
+            request = OneM2MRequest(session=session)
+            request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            request.delete(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+            request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+        self.assertEqual([r.method for r in self.fake.received], ['GET', 'DELETE', 'GET'])
+        self.assertEqual(len(cache), 1)
+
+
+class AsyncResourceCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = await FakeCSE().start()
+        self.container = VersionedContainer()
+        self.fake.responder = self.container
+        self.session = HttpSession(cache=ResourceCache(ttl=0))
+
+    async def asyncTearDown(self):
+        await self.session.close_async()
+        await self.fake.close()
+
+    async def test_async_revalidate(self):
+        """The asynchronous client shares the cache and its revalidation."""
+        print(self.shortDescription())
+
+        request = OneM2MRequest(session=self.session)
+        first = await request.retrieve_async(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+        second = await request.retrieve_async(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+        self.assertEqual(self.fake.received[1].query.get('stb'), '1')
+        self.assertIs(first, second)
@@ -0,0 +1,221 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, time
+
+from aiohttp import web
+
+from client.cse.CSE import CSE
+from client.cse.AsyncCSE import AsyncCSE
+from client.ae.AE import AE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.RetryPolicy import RetryPolicy
+from client.onem2m.http.CircuitBreaker import CircuitBreaker
+from client.onem2m.resource.ContentInstance import ContentInstance
+from client.exceptions.CircuitOpenException import CircuitOpenException
+
+from tests.FakeCSE import FakeCSE
+
+AE_ATTRIBUTES = {'api': 'app', 'aei': 'C123', 'poa': [], 'ri': 'C123'}
+
+
+class FlakyCSE(FakeCSE):
+    """Answers status to the first 'failures' requests, with a Retry-After unless None."""
+
+    def __init__(self, failures: int, status: int = 503, retry_after: str = '0'):
+        super().__init__()
+        self.failures = failures
+        self.status = status
+        self.retry_after = retry_after
+        self.responder = self.flaky
+
+    async def flaky(self, req: web.Request):
+        if len(self.received) <= self.failures:
+            headers = {'Retry-After': self.retry_after} if self.retry_after is not None else {}
+            return web.Response(status=self.status, headers=headers)
+        return None
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_idempotency_rules(self):
+        """RetryPolicy: Retrieve/Delete always retry, Create/Update unless retry_create is off."""
+        print(self.shortDescription())
+
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.can_retry('GET', {}, 0))
+        self.assertTrue(policy.can_retry('DELETE', None, 1))
+        self.assertFalse(policy.can_retry('GET', {}, 2))
+        self.assertTrue(policy.can_retry('POST', {}, 0))
+        self.assertFalse(policy.can_retry('POST', {}, 2))
+        self.assertTrue(RetryPolicy(retry_create=False).can_retry('DELETE', {}, 0))
+        self.assertFalse(RetryPolicy(retry_create=False).can_retry('PUT', {}, 0))
+
+    def test_backoff_is_bounded(self):
+        """RetryPolicy: Jittered backoff stays within the exponential envelope and backoff_max."""
+        print(self.shortDescription())
+
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0)
+
+        for attempt in range(8):
+            self.assertLessEqual(policy.backoff(attempt), min(3.0, 0.5 * 2 ** attempt))
+        self.assertEqual(policy.backoff(0, '2'), 2.0)
+        self.assertEqual(policy.backoff(0, '60'), 3.0)
+        self.assertEqual(RetryPolicy(jitter=False, backoff_base=0.5).backoff(2), 2.0)
+
+    def test_circuit_breaker_transitions(self):
+        """CircuitBreaker: Opens after the threshold, half-opens after the timeout and closes on success."""
+        print(self.shortDescription())
+
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+        breaker.before_request()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(CircuitOpenException):
+            breaker.before_request()
+
+        time.sleep(0.06)
+        breaker.before_request()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        # Only one probe at a time.
+        with self.assertRaises(CircuitOpenException):
+            breaker.before_request()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_release_probe(self):
+        """CircuitBreaker: A probe ended without an outcome frees its half-open slot."""
+        print(self.shortDescription())
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.before_request()
+        breaker.record_failure()
+
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.release_probe()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class RetryIntegrationTests(unittest.TestCase):
+    def start(self, failures: int, status: int = 503, retry_after: str = '0', **session_args):
+        self.fake = FlakyCSE(failures, status, retry_after).start_in_thread()
+        self.addCleanup(self.fake.stop_thread)
+
+        session = HttpSession(**session_args)
+        cse = CSE(self.fake.host, self.fake.port, session=session)
+        cse.ae = AE(dict(AE_ATTRIBUTES))
+        self.addCleanup(cse.close)
+
+        return cse
+
+    def test_transient_failures_are_retried_with_stable_rqi(self):
+        """Create is retried through 503s reusing the same rqi."""
+        print(self.shortDescription())
+
+        cse = self.start(2, retry_policy=RetryPolicy(max_retries=3, backoff_base=0.001))
+
+        res = cse.create_content_instance('/PN_CSE/cnt', ContentInstance({'con': 1}))
+
+        self.assertEqual(res.rsc, OneM2MPrimitive.M2M_RSC_CREATED)
+        self.assertEqual(len(self.fake.received), 3)
+        self.assertEqual(len({r.headers[OneM2MPrimitive.X_M2M_RI] for r in self.fake.received}), 1)
+
+    def test_async_retry(self):
+        """The async engine retries with the same rules."""
+        print(self.shortDescription())
+
+        self.fake = FlakyCSE(1).start_in_thread()
+        self.addCleanup(self.fake.stop_thread)
+
+        async def run():
+            session = HttpSession(retry_policy=RetryPolicy(backoff_base=0.001))
+            async with AsyncCSE(self.fake.host, self.fake.port, session=session) as cse:
+                cse.ae = AE(dict(AE_ATTRIBUTES))
+                return await cse.retrieve_resource('/PN_CSE/cnt', 3)
+
+        self.assertEqual(asyncio.run(run()).rsc, OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(len(self.fake.received), 2)
+
+    def test_breaker_stops_retry_storm(self):
+        """An open circuit breaker fails fast instead of hitting the CSE."""
+        print(self.shortDescription())
+
+        cse = self.start(100, retry_after=None, circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cse.retrieve_resource('/PN_CSE/cnt', 3)
+
+        with self.assertRaises(CircuitOpenException):
+            cse.retrieve_resource('/PN_CSE/cnt', 3)
+
+        self.assertEqual(len(self.fake.received), 2)
+
+    def test_throttling_keeps_breaker_closed(self):
+        """429s and Retry-After responses are not counted as circuit breaker failures."""
+        print(self.shortDescription())
+
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        cse = self.start(4, 429, None, circuit_breaker=breaker)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cse.retrieve_resource('/PN_CSE/cnt', 3)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+        self.fake.status = 503
+        self.fake.retry_after = '1'
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cse.retrieve_resource('/PN_CSE/cnt', 3)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+        self.assertEqual(cse.retrieve_resource('/PN_CSE/cnt', 3).rsc, OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(len(self.fake.received), 5)
+
+    def test_cancelled_probe_is_released(self):
+        """A cancelled half-open probe does not keep the breaker half-open."""
+        print(self.shortDescription())
+
+        self.fake = FakeCSE().start_in_thread()
+        self.addCleanup(self.fake.stop_thread)
+
+        async def hang(req: web.Request):
+            await asyncio.sleep(10)
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.before_request()
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        async def run():
+            session = HttpSession(circuit_breaker=breaker, coalesce_retrieves=False)
+            async with AsyncCSE(self.fake.host, self.fake.port, session=session) as cse:
+                cse.ae = AE(dict(AE_ATTRIBUTES))
+
+                self.fake.responder = hang
+                probe = asyncio.ensure_future(cse.retrieve_resource('/PN_CSE/cnt', 3))
+                while not self.fake.received:
+                    await asyncio.sleep(0.01)
+                probe.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await probe
+
+                self.fake.responder = None
+                return await cse.retrieve_resource('/PN_CSE/cnt', 3)
+
+        self.assertEqual(asyncio.run(run()).rsc, OneM2MPrimitive.M2M_RSC_OK)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
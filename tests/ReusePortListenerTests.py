@@ -0,0 +1,87 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, functools, os, socket, tempfile, time
+import requests
+
+from client.ae.AsyncResponseListener import AsyncResponseListenerFactory
+from client.ae.Notification import Notification
+
+
+def record(path: str, n: Notification):
+    """Worker callback, must be importable."""
+    with open(path, 'a') as f:
+        f.write('{} {} {}\n'.format(os.getpid(), n.sur, n.representation['m2m:cin']['con']))
+
+
+def notification(sur: str, i: int) -> dict:
+    return {'m2m:sgn': {'sur': sur, 'nev': {'net': 3, 'rep': {'m2m:cin': {'con': i}}}}}
+
+
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT') and hasattr(os, 'fork'), 'SO_REUSEPORT and fork required')
+class ReusePortListenerTests(unittest.TestCase):
+    def setUp(self):
+        # Bypass the singleton of the other listener tests.
+        self.previous, AsyncResponseListenerFactory.instance = AsyncResponseListenerFactory.instance, None
+        self.listener = AsyncResponseListenerFactory('127.0.0.1', 0, workers=2).get_instance()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'received')
+
+    def tearDown(self):
+        self.listener.stop()
+        AsyncResponseListenerFactory.instance = self.previous
+        self.tmp.cleanup()
+
+    def _received(self, count: int):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    lines = [line.split() for line in f]
+                if len(lines) >= count:
+                    return lines
+            time.sleep(0.02)
+
+        self.fail('Notifications not handled in time.')
+
+    def _notify(self, sur: str, i: int):
+        return requests.post('http://127.0.0.1:{}/notify'.format(self.listener.port), json=notification(sur, i))
+
+    def test_workers_share_port(self):
+        """Notifications are spread over the worker processes."""
+        print(self.shortDescription())
+
+        self.listener.set_notification_cb('/sub-a', functools.partial(record, self.path))
+        self.listener.start()
+
+        for i in range(40):
+            self.assertEqual(self._notify('/sub-a', i).status_code, 200)
+
+        lines = self._received(40)
+
+        self.assertEqual(sorted(int(con) for _, _, con in lines), list(range(40)))
+        self.assertEqual(len({pid for pid, _, _ in lines}), 2)
+        self.assertNotIn(str(os.getpid()), {pid for pid, _, _ in lines})
+
+    def test_registration_propagates(self):
+        """Callbacks registered after start reach every worker, removals too."""
+        print(self.shortDescription())
+
+        self.listener.start()
+        self.listener.set_notification_cb('/sub-b', functools.partial(record, self.path))
+
+        for i in range(20):
+            self.assertEqual(self._notify('/sub-b', i).status_code, 200)
+        self.assertEqual(len(self._received(20)), 20)
+
+        self.listener.remove_notification_cb('/sub-b')
+        for i in range(20, 24):
+            try:
+                # Answered with the non HTTP 4004 status of unknown subscriptions.
+                self._notify('/sub-b', i)
+            except requests.ConnectionError:
+                pass
+
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 20)
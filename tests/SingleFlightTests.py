@@ -0,0 +1,148 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, asyncio, threading, requests
+
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.Deadline import Deadline
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.exceptions.DeadlineExceededException import DeadlineExceededException
+
+from tests.FakeCSE import FakeCSE
+
+PARAMS = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+CALLERS = 5
+
+
+def slow(delay: float, status: int = 200):
+    """Responder answering after delay."""
+    async def responder(req: web.Request):
+        await asyncio.sleep(delay)
+        if status != 200:
+            return web.Response(status=status)
+        return FakeCSE.reply(req, {'m2m:cin': {'con': 'value'}})
+
+    return responder
+
+
+class SingleFlightTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeCSE().start_in_thread()
+        self.fake.responder = slow(0.2)
+
+    def tearDown(self):
+        self.fake.stop_thread()
+
+    def _retrieve_concurrently(self, session, params=lambda i: dict(PARAMS)):
+        request = OneM2MRequest(session=session)
+        barrier = threading.Barrier(CALLERS)
+
+        def retrieve(i):
+            barrier.wait()
+            return request.retrieve(self.fake.url('/PN_CSE/cnt'), params(i))
+
+        with ThreadPoolExecutor(CALLERS) as pool:
+            return [f.result() for f in [pool.submit(retrieve, i) for i in range(CALLERS)]]
+
+    def test_threads_share_request(self):
+        """Identical retrieves from several threads share one request."""
+        print(self.shortDescription())
+
+        with HttpSession() as session:
+            responses = self._retrieve_concurrently(session)
+
+        self.assertEqual(len(self.fake.received), 1)
+        self.assertTrue(all(r is responses[0] for r in responses))
+        self.assertEqual(session.single_flight.shared, CALLERS - 1)
+
+    def test_originators_not_shared(self):
+        """Retrieves of different originators are sent separately."""
+        print(self.shortDescription())
+
+        with HttpSession() as session:
+            self._retrieve_concurrently(session, lambda i: {OneM2MPrimitive.M2M_PARAM_FROM: 'C{}'.format(i)})
+
+        self.assertEqual(len(self.fake.received), CALLERS)
+
+    def test_disabled(self):
+        """Coalescing can be turned off."""
+        print(self.shortDescription())
+
+        with HttpSession(coalesce_retrieves=False) as session:
+            self._retrieve_concurrently(session)
+
+        self.assertEqual(len(self.fake.received), CALLERS)
+
+    def test_errors_shared(self):
+        """Every caller receives the error of the shared request."""
+        print(self.shortDescription())
+
+        self.fake.responder = slow(0.2, 500)
+
+        with HttpSession() as session:
+            with self.assertRaises(requests.HTTPError):
+                self._retrieve_concurrently(session)
+
+        self.assertEqual(len(self.fake.received), 1)
+
+    def test_follower_deadline(self):
+        """A caller stops waiting for the shared request at its own deadline."""
+        print(self.shortDescription())
+
+        with HttpSession() as session:
+            request = OneM2MRequest(session=session)
+            leader = threading.Thread(target=request.retrieve, args=(self.fake.url('/PN_CSE/cnt'), dict(PARAMS)))
+            leader.start()
+
+            while not session.single_flight._calls:
+                pass
+
+            with Deadline.scope(0.05):
+                with self.assertRaises(DeadlineExceededException):
+                    request.retrieve(self.fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+            leader.join()
+
+
+class AsyncSingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = await FakeCSE().start()
+        self.fake.responder = slow(0.1)
+        self.session = HttpSession()
+
+    async def asyncTearDown(self):
+        await self.session.close_async()
+        await self.fake.close()
+
+    async def test_tasks_share_request(self):
+        """Identical retrieves from several tasks share one request."""
+        print(self.shortDescription())
+
+        request = OneM2MRequest(session=self.session)
+        responses = await asyncio.gather(*[
+            request.retrieve_async(self.fake.url('/PN_CSE/cnt'), dict(PARAMS)) for _ in range(CALLERS)
+        ])
+
+        self.assertEqual(len(self.fake.received), 1)
+        self.assertTrue(all(r is responses[0] for r in responses))
+
+    async def test_cancelled_caller(self):
+        """Cancelling one caller does not cancel the shared request for the others."""
+        print(self.shortDescription())
+
+        request = OneM2MRequest(session=self.session)
+        first = asyncio.ensure_future(request.retrieve_async(self.fake.url('/PN_CSE/cnt'), dict(PARAMS)))
+        second = asyncio.ensure_future(request.retrieve_async(self.fake.url('/PN_CSE/cnt'), dict(PARAMS)))
+        await asyncio.sleep(0.02)
+
+        first.cancel()
+        response = await second
+
+        self.assertEqual(response.pc, {'m2m:cin': {'con': 'value'}})
+        self.assertEqual(len(self.fake.received), 1)
@@ -0,0 +1,146 @@
+# Copyright (c) Aetheros, Inc.  See COPYRIGHT
+
+#!/usr/bin/env python
+
+import unittest, os, shutil, ssl, subprocess, tempfile, requests
+
+from client.cse.CSE import CSE
+from client.onem2m.OneM2MPrimitive import OneM2MPrimitive
+from client.onem2m.http.HttpSession import HttpSession
+from client.onem2m.http.OneM2MRequest import OneM2MRequest
+from client.onem2m.http.TlsConfig import TlsConfig
+from client.exceptions.InvalidArgumentException import InvalidArgumentException
+
+from tests.FakeCSE import FakeCSE
+
+PARAMS = {OneM2MPrimitive.M2M_PARAM_FROM: 'C123'}
+
+
+def make_certificate(directory: str) -> str:
+    """Self-signed certificate and key for 127.0.0.1, in one PEM file."""
+    pem = os.path.join(directory, 'cse.pem')
+    subprocess.run(
+        [
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+            '-subj', '/CN=localhost', '-addext', 'subjectAltName=IP:127.0.0.1,DNS:localhost',
+            '-keyout', pem, '-out', pem,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return pem
+
+
+@unittest.skipUnless(shutil.which('openssl'), 'openssl is required to create test certificates')
+class TlsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.pem = make_certificate(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def _start(self, client_auth: bool = False) -> FakeCSE:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(self.pem)
+        if client_auth:
+            context.verify_mode = ssl.CERT_REQUIRED
+            context.load_verify_locations(self.pem)
+
+        return FakeCSE(context).start_in_thread()
+
+    def test_resumption(self):
+        """Reconnects to the CSE resume the verified TLS session."""
+        print(self.shortDescription())
+
+        fake = self._start()
+        tls = TlsConfig(ca_file=self.pem)
+
+        try:
+            # Every request on a new connection.
+            with HttpSession(keep_alive=False, tls=tls) as session:
+                request = OneM2MRequest(session=session)
+                for i in range(3):
+                    request.retrieve(fake.url('/PN_CSE/cnt{}'.format(i)), dict(PARAMS))
+        finally:
+            fake.stop_thread()
+
+        self.assertEqual(tls.context().handshakes, 3)
+        self.assertEqual(tls.context().resumed, 2)
+
+    def test_verification(self):
+        """CSE certificates are verified against the configured CAs."""
+        print(self.shortDescription())
+
+        fake = self._start()
+
+        try:
+            with HttpSession() as session:
+                with self.assertRaises(requests.exceptions.SSLError):
+                    OneM2MRequest(session=session).retrieve(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+            with HttpSession(tls=TlsConfig(verify=False)) as session:
+                OneM2MRequest(session=session).retrieve(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+        finally:
+            fake.stop_thread()
+
+    def test_client_certificate(self):
+        """The client certificate is presented to CSEs that require one."""
+        print(self.shortDescription())
+
+        fake = self._start(client_auth=True)
+
+        try:
+            with HttpSession(tls=TlsConfig(ca_file=self.pem, cert_file=self.pem)) as session:
+                response = OneM2MRequest(session=session).retrieve(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+
+            with HttpSession(tls=TlsConfig(ca_file=self.pem)) as session:
+                with self.assertRaises(requests.exceptions.RequestException):
+                    OneM2MRequest(session=session).retrieve(fake.url('/PN_CSE/cnt'), dict(PARAMS))
+        finally:
+            fake.stop_thread()
+
+        self.assertEqual(response.rsc, OneM2MPrimitive.M2M_RSC_OK)
+
+    def test_cse_tls(self):
+        """CSE: TLS settings apply to the session it creates."""
+        print(self.shortDescription())
+
+        tls = TlsConfig(ca_file=self.pem)
+        cse = CSE('127.0.0.1', 8443, transport_protocol='https', tls=tls)
+        self.assertIs(cse.session.tls, tls)
+        cse.close()
+
+        with self.assertRaises(InvalidArgumentException):
+            CSE('127.0.0.1', 8443, session=HttpSession(), tls=tls)
+
+
+@unittest.skipUnless(shutil.which('openssl'), 'openssl is required to create test certificates')
+class AsyncTlsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_async_resumption(self):
+        """The asynchronous pool shares the context and resumes sessions."""
+        print(self.shortDescription())
+
+        directory = tempfile.mkdtemp()
+        pem = make_certificate(directory)
+
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(pem)
+
+        fake = await FakeCSE(context).start()
+        tls = TlsConfig(ca_file=pem)
+        session = HttpSession(keep_alive=False, tls=tls)
+
+        try:
+            request = OneM2MRequest(session=session)
+            for i in range(3):
+                await request.retrieve_async(fake.url('/PN_CSE/cnt{}'.format(i)), dict(PARAMS))
+        finally:
+            await session.close_async()
+            await fake.close()
+            shutil.rmtree(directory)
+
+        self.assertEqual(tls.context().handshakes, 3)
+        self.assertGreaterEqual(tls.context().resumed, 1)